@@ -1,26 +1,30 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-from googletrans import Translator, LANGUAGES
-import pyperclip
-from gtts import gTTS
-from playsound import playsound
 import os
 import threading
-import random
-import json
-from difflib import SequenceMatcher
-from datetime import datetime
+import time
+from translation_core import TranslationCore
+from translation_worker import TranslationWorker
+from live_translation import LiveTranslationController
+from speech_cache import SpeechAudioCache
+from history_window import HistoryWindow
+from language_names import LANGUAGES
+from translation_metrics import TranslationMetrics
 
 class SmartTranslatorApp:
-    def __init__(self, root_window):
+    def __init__(self, root_window, translation_engine=None, speech_backend=None, metrics=None):
         self.root_window = root_window
         self.root_window.title("AI Language Translator")
         self.root_window.geometry("1000x700")
         self.root_window.resizable(True, True)
         
         # Initialize translation components
-        self.translation_engine = Translator()
-        self.translation_history = self.load_translation_history()
+        self.metrics = metrics if metrics is not None else TranslationMetrics()
+        self.translation_core = TranslationCore(translation_engine, metrics=self.metrics)
+        self.translation_worker = TranslationWorker(self.root_window)
+        self.live_translation = LiveTranslationController(self)
+        self.speech_cache = SpeechAudioCache(speech_backend=speech_backend)
+        self.alternatives_cancel_event = threading.Event()
         self.ui_style = ttk.Style()
         
         # Configure UI appearance
@@ -58,6 +62,7 @@ class SmartTranslatorApp:
         self.input_text_area = scrolledtext.ScrolledText(input_section, height=12, wrap=tk.WORD, 
                                                        font=('Helvetica', 11), padx=10, pady=10)
         self.input_text_area.pack(fill=tk.BOTH, expand=True)
+        self.input_text_area.bind('<<Modified>>', self.live_translation.on_text_modified)
         
         # Language selection and controls
         control_panel = ttk.Frame(main_container)
@@ -84,6 +89,11 @@ class SmartTranslatorApp:
         translate_button = ttk.Button(control_panel, text="AI Translate", command=self.process_translation)
         translate_button.grid(row=0, column=5, padx=10, pady=5)
         
+        # Optional translate-as-you-type mode
+        self.live_translation_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(control_panel, text="Live", variable=self.live_translation_enabled,
+                        command=self.toggle_live_translation).grid(row=0, column=6, padx=5, pady=5)
+        
         # Output display with tabs
         self.output_display = ttk.Notebook(main_container)
         self.output_display.pack(fill=tk.BOTH, expand=True)
@@ -113,6 +123,16 @@ class SmartTranslatorApp:
         self.confidence_label = ttk.Label(alternatives_tab, text="AI Confidence: 0%")
         self.confidence_label.pack()
         
+        # Stage timings and cache/engine statistics, only when metrics are collected
+        if self.metrics.enabled:
+            statistics_tab = ttk.Frame(self.output_display)
+            self.output_display.add(statistics_tab, text="Stats")
+            self.statistics_display = scrolledtext.ScrolledText(statistics_tab, height=8, wrap=tk.NONE,
+                                                                font=('Courier', 9), padx=10, pady=10,
+                                                                state=tk.DISABLED)
+            self.statistics_display.pack(fill=tk.BOTH, expand=True)
+            self.refresh_statistics_tab()
+        
         # Action buttons panel
         action_buttons_panel = ttk.Frame(main_container)
         action_buttons_panel.pack(fill=tk.X, pady=(5, 0))
@@ -124,108 +144,66 @@ class SmartTranslatorApp:
         ttk.Button(action_buttons_panel, text="History", command=self.display_translation_history).pack(side=tk.LEFT, padx=5)
         ttk.Button(action_buttons_panel, text="Clear", command=self.reset_interface).pack(side=tk.RIGHT, padx=5)
     
-    def get_language_code(self, language_name):
-        """Convert full language name to language code"""
-        if language_name == 'Auto Detect':
-            return 'auto'
-        for code, name in LANGUAGES.items():
-            if name.lower() == language_name.lower():
-                return code
-        return 'en'  # Default to English if not found
-    
-    def detect_input_language(self, text_content):
-        """Identify the language of the input text with confidence score"""
-        try:
-            detection_result = self.translation_engine.detect(text_content)
-            return detection_result.lang, detection_result.confidence * 100
-        except Exception:
-            return 'en', 0  # Fallback to English with 0% confidence
-    
-    def check_translation_memory(self, source_text, source_lang, target_lang):
-        """Search for similar translations in memory"""
-        for memory_entry in self.translation_history:
-            text_similarity = SequenceMatcher(None, source_text.lower(), memory_entry['source'].lower()).ratio()
-            if (memory_entry['src_lang'] == source_lang and 
-                memory_entry['dest_lang'] == target_lang and 
-                text_similarity > 0.9):  # 90% similarity threshold
-                return memory_entry['translation'], memory_entry['confidence']
-        return None, 0
-    
     def process_translation(self):
-        """Handle the complete translation workflow"""
+        """Start the translation workflow on a background worker"""
         input_text = self.input_text_area.get("1.0", tk.END).strip()
         if not input_text:
             messagebox.showwarning("Input Required", "Please enter text to translate.")
             return
         
-        # Determine language parameters
-        selected_source_language = self.source_language_combobox.get()
-        target_language_code = self.get_language_code(self.target_language_combobox.get())
+        # Determine language parameters ('auto' when detection is needed)
+        source_language_code = self.translation_core.get_language_code(self.source_language_combobox.get())
+        target_language_code = self.translation_core.get_language_code(self.target_language_combobox.get())
         
-        # Handle auto-detection if selected
-        if selected_source_language == 'Auto Detect':
-            detected_language, detection_confidence = self.detect_input_language(input_text)
-            self.source_language_combobox.set(LANGUAGES.get(detected_language, 'Auto Detect'))
-            if detection_confidence < 50:  # Warn for low confidence
+        # Show processing status
+        self.translated_text_display.config(state=tk.NORMAL)
+        self.translated_text_display.delete("1.0", tk.END)
+        self.translated_text_display.insert(tk.END, "Processing translation...")
+        self.translated_text_display.config(state=tk.DISABLED)
+        
+        # A newer click supersedes any translation still in flight, and its alternatives
+        self.cancel_translation_alternatives()
+        start_time = time.perf_counter()
+        self.translation_worker.submit(
+            'translation',
+            lambda: self.translation_core.translate_document(input_text, source_language_code, target_language_code),
+            lambda translation_outcome: self.complete_translation(input_text, target_language_code, translation_outcome,
+                                                                  start_time),
+            self.fail_translation)
+    
+    def toggle_live_translation(self):
+        """Switch translate-as-you-type on or off"""
+        if self.live_translation_enabled.get():
+            self.live_translation.enable()
+        else:
+            self.live_translation.disable()
+    
+    def complete_translation(self, input_text, target_language_code, translation_outcome, start_time=None):
+        """Show a finished translation (runs on the Tk thread)"""
+        source_language_code = translation_outcome['source_lang']
+        with self.metrics.stage('widget_update'):
+            self.display_translation_result(translation_outcome['translation'], translation_outcome['confidence'])
+        if start_time is not None:
+            self.metrics.observe('process_translation', time.perf_counter() - start_time)
+        
+        # Alternatives need more backend calls; fetch them only once the result is on screen
+        self.request_translation_alternatives(translation_outcome)
+        
+        # Report auto-detection results
+        detection_confidence = translation_outcome['detection_confidence']
+        if translation_outcome['auto_detected']:
+            self.source_language_combobox.set(LANGUAGES.get(source_language_code, 'Auto Detect'))
+            if detection_confidence is not None and detection_confidence < 50:  # Warn for low confidence
                 messagebox.showwarning("Low Confidence", 
                                     f"Language detection confidence is low ({detection_confidence:.0f}%). "
                                     "Please verify the source language.")
-            source_language_code = detected_language
-        else:
-            source_language_code = self.get_language_code(selected_source_language)
-        
-        # Check if we have this translation in memory
-        cached_result, confidence_score = self.check_translation_memory(input_text, source_language_code, target_language_code)
-        if cached_result:
-            self.display_translation_result(cached_result, confidence_score)
-            self.show_translation_alternatives(input_text, cached_result, source_language_code, target_language_code)
-            return
-        
-        try:
-            # Show processing status
-            self.translated_text_display.config(state=tk.NORMAL)
-            self.translated_text_display.delete("1.0", tk.END)
-            self.translated_text_display.insert(tk.END, "Processing translation...")
-            self.translated_text_display.config(state=tk.DISABLED)
-            self.root_window.update()
-            
-            # Execute translation
-            translation_result = self.translation_engine.translate(input_text, src=source_language_code, dest=target_language_code)
-            
-            # Calculate confidence score
-            confidence_score = self.calculate_translation_confidence(input_text, translation_result.text, 
-                                                                  source_language_code, target_language_code)
-            
-            # Store in memory
-            self.save_to_translation_history(input_text, translation_result.text, 
-                                           source_language_code, target_language_code, confidence_score)
-            
-            # Display results
-            self.display_translation_result(translation_result.text, confidence_score)
-            self.show_translation_alternatives(input_text, translation_result.text, 
-                                             source_language_code, target_language_code)
-            
-        except Exception as error:
-            messagebox.showerror("Translation Error", f"Translation failed: {str(error)}")
-            self.translated_text_display.config(state=tk.NORMAL)
-            self.translated_text_display.delete("1.0", tk.END)
-            self.translated_text_display.config(state=tk.DISABLED)
     
-    def calculate_translation_confidence(self, original_text, translated_text, source_lang, target_lang):
-        """Estimate confidence score for the translation"""
-        # Base confidence simulation
-        confidence_score = random.uniform(70, 95)
-        
-        # Adjust for text length (longer texts typically have lower confidence)
-        length_adjustment = min(1, 100 / len(original_text.split()))
-        confidence_score *= length_adjustment
-        
-        # Adjust for difficult language pairs
-        challenging_pairs = [('ja', 'en'), ('zh', 'en'), ('ar', 'en'), ('en', 'hi'), ('hi', 'en')]
-        if (source_lang, target_lang) in challenging_pairs or (target_lang, source_lang) in challenging_pairs:
-            confidence_score *= 0.9
-        
-        return min(95, max(50, confidence_score))  # Keep within 50-95% range
+    def fail_translation(self, error):
+        """Report a failed translation (runs on the Tk thread)"""
+        messagebox.showerror("Translation Error", f"Translation failed: {str(error)}")
+        self.translated_text_display.config(state=tk.NORMAL)
+        self.translated_text_display.delete("1.0", tk.END)
+        self.translated_text_display.config(state=tk.DISABLED)
     
     def display_translation_result(self, translated_text, confidence_score):
         """Show the translation result with confidence indicator"""
@@ -239,67 +217,44 @@ class SmartTranslatorApp:
         self.translated_text_display.tag_config("confidence_note", foreground="gray", font=('Helvetica', 9))
         
         self.translated_text_display.config(state=tk.DISABLED)
+        
+        # Update confidence display with the same score the history records
+        self.translation_confidence_meter['value'] = confidence_score
+        self.confidence_label.config(text=f"AI Confidence: {confidence_score:.0f}%")
+    
+    def request_translation_alternatives(self, translation_outcome):
+        """Score the outcome's alternatives in the background, superseding older requests"""
+        self.cancel_translation_alternatives()
+        cancel_event = self.alternatives_cancel_event = threading.Event()
+        self.alternative_translations_display.config(state=tk.NORMAL)
+        self.alternative_translations_display.delete("1.0", tk.END)
+        self.alternative_translations_display.insert(tk.END, "Looking for alternatives...")
+        self.alternative_translations_display.config(state=tk.DISABLED)
+        self.translation_worker.submit(
+            'alternatives',
+            lambda: self.translation_core.find_alternative_translations(translation_outcome, cancel_event),
+            self.show_translation_alternatives,
+            lambda error: self.show_translation_alternatives([]))
+    
+    def cancel_translation_alternatives(self):
+        """Stop an outstanding alternatives request from starting more backend calls"""
+        self.alternatives_cancel_event.set()
+        self.translation_worker.cancel('alternatives')
     
-    def show_translation_alternatives(self, original_text, main_translation, source_lang, target_lang):
+    def show_translation_alternatives(self, alternative_options):
         """Display alternative translation options"""
         self.alternative_translations_display.config(state=tk.NORMAL)
         self.alternative_translations_display.delete("1.0", tk.END)
         
-        # Generate simulated alternatives
-        alternative_options = self.generate_alternative_translations(original_text, source_lang, target_lang)
-        
         if alternative_options:
             self.alternative_translations_display.insert(tk.END, "Alternative translations:\n\n")
-            for index, (alternative, quality_score) in enumerate(alternative_options.items(), 1):
+            for index, (alternative, quality_score) in enumerate(alternative_options, 1):
                 self.alternative_translations_display.insert(tk.END, f"{index}. {alternative}\n")
                 self.alternative_translations_display.insert(tk.END, f"   [Quality Score: {quality_score:.0f}/100]\n\n")
         else:
             self.alternative_translations_display.insert(tk.END, "No significant alternatives found")
         
         self.alternative_translations_display.config(state=tk.DISABLED)
-        
-        # Update confidence display
-        main_confidence = self.calculate_translation_confidence(original_text, main_translation, source_lang, target_lang)
-        self.translation_confidence_meter['value'] = main_confidence
-        self.confidence_label.config(text=f"AI Confidence: {main_confidence:.0f}%")
-    
-    def generate_alternative_translations(self, text_content, source_lang, target_lang):
-        """Create simulated alternative translations"""
-        alternative_translations = {}
-        
-        # Only generate alternatives for longer texts
-        if len(text_content.split()) > 3:
-            alternative_translations["Formal translation"] = random.uniform(65, 85)
-            alternative_translations["Casual translation"] = random.uniform(70, 90)
-            alternative_translations["Idiomatic translation"] = random.uniform(75, 95)
-        
-        return alternative_translations
-    
-    def save_to_translation_history(self, source_text, translated_text, source_lang, target_lang, confidence_score):
-        """Store translation in memory"""
-        history_entry = {
-            'source': source_text,
-            'translation': translated_text,
-            'src_lang': source_lang,
-            'dest_lang': target_lang,
-            'confidence': confidence_score,
-            'timestamp': datetime.now().isoformat()
-        }
-        self.translation_history.append(history_entry)
-        self.save_translation_history()
-    
-    def load_translation_history(self):
-        """Load translation history from file"""
-        try:
-            with open('translation_history.json', 'r') as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-    
-    def save_translation_history(self):
-        """Save translation history to file"""
-        with open('translation_history.json', 'w') as file:
-            json.dump(self.translation_history, file, indent=2)
     
     def swap_selected_languages(self):
         """Swap source and target language selections"""
@@ -315,6 +270,7 @@ class SmartTranslatorApp:
         """Copy translation to system clipboard"""
         translated_content = self.translated_text_display.get("1.0", "end-1c").split('\n\n[AI Confidence:')[0].strip()
         if translated_content and translated_content != "Processing translation...":
+            import pyperclip  # Only needed once something is copied
             pyperclip.copy(translated_content)
             messagebox.showinfo("Copied", "Translation copied to clipboard!")
         else:
@@ -327,7 +283,7 @@ class SmartTranslatorApp:
             messagebox.showwarning("Nothing to Speak", "No translation available to speak.")
             return
         
-        target_language_code = self.get_language_code(self.target_language_combobox.get())
+        target_language_code = self.translation_core.get_language_code(self.target_language_combobox.get())
         
         # Run text-to-speech in background thread
         threading.Thread(target=self.execute_text_to_speech, 
@@ -343,67 +299,49 @@ class SmartTranslatorApp:
             messagebox.showwarning("Nothing to Save", "No translation available to save.")
             return
         
-        source_lang = self.get_language_code(self.source_language_combobox.get())
-        target_lang = self.get_language_code(self.target_language_combobox.get())
+        source_lang = self.translation_core.get_language_code(self.source_language_combobox.get())
+        target_lang = self.translation_core.get_language_code(self.target_language_combobox.get())
         
-        self.save_to_translation_history(source_text, translated_text, source_lang, target_lang,
-                                       float(self.confidence_label.cget("text").split()[-1][:-1]))
+        self.translation_core.save_to_translation_history(source_text, translated_text, source_lang, target_lang,
+                                                          float(self.confidence_label.cget("text").split()[-1][:-1]))
         messagebox.showinfo("Saved", "Translation saved to history!")
     
     def display_translation_history(self):
-        """Show translation history window"""
-        history_window = tk.Toplevel(self.root_window)
-        history_window.title("Translation History")
-        history_window.geometry("800x600")
-        
-        history_tree = ttk.Treeview(history_window, 
-                                  columns=('source', 'translation', 'languages', 'confidence', 'date'), 
-                                  show='headings')
-        
-        # Configure treeview columns
-        history_tree.heading('source', text='Original Text')
-        history_tree.heading('translation', text='Translation')
-        history_tree.heading('languages', text='Language Pair')
-        history_tree.heading('confidence', text='Confidence')
-        history_tree.heading('date', text='Date/Time')
-        
-        history_tree.column('source', width=200)
-        history_tree.column('translation', width=200)
-        history_tree.column('languages', width=100)
-        history_tree.column('confidence', width=80)
-        history_tree.column('date', width=120)
-        
-        # Populate with history data (newest first)
-        for entry in reversed(self.translation_history):
-            language_pair = f"{entry['src_lang']}→{entry['dest_lang']}"
-            formatted_date = datetime.fromisoformat(entry['timestamp']).strftime('%Y-%m-%d %H:%M')
-            history_tree.insert('', tk.END, values=(
-                entry['source'][:50] + '...' if len(entry['source']) > 50 else entry['source'],
-                entry['translation'][:50] + '...' if len(entry['translation']) > 50 else entry['translation'],
-                language_pair,
-                f"{entry['confidence']:.0f}%",
-                formatted_date
-            ))
-        
-        history_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Add scrollbar
-        history_scrollbar = ttk.Scrollbar(history_window, orient=tk.VERTICAL, command=history_tree.yview)
-        history_tree.configure(yscroll=history_scrollbar.set)
-        history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        """Show translation history window (rows load page by page)"""
+        with self.metrics.stage('history_window'):
+            HistoryWindow(self.root_window, self.translation_core.history_store)
     
     def execute_text_to_speech(self, text_content, language_code):
         """Handle text-to-speech conversion"""
         try:
-            speech_engine = gTTS(text=text_content, lang=language_code)
-            speech_engine.save("translation_audio.mp3")
-            playsound("translation_audio.mp3")
-            os.remove("translation_audio.mp3")
+            # Cached per sentence chunk; playback starts with the first chunk
+            with self.metrics.stage('text_to_speech'):
+                self.speech_cache.speak(text_content, language_code)
         except Exception as error:
             messagebox.showerror("Speech Error", f"Text-to-speech failed: {str(error)}")
     
+    def refresh_statistics_tab(self):
+        """Redraw the Stats tab once a second"""
+        metrics_snapshot = self.metrics.snapshot()
+        statistics_lines = [f"{'stage':<20} {'count':>7} {'mean ms':>9} {'p50 ms':>8} {'p95 ms':>8}"]
+        for stage_name, stage_summary in sorted(metrics_snapshot['stages'].items()):
+            statistics_lines.append(f"{stage_name:<20} {stage_summary['count']:>7} {stage_summary['mean_ms']:>9.1f} "
+                                    f"{stage_summary['p50_ms']:>8.1f} {stage_summary['p95_ms']:>8.1f}")
+        statistics_lines.append('')
+        for event_name, event_count in sorted(metrics_snapshot['events'].items()):
+            statistics_lines.append(f"{event_name:<20} {event_count:>7}")
+        for source_name, source_statistics in metrics_snapshot['sources'].items():
+            statistics_lines.append(f"\n{source_name}: {source_statistics}")
+        
+        self.statistics_display.config(state=tk.NORMAL)
+        self.statistics_display.delete("1.0", tk.END)
+        self.statistics_display.insert(tk.END, '\n'.join(statistics_lines))
+        self.statistics_display.config(state=tk.DISABLED)
+        self.root_window.after(1000, self.refresh_statistics_tab)
+    
     def reset_interface(self):
         """Clear all input and output fields"""
+        self.cancel_translation_alternatives()
         self.input_text_area.delete("1.0", tk.END)
         self.translated_text_display.config(state=tk.NORMAL)
         self.translated_text_display.delete("1.0", tk.END)
@@ -416,5 +354,23 @@ class SmartTranslatorApp:
 
 if __name__ == "__main__":
     application_root = tk.Tk()
-    translator_app = SmartTranslatorApp(application_root)
-    application_root.mainloop()
\ No newline at end of file
+    # TRANSLATOR_FAKE_LATENCY=<seconds> runs against an offline fake engine;
+    # TRANSLATOR_ENGINES=name,name picks registered engines in preference order;
+    # TRANSLATOR_METRICS=1 adds the Stats tab, and a .json/.prom path also exports on exit
+    fake_latency = os.environ.get('TRANSLATOR_FAKE_LATENCY')
+    engine_names = os.environ.get('TRANSLATOR_ENGINES')
+    metrics_setting = os.environ.get('TRANSLATOR_METRICS')
+    application_metrics = TranslationMetrics(enabled=bool(metrics_setting))
+    if fake_latency is not None:
+        from fake_translator import FakeTranslator
+        translator_app = SmartTranslatorApp(application_root, FakeTranslator(float(fake_latency)),
+                                            metrics=application_metrics)
+    elif engine_names:
+        from translation_backends import build_engine_router
+        translator_app = SmartTranslatorApp(application_root, build_engine_router(engine_names.split(',')),
+                                            metrics=application_metrics)
+    else:
+        translator_app = SmartTranslatorApp(application_root, metrics=application_metrics)
+    application_root.mainloop()
+    if metrics_setting and metrics_setting.endswith(('.json', '.prom', '.txt')):
+        application_metrics.write(metrics_setting)
\ No newline at end of file
@@ -0,0 +1,149 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+
+
+class BatchingTranslator:
+    """Coalesce concurrent translate calls into fewer backend requests
+
+    Drop-in wrapper with the same translate()/detect() interface as the
+    wrapped engine. Identical (text, src, dest) requests already in flight
+    share one result. Other requests for the same (src, dest) pair that
+    arrive within batch_window_seconds are sent together as a single
+    newline-joined string whose translation is split back per line; a text
+    that would take the joined string past max_batch_characters sends the
+    open batch first. If the joined call fails or comes back with the wrong
+    number of lines, the texts are sent on their own, in parallel. Texts
+    that cannot be joined safely (auto-detected source, embedded newlines)
+    are still deduplicated but sent on their own.
+    """
+
+    def __init__(self, translation_engine, batch_window_seconds=0.005, max_batch_size=32,
+                 max_batch_characters=4500, fallback_workers=8):
+        self.translation_engine = translation_engine
+        self.batch_window_seconds = batch_window_seconds
+        self.max_batch_size = max_batch_size
+        self.max_batch_characters = max_batch_characters
+        self.fallback_executor = ThreadPoolExecutor(max_workers=fallback_workers, thread_name_prefix='batch-fallback')
+        self.batch_lock = threading.Lock()
+        self.in_flight_requests = {}
+        self.open_batches = {}
+        self.request_count = 0
+        self.deduplicated_count = 0
+        self.backend_call_count = 0
+
+    def translate(self, text, dest='en', src='auto'):
+        """Translate text, sharing the backend round-trip with concurrent callers"""
+        request_key = (text, src, dest)
+        overflowed_batch = None
+        with self.batch_lock:
+            self.request_count += 1
+            result_future = self.in_flight_requests.get(request_key)
+            if result_future is not None:
+                self.deduplicated_count += 1
+                batch, leads_batch, batch_full = None, False, False
+            elif not self.can_join(text, src):
+                result_future = self.in_flight_requests[request_key] = Future()
+                batch, leads_batch, batch_full = [request_key], True, True
+            else:
+                result_future = self.in_flight_requests[request_key] = Future()
+                batch = self.open_batches.get((src, dest))
+                if batch is not None and self.joined_length(batch + [request_key]) > self.max_batch_characters:
+                    # Adding this text would overflow the request; it starts the next batch
+                    overflowed_batch = self.open_batches.pop((src, dest))
+                batch = self.open_batches.setdefault((src, dest), [])
+                batch.append(request_key)
+                leads_batch = len(batch) == 1
+                batch_full = (len(batch) >= self.max_batch_size or
+                              self.joined_length(batch) >= self.max_batch_characters)
+                if batch_full:
+                    del self.open_batches[(src, dest)]
+
+        if overflowed_batch:
+            self.send_batch(overflowed_batch)
+        if batch_full:
+            self.send_batch(batch)
+        elif leads_batch:
+            # The first caller waits briefly for others, then sends whatever gathered
+            time.sleep(self.batch_window_seconds)
+            with self.batch_lock:
+                if self.open_batches.get((src, dest)) is batch:
+                    del self.open_batches[(src, dest)]
+                else:
+                    batch = None  # Already sent when it filled up
+            if batch:
+                self.send_batch(batch)
+        return result_future.result()
+
+    def detect(self, text):
+        self.count_backend_call(counts_as_request=True)
+        return self.translation_engine.detect(text)
+
+    def can_join(self, text, src):
+        return src != 'auto' and '\n' not in text and len(text) < self.max_batch_characters
+
+    def joined_length(self, batch):
+        """Characters in the newline-joined request for a batch"""
+        return sum(len(request_key[0]) for request_key in batch) + len(batch) - 1
+
+    def send_batch(self, batch):
+        """Translate every queued request and resolve the waiting futures"""
+        _, src, dest = batch[0]
+        try:
+            translation_results = self.translate_batch([request_key[0] for request_key in batch], src, dest)
+        except Exception as error:
+            translation_results = [error] * len(batch)
+
+        with self.batch_lock:
+            result_futures = [self.in_flight_requests.pop(request_key) for request_key in batch]
+        for result_future, translation_result in zip(result_futures, translation_results):
+            if isinstance(translation_result, Exception):
+                result_future.set_exception(translation_result)
+            else:
+                result_future.set_result(translation_result)
+
+    def translate_batch(self, texts, src, dest):
+        if len(texts) == 1:
+            return [self.call_backend(texts[0], src, dest)]
+
+        try:
+            joined_result = self.call_backend('\n'.join(texts), src, dest)
+        except Exception:
+            # One bad text must not fail the rest of the batch
+            return self.translate_separately(texts, src, dest)
+        translated_lines = joined_result.text.split('\n')
+        if len(translated_lines) != len(texts):
+            # The backend merged or split lines
+            return self.translate_separately(texts, src, dest)
+        # Alternatives describe the joined text as a whole, not any one line of it
+        extra_data = {key: value for key, value in (getattr(joined_result, 'extra_data', None) or {}).items()
+                      if key != 'alternatives'}
+        return [SimpleNamespace(text=translated_line, src=joined_result.src, dest=dest, origin=text,
+                                pronunciation=None, extra_data=extra_data)
+                for text, translated_line in zip(texts, translated_lines)]
+
+    def translate_separately(self, texts, src, dest):
+        """One backend call per text, in parallel; a failed text gets its exception"""
+        call_futures = [self.fallback_executor.submit(self.call_backend, text, src, dest) for text in texts]
+        return [call_future.exception() or call_future.result() for call_future in call_futures]
+
+    def call_backend(self, text, src, dest):
+        self.count_backend_call()
+        return self.translation_engine.translate(text, src=src, dest=dest)
+
+    def count_backend_call(self, counts_as_request=False):
+        with self.batch_lock:
+            self.backend_call_count += 1
+            if counts_as_request:
+                self.request_count += 1
+
+    def statistics(self):
+        """Request and backend call counters"""
+        with self.batch_lock:
+            return {
+                'requests': self.request_count,
+                'deduplicated': self.deduplicated_count,
+                'backend_calls': self.backend_call_count,
+                'calls_saved': self.request_count - self.backend_call_count
+            }
@@ -0,0 +1,91 @@
+"""Benchmark alternative translations: primary latency, scoring cost and reuse
+
+Translates --texts distinct sentences, and as many documents of
+--sentences sentences, in auto-detect mode through a FakeTranslator with
+--latency seconds per call. Each result's alternatives are then scored the
+way the GUI does after showing it: first cold, then again once the same
+inputs come back from translation memory and the scores from the cache.
+A last pass with a tiny time budget shows the cap on extra backend calls.
+Offline.
+
+    python benchmarks/bench_alternatives.py --texts 50 --latency 0.05
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+from history_store import TranslationHistoryStore
+from translation_cache import TranslationCache
+from translation_core import TranslationCore
+
+
+def sentence(index):
+    """Distinct enough that translation memory never matches one to another"""
+    random_generator = random.Random(index)
+    return ' '.join(''.join(random_generator.choice('abcdefghijklmnopqrstuvwxyz')
+                            for _ in range(random_generator.randint(3, 9))) for _ in range(8)).capitalize() + '.'
+
+
+def timed_pass(operation, texts):
+    durations = []
+    for text_content in texts:
+        start_time = time.perf_counter()
+        operation(text_content)
+        durations.append(time.perf_counter() - start_time)
+    return statistics.median(durations) * 1000, max(durations) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--texts', type=int, default=50)
+    parser.add_argument('--sentences', type=int, default=3, help="sentences per document input")
+    parser.add_argument('--latency', type=float, default=0.05, help="fake backend seconds per call")
+    parser.add_argument('--alternatives', type=int, default=3, help="variants the fake backend lists")
+    parser.add_argument('--tight-budget', type=float, default=0.01, help="seconds for the capped pass")
+    arguments = parser.parse_args()
+
+    fake_translator = FakeTranslator(arguments.latency, alternative_count=arguments.alternatives)
+    translation_core = TranslationCore(fake_translator, TranslationHistoryStore(':memory:', legacy_json_path=None),
+                                       translation_cache=TranslationCache(disk_path=None))
+    inputs = {
+        'sentence': [sentence(index) for index in range(arguments.texts)],
+        'document': [' '.join(sentence(arguments.texts + index * arguments.sentences + offset)
+                              for offset in range(arguments.sentences)) for index in range(arguments.texts)]}
+    outcomes = {}
+
+    def translate(text_content):
+        # Auto Detect, as the GUI starts out
+        outcomes[text_content] = translation_core.translate_document(text_content, 'auto', 'fr')
+
+    def find_alternatives(text_content):
+        translation_core.find_alternative_translations(outcomes[text_content])
+
+    print(f"{'input':>9} {'pass':>20} {'median ms':>10} {'max ms':>10} {'backend calls':>14}")
+    for input_kind, texts in inputs.items():
+        for pass_name, operation in (('primary translation', translate), ('alternatives cold', find_alternatives),
+                                     ('primary from memory', translate), ('alternatives cached', find_alternatives)):
+            calls_before = fake_translator.translate_calls
+            median_ms, max_ms = timed_pass(operation, texts)
+            print(f"{input_kind:>9} {pass_name:>20} {median_ms:>10.2f} {max_ms:>10.2f} "
+                  f"{fake_translator.translate_calls - calls_before:>14}")
+
+    # New texts, so nothing is cached and the budget decides
+    translation_core.alternative_translator.time_budget_seconds = arguments.tight_budget
+    capped_texts = [sentence(arguments.texts * (arguments.sentences + 1) + index) for index in range(arguments.texts)]
+    for text_content in capped_texts:
+        translate(text_content)
+    calls_before = fake_translator.translate_calls
+    median_ms, max_ms = timed_pass(find_alternatives, capped_texts)
+    print(f"{'sentence':>9} {'capped budget':>20} {median_ms:>10.2f} {max_ms:>10.2f} "
+          f"{fake_translator.translate_calls - calls_before:>14}")
+    print(f"\nalternatives: {translation_core.alternative_translator.statistics()}")
+
+
+if __name__ == '__main__':
+    main()
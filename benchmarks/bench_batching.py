@@ -0,0 +1,77 @@
+"""Benchmark request batching under a synthetic concurrent load
+
+Fires translate calls from many threads at a FakeTranslator, once directly
+and once through BatchingTranslator, and reports backend calls plus
+p50/p99 latency per request.
+
+    python benchmarks/bench_batching.py --threads 32 --requests 2000 --latency 0.05
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batching_translator import BatchingTranslator
+from fake_translator import FakeTranslator
+
+
+def build_workload(request_count, distinct_segments, rng):
+    """Segments drawn with a skew so popular phrases repeat, like UI strings"""
+    segments = [f"segment number {index} of the workload" for index in range(distinct_segments)]
+    weights = [1 / (rank + 1) for rank in range(distinct_segments)]
+    return rng.choices(segments, weights=weights, k=request_count)
+
+
+def run_load(translation_engine, workload, thread_count):
+    """Return per-request latencies and total wall-clock seconds"""
+    latencies = []
+    latency_lock = threading.Lock()
+
+    def timed_translate(text):
+        start_time = time.perf_counter()
+        translation_engine.translate(text, src='en', dest='hi')
+        with latency_lock:
+            latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        list(executor.map(timed_translate, workload))
+    return latencies, time.perf_counter() - start_time
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--distinct', type=int, default=500, help="distinct segments in the workload")
+    parser.add_argument('--latency', type=float, default=0.05, help="fake backend latency in seconds")
+    parser.add_argument('--seed', type=int, default=1234)
+    arguments = parser.parse_args()
+
+    workload = build_workload(arguments.requests, arguments.distinct, random.Random(arguments.seed))
+
+    print(f"{'mode':>9} {'backend calls':>14} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'wall s':>7}")
+    for mode in ('direct', 'batched'):
+        fake_translator = FakeTranslator(arguments.latency)
+        translation_engine = BatchingTranslator(fake_translator) if mode == 'batched' else fake_translator
+        latencies, wall_seconds = run_load(translation_engine, workload, arguments.threads)
+        print(f"{mode:>9} {fake_translator.translate_calls:>14} {percentile(latencies, 0.5) * 1e3:>8.1f} "
+              f"{percentile(latencies, 0.99) * 1e3:>8.1f} {statistics.mean(latencies) * 1e3:>8.1f} "
+              f"{wall_seconds:>7.2f}")
+        if mode == 'batched':
+            print(f"batching statistics: {translation_engine.statistics()}")
+
+
+if __name__ == '__main__':
+    main()
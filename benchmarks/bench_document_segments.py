@@ -0,0 +1,78 @@
+"""Benchmark re-translating a lightly edited long document
+
+Translates a synthetic document of about 5,000 words, edits one sentence
+and translates it again, counting backend calls for each pass.
+
+    python benchmarks/bench_document_segments.py --words 5000 --latency 0.02
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+from history_store import TranslationHistoryStore
+from text_segmenter import join_segments, split_segments
+from translation_cache import TranslationCache
+from translation_core import TranslationCore
+
+
+def build_document(word_count, rng):
+    """Paragraphs of 4-8 sentences, each 8-20 pseudo-words long"""
+    paragraphs, sentences, words_written = [], [], 0
+    while words_written < word_count:
+        sentence_length = rng.randint(8, 20)
+        words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(2, 9)))
+                 for _ in range(sentence_length)]
+        sentences.append(' '.join(words).capitalize() + rng.choice('..?!'))
+        words_written += sentence_length
+        if len(sentences) >= rng.randint(4, 8):
+            paragraphs.append(' '.join(sentences))
+            sentences = []
+    if sentences:
+        paragraphs.append(' '.join(sentences))
+    return '\n\n'.join(paragraphs)
+
+
+def timed_pass(translation_core, fake_translator, document):
+    """Return (backend calls, seconds, outcome) for one translation"""
+    calls_before = fake_translator.translate_calls + fake_translator.detect_calls
+    start_time = time.perf_counter()
+    translation_outcome = translation_core.translate_document(document, 'en', 'hi')
+    elapsed_seconds = time.perf_counter() - start_time
+    return fake_translator.translate_calls + fake_translator.detect_calls - calls_before, elapsed_seconds, \
+        translation_outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.02, help="fake backend latency in seconds")
+    parser.add_argument('--seed', type=int, default=1234)
+    arguments = parser.parse_args()
+
+    rng = random.Random(arguments.seed)
+    document = build_document(arguments.words, rng)
+    # Rewrite one sentence in the middle of the document
+    segments = split_segments(document)
+    _, middle_separator = segments[len(segments) // 2]
+    segments[len(segments) // 2] = ("An entirely rewritten sentence replaces the old one.", middle_separator)
+    edited_document = join_segments(segments)
+
+    fake_translator = FakeTranslator(arguments.latency)
+    translation_core = TranslationCore(fake_translator, TranslationHistoryStore(':memory:', legacy_json_path=None),
+                                       translation_cache=TranslationCache(disk_path=None))
+
+    print(f"{'pass':>10} {'segments':>9} {'memory hits':>12} {'backend calls':>14} {'seconds':>8}")
+    for pass_name, pass_document in (('initial', document), ('edited', edited_document)):
+        backend_calls, elapsed_seconds, translation_outcome = timed_pass(translation_core, fake_translator,
+                                                                         pass_document)
+        print(f"{pass_name:>10} {translation_outcome['segment_count']:>9} {translation_outcome['memory_hits']:>12} "
+              f"{backend_calls:>14} {elapsed_seconds:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark tail latency of a single engine against the hedged engine router
+
+The primary engine answers in --fast-latency most of the time but stalls
+for --slow-latency on a --slow-fraction of calls, the way a remote endpoint
+occasionally does. A second, steadier engine is the hedge. Reports latency
+percentiles for the primary alone and for the router, then switches the
+primary to failing outright to show the circuit breaker cutting fail-over
+cost. Offline; latencies are seeded and reproducible.
+
+    python benchmarks/bench_engine_hedging.py --requests 400
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+from translation_backends import CircuitBreaker, EngineRouter, GuardedEngine
+
+
+class TailLatencyTranslator(FakeTranslator):
+    """FakeTranslator whose latency is usually fast and occasionally very slow"""
+
+    def __init__(self, fast_latency, slow_latency, slow_fraction, seed, failing=False):
+        super().__init__()
+        self.fast_latency = fast_latency
+        self.slow_latency = slow_latency
+        self.slow_fraction = slow_fraction
+        self.failing = failing
+        self.random_generator = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+    def translate(self, text, dest='en', src='auto'):
+        with self.random_lock:
+            is_slow = self.random_generator.random() < self.slow_fraction
+        self.latency_seconds = self.slow_latency if is_slow else self.fast_latency
+        if self.failing:
+            time.sleep(self.latency_seconds)
+            raise ConnectionError("primary endpoint unavailable")
+        return super().translate(text, dest=dest, src=src)
+
+
+def percentile(values, fraction):
+    sorted_values = sorted(values)
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(translation_engine, request_count, concurrency):
+    def timed_translate(request_index):
+        start_time = time.perf_counter()
+        try:
+            translation_engine.translate(f"sentence {request_index}", dest='fr', src='en')
+        except Exception:
+            pass
+        return time.perf_counter() - start_time
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(timed_translate, range(request_count)))
+
+
+def report(label, latencies):
+    print(f"{label:>22} {percentile(latencies, 0.5) * 1e3:>8.1f} {percentile(latencies, 0.95) * 1e3:>8.1f} "
+          f"{percentile(latencies, 0.99) * 1e3:>8.1f} {max(latencies) * 1e3:>8.1f} "
+          f"{statistics.mean(latencies) * 1e3:>8.1f}")
+
+
+def build_router(primary_engine, hedge_engine, concurrency, timeout_seconds):
+    # A hedged call keeps its worker until it finishes, so pools get headroom
+    pool_size = 2 * concurrency
+    return EngineRouter([
+        GuardedEngine('primary', primary_engine, pool_size=pool_size, timeout_seconds=timeout_seconds,
+                      circuit_breaker=CircuitBreaker(failure_threshold=5, reset_seconds=60.0)),
+        GuardedEngine('hedge', hedge_engine, pool_size=pool_size, timeout_seconds=timeout_seconds),
+    ], hedge_delay_seconds=0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--fast-latency', type=float, default=0.02)
+    parser.add_argument('--slow-latency', type=float, default=1.0)
+    parser.add_argument('--slow-fraction', type=float, default=0.02)
+    parser.add_argument('--hedge-latency', type=float, default=0.04)
+    parser.add_argument('--timeout', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=7)
+    arguments = parser.parse_args()
+
+    def primary(failing=False):
+        return TailLatencyTranslator(arguments.fast_latency, arguments.slow_latency, arguments.slow_fraction,
+                                     arguments.seed, failing)
+
+    def hedge():
+        return TailLatencyTranslator(arguments.hedge_latency, arguments.hedge_latency, 0.0, arguments.seed)
+
+    print(f"{'mode':>22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'mean ms':>8}")
+    report('primary only', measure(primary(), arguments.requests, arguments.concurrency))
+
+    hedged_router = build_router(primary(), hedge(), arguments.concurrency, arguments.timeout)
+    report('hedged router', measure(hedged_router, arguments.requests, arguments.concurrency))
+    print(f"{'':>22} {hedged_router.statistics()}")
+
+    failing_router = build_router(primary(failing=True), hedge(), arguments.concurrency, arguments.timeout)
+    report('failing primary', measure(failing_router, arguments.requests, arguments.concurrency))
+    print(f"{'':>22} {failing_router.statistics()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark history save latency against history size
+
+Compares rewriting the whole translation_history.json (the original
+save_translation_history) with a single append to TranslationHistoryStore.
+
+    python benchmarks/bench_history_save.py --sizes 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import TranslationHistoryStore
+
+
+def make_entry(index):
+    return {
+        'source': f"sample source sentence number {index} for the benchmark",
+        'translation': f"sample translated sentence number {index}",
+        'src_lang': 'en',
+        'dest_lang': 'hi',
+        'confidence': 80.0,
+        'timestamp': '2024-01-01T00:00:00',
+    }
+
+
+def time_json_rewrite(history, json_path, save_count):
+    """Mean seconds per save when the full list is re-serialized each time"""
+    start_time = time.perf_counter()
+    for index in range(save_count):
+        history.append(make_entry(len(history)))
+        with open(json_path, 'w') as file:
+            json.dump(history, file, indent=2)
+    return (time.perf_counter() - start_time) / save_count
+
+
+def time_store_append(history_store, save_count, first_index):
+    """Mean seconds per save for one appended row"""
+    start_time = time.perf_counter()
+    for index in range(save_count):
+        history_store.append(make_entry(first_index + index))
+    return (time.perf_counter() - start_time) / save_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--saves', type=int, default=20)
+    arguments = parser.parse_args()
+
+    print(f"{'entries':>8} {'json rewrite ms':>16} {'store append ms':>16} {'speedup':>8}")
+    for history_size in arguments.sizes:
+        with tempfile.TemporaryDirectory() as work_directory:
+            history = [make_entry(index) for index in range(history_size)]
+            json_path = os.path.join(work_directory, 'translation_history.json')
+            with open(json_path, 'w') as file:
+                json.dump(history, file, indent=2)
+
+            # The store imports the seeded JSON, so both start at the same size
+            history_store = TranslationHistoryStore(os.path.join(work_directory, 'translation_history.db'),
+                                                    json_path)
+            store_seconds = time_store_append(history_store, arguments.saves, history_size)
+            history_store.close()
+            json_seconds = time_json_rewrite(history, json_path, arguments.saves)
+
+        print(f"{history_size:>8} {json_seconds * 1e3:>16.2f} {store_seconds * 1e3:>16.3f} "
+              f"{json_seconds / store_seconds:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
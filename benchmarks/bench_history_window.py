@@ -0,0 +1,94 @@
+"""Benchmark opening the history window at large history sizes
+
+Compares the original approach (format and insert every entry) with the
+paged HistoryWindow (query and insert only the newest page). With a display
+available the real Treeview is used; otherwise only the data path (query
+plus row formatting) is timed.
+
+    python benchmarks/bench_history_window.py --entries 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import INSERT_HISTORY_SQL, TranslationHistoryStore
+from history_window import HISTORY_PAGE_SIZE, format_history_row
+
+
+def populate_store(history_store, entry_count):
+    with history_store.database_lock, history_store.connection:
+        history_store.connection.executemany(
+            INSERT_HISTORY_SQL,
+            ((f"source sentence number {index} with some extra words to make it longer than fifty characters",
+              f"translated sentence {index}", 'en', ('hi', 'fr', 'de')[index % 3], 80.0,
+              f"2024-{1 + index % 12:02d}-{1 + index % 28:02d}T12:00:00")
+             for index in range(entry_count)))
+
+
+def open_tree():
+    """Return a Treeview to insert into, or None without a display"""
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root_window = tk.Tk()
+    except Exception:
+        return None
+    root_window.withdraw()
+    return ttk.Treeview(root_window, columns=('source', 'translation', 'languages', 'confidence', 'date'),
+                        show='headings')
+
+
+def time_full_load(history_store, history_tree):
+    """Original behaviour: every entry is materialized, formatted and inserted"""
+    start_time = time.perf_counter()
+    history_entries = list(history_store.iter_entries())
+    for entry in reversed(history_entries):
+        row_values = format_history_row(entry)
+        if history_tree is not None:
+            history_tree.insert('', 'end', values=row_values)
+    return time.perf_counter() - start_time
+
+
+def time_paged_load(history_store, history_tree, **filters):
+    """Paged behaviour: only the newest matching page is fetched on open"""
+    start_time = time.perf_counter()
+    for _, entry in history_store.query_entries(limit=HISTORY_PAGE_SIZE, **filters):
+        row_values = format_history_row(entry)
+        if history_tree is not None:
+            history_tree.insert('', 'end', values=row_values)
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=100000)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_directory:
+        history_store = TranslationHistoryStore(os.path.join(work_directory, 'history.db'), legacy_json_path=None)
+        populate_store(history_store, arguments.entries)
+        history_tree = open_tree()
+        print(f"{arguments.entries} entries, {'Treeview' if history_tree is not None else 'data path only'}")
+
+        measurements = [
+            ('open, full load', lambda: time_full_load(history_store, history_tree)),
+            ('open, first page', lambda: time_paged_load(history_store, history_tree)),
+            ('filter en→fr', lambda: time_paged_load(history_store, history_tree, src_lang='en', dest_lang='fr')),
+            ('filter March 2024', lambda: time_paged_load(history_store, history_tree,
+                                                          date_from='2024-03-01', date_to='2024-03-31')),
+            ('filter text "number 4242"', lambda: time_paged_load(history_store, history_tree,
+                                                                  text_filter='number 4242')),
+        ]
+        for label, measure in measurements:
+            if history_tree is not None:
+                history_tree.delete(*history_tree.get_children())
+            print(f"{label:>28}: {measure() * 1e3:9.1f} ms")
+        history_store.close()
+
+
+if __name__ == '__main__':
+    main()
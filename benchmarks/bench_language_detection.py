@@ -0,0 +1,281 @@
+"""Benchmark local, remote-stub and hybrid language detection offline
+
+Runs every detector over a labelled set of sentences that are not part of
+the detector's seed samples, and over sentences in languages that have no
+profile, and reports accuracy, mean latency and how often the remote
+detector was consulted. The remote stub answers correctly after an
+injected delay, standing in for a round-trip to the translation service.
+Calibration is checked on every word prefix of the held-out sentences,
+since typed input is often only a few words: accuracy per confidence band,
+and the share answered locally and its accuracy at candidate thresholds.
+--fit refits CALIBRATION_WEIGHTS with two-fold cross-validation (by
+sentence) and prints the new constants.
+
+    python benchmarks/bench_language_detection.py --remote-latency 0.15
+    python benchmarks/bench_language_detection.py --fit
+"""
+import argparse
+import math
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from language_detector import (MAX_DETECTION_CHARACTERS, POSTERIOR_CLIP, HybridLanguageDetector,
+                               LocalLanguageDetector, calibrated_confidence, extract_ngrams)
+
+HELD_OUT_SENTENCES = [
+    ('en', "My sister bought a new bicycle last week and rides it to work every day."),
+    ('en', "Please remember to close the windows before you leave the house."),
+    ('fr', "Ma sœur a acheté un nouveau vélo la semaine dernière et elle va au travail avec tous les jours."),
+    ('fr', "N'oubliez pas de fermer les fenêtres avant de quitter la maison."),
+    ('de', "Meine Schwester hat letzte Woche ein neues Fahrrad gekauft und fährt jeden Tag damit zur Arbeit."),
+    ('de', "Bitte denk daran, die Fenster zu schließen, bevor du das Haus verlässt."),
+    ('es', "Mi hermana compró una bicicleta nueva la semana pasada y va al trabajo en ella todos los días."),
+    ('es', "Por favor, recuerda cerrar las ventanas antes de salir de casa."),
+    ('it', "Mia sorella ha comprato una bicicletta nuova la settimana scorsa e ci va al lavoro ogni giorno."),
+    ('it', "Ricordati di chiudere le finestre prima di uscire di casa."),
+    ('pt', "Minha irmã comprou uma bicicleta nova na semana passada e vai para o trabalho com ela todos os dias."),
+    ('pt', "Por favor, lembre-se de fechar as janelas antes de sair de casa."),
+    ('nl', "Mijn zus heeft vorige week een nieuwe fiets gekocht en fietst er elke dag mee naar haar werk."),
+    ('nl', "Vergeet alsjeblieft niet de ramen te sluiten voordat je het huis verlaat."),
+    ('sv', "Min syster köpte en ny cykel förra veckan och cyklar till jobbet varje dag."),
+    ('sv', "Kom ihåg att stänga fönstren innan du lämnar huset."),
+    ('pl', "Moja siostra kupiła w zeszłym tygodniu nowy rower i codziennie jeździ nim do pracy."),
+    ('pl', "Pamiętaj, aby zamknąć okna przed wyjściem z domu."),
+    ('tr', "Kız kardeşim geçen hafta yeni bir bisiklet aldı ve her gün onunla işe gidiyor."),
+    ('tr', "Lütfen evden çıkmadan önce pencereleri kapatmayı unutma."),
+    ('id', "Adik perempuan saya membeli sepeda baru minggu lalu dan bersepeda ke kantor setiap hari."),
+    ('id', "Jangan lupa menutup jendela sebelum kamu pergi dari rumah."),
+    ('ru', "Моя сестра на прошлой неделе купила новый велосипед и каждый день ездит на нём на работу."),
+    ('ru', "Пожалуйста, не забудь закрыть окна перед тем, как уйти из дома."),
+    ('uk', "Моя сестра минулого тижня купила новий велосипед і щодня їздить на ньому на роботу."),
+    ('uk', "Будь ласка, не забудь зачинити вікна, перш ніж вийти з дому."),
+    ('ar', "اشترت أختي دراجة جديدة الأسبوع الماضي وتذهب بها إلى العمل كل يوم."),
+    ('ar', "من فضلك تذكر أن تغلق النوافذ قبل أن تغادر المنزل."),
+    ('fa', "خواهرم هفته گذشته یک دوچرخه نو خرید و هر روز با آن به سر کار می‌رود."),
+    ('fa', "لطفا یادت باشد قبل از بیرون رفتن از خانه پنجره‌ها را ببندی."),
+    ('hi', "मेरी बहन ने पिछले हफ्ते एक नई साइकिल खरीदी और वह हर दिन उससे काम पर जाती है।"),
+    ('hi', "कृपया घर से निकलने से पहले खिड़कियाँ बंद करना याद रखें।"),
+    ('zh-cn', "我妹妹上周买了一辆新自行车，每天骑车去上班。"),
+    ('ja', "妹は先週新しい自転車を買って、毎日それで仕事に行っています。"),
+    ('ko', "제 여동생은 지난주에 새 자전거를 사서 매일 그것을 타고 출근합니다."),
+    ('el', "Η αδερφή μου αγόρασε ένα καινούργιο ποδήλατο την περασμένη εβδομάδα."),
+    ('th', "น้องสาวของฉันซื้อจักรยานคันใหม่เมื่อสัปดาห์ที่แล้ว"),
+]
+
+# Latin and Cyrillic languages without a seed profile: the local detector
+# cannot name them, so only the remote detector gets these right
+UNPROFILED_SENTENCES = [
+    ('hu', "A húgom múlt héten vett egy új biciklit, és minden nap azzal jár dolgozni."),
+    ('hu', "Kérlek, ne felejtsd el becsukni az ablakokat, mielőtt elmész otthonról."),
+    ('fi', "Siskoni osti viime viikolla uuden polkupyörän ja ajaa sillä joka päivä töihin."),
+    ('fi', "Muista sulkea ikkunat ennen kuin lähdet kotoa."),
+    ('cs', "Moje sestra si minulý týden koupila nové kolo a každý den na něm jezdí do práce."),
+    ('cs', "Nezapomeň prosím zavřít okna, než odejdeš z domu."),
+    ('ro', "Sora mea și-a cumpărat o bicicletă nouă săptămâna trecută și merge cu ea la serviciu în fiecare zi."),
+    ('ro', "Te rog să nu uiți să închizi ferestrele înainte să pleci de acasă."),
+    ('da', "Min søster købte en ny cykel i sidste uge og cykler på arbejde hver dag."),
+    ('da', "Husk at lukke vinduerne, før du går hjemmefra."),
+    ('sw', "Dada yangu alinunua baiskeli mpya wiki iliyopita na anaiendesha kwenda kazini kila siku."),
+    ('sw', "Tafadhali kumbuka kufunga madirisha kabla ya kuondoka nyumbani."),
+    ('vi', "Em gái tôi đã mua một chiếc xe đạp mới vào tuần trước và đạp xe đi làm mỗi ngày."),
+    ('vi', "Làm ơn nhớ đóng cửa sổ trước khi bạn ra khỏi nhà."),
+    ('bg', "Сестра ми си купи нов велосипед миналата седмица и всеки ден ходи с него на работа."),
+    ('bg', "Моля те, не забравяй да затвориш прозорците, преди да излезеш от къщи."),
+]
+CONFIDENCE_BANDS = (0.0, 0.5, 0.7, 0.8, 0.9, 0.95, 0.99, 1.01)
+CANDIDATE_THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99)
+
+
+class RemoteDetectorStub:
+    """Always-correct remote detector with an injected round-trip delay"""
+
+    def __init__(self, latency_seconds):
+        self.latency_seconds = latency_seconds
+        self.expected_languages = dict((text, code) for code, text in HELD_OUT_SENTENCES + UNPROFILED_SENTENCES)
+        self.calls = 0
+
+    def detect(self, text_content):
+        self.calls += 1
+        time.sleep(self.latency_seconds)
+        return self.expected_languages.get(text_content, 'en'), 0.99
+
+
+def evaluate(detect, sentences):
+    """Return (accuracy, mean seconds per detection)"""
+    correct_count = 0
+    start_time = time.perf_counter()
+    for expected_language, sentence in sentences:
+        correct_count += detect(sentence)[0] == expected_language
+    elapsed_seconds = time.perf_counter() - start_time
+    return correct_count / len(sentences), elapsed_seconds / len(sentences)
+
+
+def word_prefixes(sentences):
+    """(expected language, prefix) for every leading run of words of every sentence"""
+    for expected_language, sentence in sentences:
+        words = sentence.split()
+        for word_count in range(1, len(words) + 1):
+            yield expected_language, ' '.join(words[:word_count])
+
+
+def calibration_features(detector, text_content):
+    """(language, (posterior logit, log characters)) when n-gram scores decide, else None"""
+    text_content = text_content[:MAX_DETECTION_CHARACTERS]
+    candidate_languages = detector.candidate_languages(text_content)
+    with detector.detector_lock:
+        profiled_languages = [code for code in candidate_languages if code in detector.language_index]
+        if len(candidate_languages) < 2 or not profiled_languages:
+            return None  # Decided by script alone
+        best_language, posterior = detector.score_languages(extract_ngrams(text_content), profiled_languages)
+    posterior = min(max(posterior, POSTERIOR_CLIP), 1 - POSTERIOR_CLIP)
+    return best_language, (math.log(posterior / (1 - posterior)), math.log(max(len(text_content), 1)))
+
+
+def calibration_samples(detector, sentences):
+    samples = []
+    for expected_language, prefix in word_prefixes(sentences):
+        detection = calibration_features(detector, prefix)
+        if detection is not None:
+            samples.append((detection[1], detection[0] == expected_language))
+    return samples
+
+
+def fit_platt(samples, iterations=50, ridge=1e-3):
+    """Logistic regression of correctness on the features, by Newton's method"""
+    weights = [0.0, 0.0, 0.0]
+    for _ in range(iterations):
+        gradient = [ridge * weight for weight in weights]
+        hessian = [[ridge if row == column else 0.0 for column in range(3)] for row in range(3)]
+        for features, correct in samples:
+            inputs = (*features, 1.0)
+            probability = platt_probability(weights, features)
+            for row in range(3):
+                gradient[row] += (probability - correct) * inputs[row]
+                for column in range(3):
+                    hessian[row][column] += probability * (1 - probability) * inputs[row] * inputs[column]
+        step = solve_linear(hessian, gradient)
+        weights = [weight - step_size for weight, step_size in zip(weights, step)]
+    return tuple(weights)
+
+
+def platt_probability(weights, features):
+    calibrated_logit = sum(weight * value for weight, value in zip(weights, (*features, 1.0)))
+    return 1 / (1 + math.exp(-max(-30.0, min(30.0, calibrated_logit))))
+
+
+def solve_linear(matrix, vector):
+    """Gauss-Jordan elimination for the small Newton system"""
+    augmented = [row[:] + [value] for row, value in zip(matrix, vector)]
+    size = len(augmented)
+    for pivot in range(size):
+        pivot_value = augmented[pivot][pivot]
+        augmented[pivot] = [value / pivot_value for value in augmented[pivot]]
+        for row in range(size):
+            if row != pivot:
+                factor = augmented[row][pivot]
+                augmented[row] = [value - factor * pivot_entry
+                                  for value, pivot_entry in zip(augmented[row], augmented[pivot])]
+    return [row[-1] for row in augmented]
+
+
+def report_calibration(scored_samples):
+    """Print accuracy per confidence band and local share and accuracy per threshold"""
+    for lower_bound, upper_bound in zip(CONFIDENCE_BANDS, CONFIDENCE_BANDS[1:]):
+        band = [correct for confidence, correct in scored_samples if lower_bound <= confidence < upper_bound]
+        if band:
+            print(f"  confidence {lower_bound:.2f}-{min(upper_bound, 1.0):.2f}: {len(band):>4} answers, "
+                  f"{sum(band) / len(band):.0%} correct")
+    print(f"  {'threshold':>9} {'answered locally':>17} {'local accuracy':>15}")
+    for threshold in CANDIDATE_THRESHOLDS:
+        local_answers = [correct for confidence, correct in scored_samples if confidence >= threshold]
+        local_accuracy = f"{sum(local_answers) / len(local_answers):.1%}" if local_answers else '-'
+        print(f"  {threshold:>9.2f} {len(local_answers) / len(scored_samples):>17.0%} {local_accuracy:>15}")
+
+
+def fit_calibration(detector):
+    """Cross-validate the calibration by sentence, then fit it on everything"""
+    folds = [HELD_OUT_SENTENCES[0::2], HELD_OUT_SENTENCES[1::2]]  # One sentence per language in each
+    fold_samples = [calibration_samples(detector, fold) for fold in folds]
+    cross_validated = []
+    for test_index, test_samples in enumerate(fold_samples):
+        fold_weights = fit_platt(fold_samples[1 - test_index])
+        cross_validated += [(platt_probability(fold_weights, features), correct)
+                            for features, correct in test_samples]
+    print("cross-validated calibration on word prefixes of the held-out sentences")
+    report_calibration(cross_validated)
+    fitted_weights = fit_platt(fold_samples[0] + fold_samples[1])
+    print(f"\nCALIBRATION_WEIGHTS = ({', '.join(f'{weight:.4f}' for weight in fitted_weights)})")
+
+
+def report_uncached_latency(detector, repeats=20):
+    """Median and slowest uncached local detection time, by input length"""
+    print("uncached local detection of held-out sentences, by length:")
+    for word_limit in (2, 5, None):
+        durations = []
+        for _, sentence in HELD_OUT_SENTENCES:
+            text_content = ' '.join(sentence.split()[:word_limit])
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                detector.detect_uncached(text_content)
+            durations.append((time.perf_counter() - start_time) / repeats)
+        length_name = 'whole' if word_limit is None else f"{word_limit} words"
+        print(f"  {length_name:>8}: median {statistics.median(durations) * 1e6:.0f} us, "
+              f"slowest {max(durations) * 1e6:.0f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--remote-latency', type=float, default=0.15, help="remote stub delay in seconds")
+    parser.add_argument('--threshold', type=float, help="hybrid local confidence threshold (default: shipped)")
+    parser.add_argument('--word-limit', type=int, default=0,
+                        help="truncate sentences to this many words (0 keeps them whole)")
+    parser.add_argument('--fit', action='store_true', help="refit the confidence calibration and print it")
+    arguments = parser.parse_args()
+
+    if arguments.fit:
+        fit_calibration(LocalLanguageDetector())
+        return
+
+    sentence_sets = {'held-out': HELD_OUT_SENTENCES, 'unprofiled': UNPROFILED_SENTENCES}
+    if arguments.word_limit:
+        sentence_sets = {set_name: [(code, ' '.join(text.split()[:arguments.word_limit])) for code, text in sentences]
+                         for set_name, sentences in sentence_sets.items()}
+
+    local_detector = LocalLanguageDetector()
+    remote_stub = RemoteDetectorStub(arguments.remote_latency)
+    hybrid_options = {} if arguments.threshold is None else {'confidence_threshold': arguments.threshold}
+    hybrid_detector = HybridLanguageDetector(LocalLanguageDetector(), remote_stub.detect, **hybrid_options)
+
+    print(f"hybrid threshold {hybrid_detector.confidence_threshold}")
+    print(f"{'sentences':>10} {'mode':>8} {'accuracy':>9} {'mean latency':>13} {'remote calls':>13}")
+    local_detector.detect_uncached(HELD_OUT_SENTENCES[0][1])  # Load the language list outside the timings
+    for set_name, sentences in sentence_sets.items():
+        for mode, detect in (('local', local_detector.detect_uncached), ('remote', remote_stub.detect),
+                             ('hybrid', hybrid_detector.detect)):
+            calls_before = remote_stub.calls
+            accuracy, mean_seconds = evaluate(detect, sentences)
+            latency_text = f"{mean_seconds * 1e6:.0f} us" if mean_seconds < 1e-3 else f"{mean_seconds * 1e3:.1f} ms"
+            print(f"{set_name:>10} {mode:>8} {accuracy:>9.0%} {latency_text:>13} "
+                  f"{remote_stub.calls - calls_before:>9} / {len(sentences):<3}")
+
+    held_out_sentences = sentence_sets['held-out']
+    for _, sentence in held_out_sentences:
+        local_detector.detect(sentence)  # Fill the per-input cache
+    cached_start = time.perf_counter()
+    for _, sentence in held_out_sentences:
+        local_detector.detect(sentence)
+    cached_seconds = (time.perf_counter() - cached_start) / len(held_out_sentences)
+    print(f"local detection served from the per-input cache: {cached_seconds * 1e6:.1f} us")
+    report_uncached_latency(local_detector)
+
+    print("\nlocal confidence calibration on word prefixes of the held-out sentences")
+    report_calibration([(local_detector.detect_uncached(prefix)[1], local_detector.detect_uncached(prefix)[0] == code)
+                        for code, prefix in word_prefixes(HELD_OUT_SENTENCES)])
+
+
+if __name__ == '__main__':
+    main()
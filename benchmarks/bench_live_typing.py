@@ -0,0 +1,127 @@
+"""Benchmark main-thread time per live-translation event while typing
+
+Types a multi-paragraph document one character at a time into a
+LiveTranslationController driven by a virtual-clock stand-in for the Tk
+root, with a slow fake backend, and reports p50/p99/max main-thread time
+for each stage against MAIN_THREAD_BUDGET_SECONDS.
+
+    python benchmarks/bench_live_typing.py --paragraphs 6 --latency 0.05
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+from history_store import TranslationHistoryStore
+from live_translation import MAIN_THREAD_BUDGET_SECONDS, LiveTranslationController
+from translation_cache import TranslationCache
+from translation_core import TranslationCore
+from translation_metrics import TranslationMetrics
+from translation_worker import TranslationWorker
+
+PARAGRAPH = ("The weather was cold this morning, so we stayed inside and read. "
+             "After lunch the rain stopped and the children went out to play.")
+
+
+class VirtualClockRoot:
+    """after()/after_cancel() on a clock that only moves when advanced"""
+
+    def __init__(self):
+        self.now_ms = 0
+        self.timers = {}
+        self.timer_numbers = itertools.count(1)
+
+    def after(self, delay_ms, callback):
+        timer_number = next(self.timer_numbers)
+        self.timers[timer_number] = (self.now_ms + delay_ms, callback)
+        return timer_number
+
+    def after_cancel(self, timer_number):
+        self.timers.pop(timer_number, None)
+
+    def advance(self, elapsed_ms):
+        target_ms = self.now_ms + elapsed_ms
+        while True:
+            due_timers = [(due_ms, timer_number) for timer_number, (due_ms, _) in self.timers.items()
+                          if due_ms <= target_ms]
+            if not due_timers:
+                break
+            self.now_ms, timer_number = min(due_timers)
+            self.timers.pop(timer_number)[1]()
+        self.now_ms = target_ms
+
+
+class TypingTextArea:
+    def __init__(self):
+        self.text_content = ''
+        self.modified = False
+
+    def edit_modified(self, modified=None):
+        if modified is None:
+            return self.modified
+        self.modified = modified
+
+    def get(self, start_index, end_index):
+        return self.text_content
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--paragraphs', type=int, default=6)
+    parser.add_argument('--latency', type=float, default=0.05, help="fake backend latency in seconds")
+    parser.add_argument('--keystroke-ms', type=int, default=60)
+    arguments = parser.parse_args()
+
+    root_window = VirtualClockRoot()
+    translation_core = TranslationCore(FakeTranslator(arguments.latency),
+                                       TranslationHistoryStore(':memory:', legacy_json_path=None),
+                                       translation_cache=TranslationCache(disk_path=None))
+    live_app = SimpleNamespace(
+        root_window=root_window, input_text_area=TypingTextArea(), translation_core=translation_core,
+        source_language_combobox=SimpleNamespace(get=lambda: 'English'),
+        target_language_combobox=SimpleNamespace(get=lambda: 'French'),
+        translation_worker=TranslationWorker(root_window), metrics=TranslationMetrics(enabled=True),
+        display_translation_result=lambda translated_text, confidence: None)
+    stage_timings = {}
+    live_translation = LiveTranslationController(
+        live_app, timing_hook=lambda stage, elapsed_seconds: stage_timings.setdefault(stage, []).append(
+            elapsed_seconds))
+    live_translation.enable()
+
+    typed_document = '\n\n'.join(f"{number}. {PARAGRAPH}" for number in range(1, arguments.paragraphs + 1))
+    start_time = time.perf_counter()
+    for position, character in enumerate(typed_document, 1):
+        live_app.input_text_area.text_content += character
+        live_app.input_text_area.modified = True
+        live_translation.on_text_modified()
+        root_window.advance(arguments.keystroke_ms)
+        if character == '\n' or position == len(typed_document):
+            # Pause typing until the paragraph's translation has been shown
+            root_window.advance(live_translation.debounce_ms)
+            while live_app.translation_worker.latest_requests:
+                time.sleep(0.001)
+                root_window.advance(20)
+    elapsed_seconds = time.perf_counter() - start_time
+    live_app.translation_worker.shutdown()
+
+    print(f"{len(typed_document)} keystrokes in {elapsed_seconds:.2f} s, "
+          f"budget {MAIN_THREAD_BUDGET_SECONDS * 1e3:.0f} ms")
+    print(f"{'stage':>16} {'events':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'over budget':>12}")
+    for stage, timings in stage_timings.items():
+        print(f"{stage:>16} {len(timings):>7} {percentile(timings, 0.5) * 1e3:>8.3f} "
+              f"{percentile(timings, 0.99) * 1e3:>8.3f} {max(timings) * 1e3:>8.3f} "
+              f"{sum(timing > MAIN_THREAD_BUDGET_SECONDS for timing in timings):>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark the cost of stage instrumentation, disabled and enabled
+
+Times a bare `with metrics.stage(...)` block in a tight loop, then a
+memory-hit translate_text call (the cheapest instrumented path, where
+overhead would show most) with metrics disabled and enabled. Offline.
+
+    python benchmarks/bench_metrics_overhead.py --iterations 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+from history_store import TranslationHistoryStore
+from translation_cache import TranslationCache
+from translation_core import TranslationCore
+from translation_metrics import TranslationMetrics
+
+
+def time_bare_stage(metrics, iterations):
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        with metrics.stage('bench'):
+            pass
+    return (time.perf_counter() - start_time) / iterations
+
+
+def time_memory_hits(metrics, iterations):
+    translation_core = TranslationCore(FakeTranslator(), TranslationHistoryStore(':memory:', legacy_json_path=None),
+                                       translation_cache=TranslationCache(disk_path=None), metrics=metrics)
+    translation_core.translate_text("The train leaves at nine in the morning.", 'en', 'fr')
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        translation_core.translate_text("The train leaves at nine in the morning.", 'en', 'fr')
+    return (time.perf_counter() - start_time) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200000)
+    arguments = parser.parse_args()
+
+    empty_loop_start = time.perf_counter()
+    for _ in range(arguments.iterations):
+        pass
+    empty_loop_seconds = (time.perf_counter() - empty_loop_start) / arguments.iterations
+
+    print(f"{'measurement':>28} {'disabled ns':>12} {'enabled ns':>11}")
+    print(f"{'empty loop iteration':>28} {empty_loop_seconds * 1e9:>12.0f} {'':>11}")
+    for label, timed_function, iterations in (('bare stage block', time_bare_stage, arguments.iterations),
+                                              ('translate_text memory hit', time_memory_hits,
+                                               arguments.iterations // 20)):
+        disabled_seconds = timed_function(TranslationMetrics(enabled=False), iterations)
+        enabled_seconds = timed_function(TranslationMetrics(enabled=True), iterations)
+        print(f"{label:>28} {disabled_seconds * 1e9:>12.0f} {enabled_seconds * 1e9:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
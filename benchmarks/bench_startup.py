@@ -0,0 +1,154 @@
+"""Benchmark application import time and time-to-first-window
+
+Each run starts a fresh interpreter in a working directory holding a
+history database of --history-size synthetic entries (empty by default).
+The import phase loads the GUI module under -X importtime and reports total
+and per-package import cost plus which optional dependencies were pulled
+in. The core phase builds a TranslationCore on that history and reports
+when it is usable and when the translation memory index has caught up in
+the background. The window phase builds SmartTranslatorApp against the
+offline fake engine and stops once the first frame is drawn (skipped
+without a display). Pass --eager to pre-import googletrans and pyperclip
+the way the app used to.
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --runs 5 --history-size 50000
+    python benchmarks/bench_startup.py --runs 5 --eager
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_suite import SyntheticText, populated_store
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPLICATION_PATH = os.path.join(PACKAGE_DIRECTORY, 'Language Translation Tool.py')
+OPTIONAL_DEPENDENCIES = ('googletrans', 'httpx', 'gtts', 'playsound', 'pyperclip')
+
+LOAD_APPLICATION = f"""
+import importlib.util, sys
+sys.path.insert(0, {PACKAGE_DIRECTORY!r})
+{{eager_imports}}
+application_spec = importlib.util.spec_from_file_location('translator_app', {APPLICATION_PATH!r})
+translator_app = importlib.util.module_from_spec(application_spec)
+application_spec.loader.exec_module(translator_app)
+"""
+
+IMPORT_ONLY = LOAD_APPLICATION + f"""
+print(','.join(name for name in {OPTIONAL_DEPENDENCIES!r} if name in sys.modules))
+"""
+
+CORE_STARTUP = f"""
+import sys, time
+sys.path.insert(0, {PACKAGE_DIRECTORY!r})
+start_time = time.perf_counter()
+from fake_translator import FakeTranslator
+from translation_core import TranslationCore
+translation_core = TranslationCore(FakeTranslator(0))
+usable_time = time.perf_counter()
+translation_core.translation_memory.wait_until_indexed()
+print(usable_time - start_time, time.perf_counter() - start_time)
+"""
+
+FIRST_WINDOW = LOAD_APPLICATION + """
+import tkinter as tk
+try:
+    application_root = tk.Tk()
+except tk.TclError:
+    sys.exit(3)
+from fake_translator import FakeTranslator
+from speech_cache import FakeSpeechBackend
+translator_app.SmartTranslatorApp(application_root, FakeTranslator(0), FakeSpeechBackend())
+application_root.update()
+print('ready', flush=True)
+"""
+
+
+def run_child(script, working_directory, extra_arguments=()):
+    return subprocess.run([sys.executable, *extra_arguments, '-c', script], cwd=working_directory,
+                          capture_output=True, text=True)
+
+
+def parse_importtime(stderr_text):
+    """Return {top-level module: cumulative microseconds} from -X importtime output"""
+    top_level_imports = {}
+    for line in stderr_text.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_text, module_text = line[len('import time:'):].split('|')
+        if not module_text.startswith('  '):  # Nested imports are indented further
+            module_name = module_text.strip().split('.')[0]
+            top_level_imports[module_name] = top_level_imports.get(module_name, 0) + int(cumulative_text)
+    return top_level_imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per measurement")
+    parser.add_argument('--eager', action='store_true',
+                        help="import googletrans and pyperclip up front, as the app used to")
+    parser.add_argument('--top', type=int, default=8, help="number of slowest imports to list")
+    parser.add_argument('--history-size', type=int, default=0, help="synthetic history entries to start with")
+    parser.add_argument('--seed', type=int, default=1234, help="seed for the synthetic history")
+    arguments = parser.parse_args()
+
+    eager_imports = 'import googletrans, pyperclip' if arguments.eager else ''
+    import_script = IMPORT_ONLY.replace('{eager_imports}', eager_imports)
+    window_script = FIRST_WINDOW.replace('{eager_imports}', eager_imports)
+
+    with tempfile.TemporaryDirectory() as working_directory:
+        if arguments.history_size:
+            populated_store(os.path.join(working_directory, 'translation_history.db'),
+                            SyntheticText(arguments.seed), arguments.history_size).close()
+        import_totals = []
+        import_breakdowns = []
+        for _ in range(arguments.runs):
+            child = run_child(import_script, working_directory, ('-X', 'importtime'))
+            if child.returncode:
+                sys.exit(child.stderr)
+            import_breakdown = parse_importtime(child.stderr)
+            import_breakdowns.append(import_breakdown)
+            import_totals.append(sum(import_breakdown.values()) / 1000)
+            loaded_dependencies = child.stdout.strip() or 'none'
+
+        print(f"import time (median of {arguments.runs}): {statistics.median(import_totals):.1f} ms")
+        print(f"optional dependencies loaded at startup: {loaded_dependencies}")
+        module_medians = {module_name: statistics.median(breakdown.get(module_name, 0)
+                                                         for breakdown in import_breakdowns)
+                          for module_name in import_breakdowns[0]}
+        for module_name, microseconds in sorted(module_medians.items(), key=lambda item: -item[1])[:arguments.top]:
+            print(f"  {module_name:<28} {microseconds / 1000:8.1f} ms")
+
+        usable_times, indexed_times = [], []
+        for _ in range(arguments.runs):
+            child = run_child(CORE_STARTUP, working_directory)
+            if child.returncode:
+                sys.exit(child.stderr)
+            usable_seconds, indexed_seconds = map(float, child.stdout.split())
+            usable_times.append(usable_seconds)
+            indexed_times.append(indexed_seconds)
+        print(f"TranslationCore with {arguments.history_size} history entries (median): "
+              f"usable after {statistics.median(usable_times) * 1000:.1f} ms, "
+              f"memory index ready after {statistics.median(indexed_times) * 1000:.1f} ms")
+
+        window_times = []
+        for _ in range(arguments.runs):
+            start_time = time.perf_counter()
+            child = run_child(window_script, working_directory)
+            if child.returncode == 3:
+                print("time-to-first-window: skipped (no display)")
+                break
+            if child.returncode:
+                sys.exit(child.stderr)
+            window_times.append(time.perf_counter() - start_time)
+        if window_times:
+            print(f"time-to-first-window including interpreter start (median): "
+                  f"{statistics.median(window_times) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""Reproducible benchmark suite for the non-GUI translation workflow
+
+Runs memory lookup, history save and load, language detection, end-to-end
+translate_document and CLI batch throughput at several history and input
+sizes against a seeded, latency-injecting FakeTranslator. Everything random
+(synthetic text, fake latencies, confidence scores) derives from --seed, so
+two runs of the same commit do the same work and produce the same outputs.
+Results are written as JSON; pass an earlier file to --compare to print the
+change per benchmark.
+
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --output new.json --compare results.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+from history_store import INSERT_HISTORY_SQL, TranslationHistoryStore
+from language_detector import LocalLanguageDetector
+from translate_cli import BatchTranslator
+from translation_cache import TranslationCache
+from translation_core import TranslationCore
+from translation_memory import TranslationMemory
+
+COMMON_WORDS = ("the a of to and in is it you that he was for on are with as his they be at "
+                "one have this from or had by word but what some we can out other were all").split()
+INPUT_SIZES = {'sentence': 1, 'paragraph': 6, 'document': 40}  # Sentences per input
+
+
+class SyntheticText:
+    """Seeded generator of sentences with natural function-word frequencies"""
+
+    def __init__(self, seed, vocabulary_size=3000):
+        self.rng = random.Random(seed)
+        self.vocabulary = COMMON_WORDS + [
+            ''.join(self.rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(self.rng.randint(3, 10)))
+            for _ in range(vocabulary_size)]
+
+    def sentence(self):
+        words = [self.rng.choice(COMMON_WORDS) if self.rng.random() < 0.5 else self.rng.choice(self.vocabulary)
+                 for _ in range(self.rng.randint(6, 18))]
+        return ' '.join(words).capitalize() + '.'
+
+    def text(self, sentence_count):
+        return ' '.join(self.sentence() for _ in range(sentence_count))
+
+    def history_rows(self, entry_count):
+        return [(self.sentence(), f"translation {index}", 'en', 'fr', 80.0, f"2024-01-01T00:00:{index % 60:02d}")
+                for index in range(entry_count)]
+
+
+def summarize(durations, operations_per_sample=1):
+    """Timing statistics in milliseconds per operation"""
+    per_operation = sorted(duration / operations_per_sample for duration in durations)
+    return {
+        'samples': len(per_operation),
+        'median_ms': round(statistics.median(per_operation) * 1000, 4),
+        'p95_ms': round(per_operation[min(len(per_operation) - 1, int(0.95 * len(per_operation)))] * 1000, 4),
+        'mean_ms': round(statistics.mean(per_operation) * 1000, 4),
+    }
+
+
+def timed(operation):
+    start_time = time.perf_counter()
+    operation_result = operation()
+    return time.perf_counter() - start_time, operation_result
+
+
+def populated_store(database_path, synthetic_text, entry_count):
+    history_store = TranslationHistoryStore(database_path, legacy_json_path=None)
+    with history_store.database_lock, history_store.connection:
+        history_store.connection.executemany(INSERT_HISTORY_SQL, synthetic_text.history_rows(entry_count))
+    return history_store
+
+
+def build_core(history_store, arguments, latency_seconds=None):
+    fake_translator = FakeTranslator(arguments.latency if latency_seconds is None else latency_seconds,
+                                     latency_jitter_seconds=arguments.jitter, seed=arguments.seed)
+    translation_core = TranslationCore(fake_translator, history_store, translation_cache=TranslationCache(disk_path=None),
+                                       random_seed=arguments.seed)
+    return translation_core, fake_translator
+
+
+def bench_memory_lookup(work_directory, arguments, history_size):
+    synthetic_text = SyntheticText(arguments.seed)
+    history_entries = [dict(zip(('source', 'translation', 'src_lang', 'dest_lang', 'confidence', 'timestamp'), row))
+                       for row in synthetic_text.history_rows(history_size)]
+    translation_memory = TranslationMemory(history_entries)
+    queries = [(history_entries[index * 7 % history_size]['source'] if index % 2 else synthetic_text.sentence())
+               for index in range(arguments.repeats)]
+    durations = []
+    hits = 0
+    for query_text in queries:
+        duration, memory_entry = timed(lambda: translation_memory.lookup(query_text, 'en', 'fr'))
+        durations.append(duration)
+        hits += memory_entry is not None
+    return summarize(durations), {'hits': hits}
+
+
+def bench_history_save(work_directory, arguments, history_size):
+    synthetic_text = SyntheticText(arguments.seed)
+    history_store = populated_store(os.path.join(work_directory, f'save_{history_size}.db'), synthetic_text,
+                                    history_size)
+    durations = [timed(lambda: history_store.append({
+        'source': synthetic_text.sentence(), 'translation': 'translated', 'src_lang': 'en', 'dest_lang': 'fr',
+        'confidence': 80.0, 'timestamp': '2024-01-02T00:00:00'}))[0] for _ in range(arguments.repeats)]
+    history_store.close()
+    return summarize(durations), {}
+
+
+def bench_history_load(work_directory, arguments, history_size):
+    """Startup cost: open the store and build the memory index and detector profiles"""
+    database_path = os.path.join(work_directory, f'load_{history_size}.db')
+    populated_store(database_path, SyntheticText(arguments.seed), history_size).close()
+    durations = []
+    for _ in range(max(1, arguments.repeats // 20)):
+        history_store = TranslationHistoryStore(database_path, legacy_json_path=None)
+        duration, translation_core = timed(lambda: build_core(history_store, arguments)[0])
+        durations.append(duration)
+        history_store.close()
+    return summarize(durations), {'entries_loaded': len(translation_core.translation_history)}
+
+
+def bench_detection(work_directory, arguments, input_size):
+    synthetic_text = SyntheticText(arguments.seed)
+    language_detector = LocalLanguageDetector()
+    inputs = [synthetic_text.text(INPUT_SIZES[input_size]) for _ in range(arguments.repeats)]
+    durations = [timed(lambda: language_detector.detect_uncached(input_text))[0] for input_text in inputs]
+    return summarize(durations), {}
+
+
+def bench_translate(work_directory, arguments, input_size):
+    """End-to-end translate_document: cold inputs, then the same inputs again from memory"""
+    synthetic_text = SyntheticText(arguments.seed)
+    translation_core, fake_translator = build_core(TranslationHistoryStore(':memory:', legacy_json_path=None),
+                                                   arguments)
+    inputs = [synthetic_text.text(INPUT_SIZES[input_size]) for _ in range(max(1, arguments.repeats // 10))]
+    cold_durations, warm_durations, confidences = [], [], []
+    for input_text in inputs:
+        duration, translation_outcome = timed(lambda: translation_core.translate_document(input_text, 'en', 'fr'))
+        cold_durations.append(duration)
+        confidences.append(round(translation_outcome['confidence'], 6))
+    for input_text in inputs:
+        warm_durations.append(timed(lambda: translation_core.translate_document(input_text, 'en', 'fr'))[0])
+    # Identical across runs with the same seed; a change means the work itself changed
+    confidence_digest = hashlib.sha256(json.dumps(confidences).encode('utf-8')).hexdigest()[:16]
+    return summarize(cold_durations), {'warm': summarize(warm_durations),
+                                       'backend_calls': fake_translator.translate_calls,
+                                       'confidence_digest': confidence_digest}
+
+
+def bench_batch_throughput(work_directory, arguments, concurrency):
+    synthetic_text = SyntheticText(arguments.seed)
+    translation_core, fake_translator = build_core(TranslationHistoryStore(':memory:', legacy_json_path=None),
+                                                   arguments)
+    input_lines = [synthetic_text.sentence() + '\n' for _ in range(arguments.batch_lines)]
+    batch_translator = BatchTranslator(translation_core, 'en', 'fr', concurrency=concurrency, max_retries=0)
+    duration, records = timed(lambda: list(batch_translator.translate_lines(input_lines)))
+    return summarize([duration], len(input_lines)), {
+        'lines_per_second': round(len(input_lines) / duration, 1),
+        'backend_calls': fake_translator.translate_calls,
+        'failures': sum('error' in record for record in records)}
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    baseline_medians = {(entry['benchmark'], entry['parameter']): entry['timing']['median_ms']
+                        for entry in baseline['results']}
+    print(f"\ncompared with {baseline_path} ({baseline.get('commit')})")
+    print(f"{'benchmark':>16} {'parameter':>10} {'before ms':>10} {'after ms':>10} {'change':>8}")
+    for entry in results:
+        before_ms = baseline_medians.get((entry['benchmark'], entry['parameter']))
+        after_ms = entry['timing']['median_ms']
+        change_text = f"{(after_ms / before_ms - 1) * 100:+.0f}%" if before_ms else 'new'
+        print(f"{entry['benchmark']:>16} {entry['parameter']!s:>10} "
+              f"{before_ms if before_ms is not None else '-':>10} {after_ms:>10} {change_text:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results file")
+    parser.add_argument('--compare', help="earlier results file to compare against")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--history-sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--input-sizes', nargs='+', choices=sorted(INPUT_SIZES), default=sorted(INPUT_SIZES))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--repeats', type=int, default=200, help="samples per micro-benchmark")
+    parser.add_argument('--batch-lines', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.01, help="fake backend seconds per call")
+    parser.add_argument('--jitter', type=float, default=0.005, help="extra seeded fake latency, up to this much")
+    arguments = parser.parse_args()
+
+    scenarios = ([(bench_memory_lookup, size) for size in arguments.history_sizes] +
+                 [(bench_history_save, size) for size in arguments.history_sizes] +
+                 [(bench_history_load, size) for size in arguments.history_sizes] +
+                 [(bench_detection, size) for size in arguments.input_sizes] +
+                 [(bench_translate, size) for size in arguments.input_sizes] +
+                 [(bench_batch_throughput, concurrency) for concurrency in arguments.concurrency])
+
+    results = []
+    print(f"{'benchmark':>16} {'parameter':>10} {'median ms':>10} {'p95 ms':>10}  details")
+    with tempfile.TemporaryDirectory() as work_directory:
+        for benchmark_function, parameter in scenarios:
+            benchmark_name = benchmark_function.__name__[len('bench_'):]
+            timing, details = benchmark_function(work_directory, arguments, parameter)
+            results.append({'benchmark': benchmark_name, 'parameter': parameter, 'timing': timing,
+                            'details': details})
+            print(f"{benchmark_name:>16} {parameter!s:>10} {timing['median_ms']:>10} {timing['p95_ms']:>10}  "
+                  f"{details}")
+
+    report = {
+        'commit': current_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {name: value for name, value in vars(arguments).items() if name not in ('output', 'compare')},
+        'results': results,
+    }
+    with open(arguments.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nwrote {arguments.output}")
+    if arguments.compare:
+        compare(results, arguments.compare)
+
+
+if __name__ == '__main__':
+    main()
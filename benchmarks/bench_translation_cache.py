@@ -0,0 +1,96 @@
+"""Benchmark the two-tier translation cache against an uncached backend
+
+Translates --entries distinct sentences through a FakeTranslator with
+--latency seconds per call, then repeats them from the memory tier, then
+from a fresh TranslationCache on the same file (a restart). Finally
+--processes processes hammer one shared cache file with mixed reads and
+writes under a small disk budget to show cross-process safety and
+eviction. Offline.
+
+    python benchmarks/bench_translation_cache.py --entries 2000 --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+from translation_cache import CachedTranslator, TranslationCache
+
+
+def sentence(index):
+    return f"Sentence number {index} about the weather, the trains and the city."
+
+
+def timed_pass(cached_translator, entry_count):
+    start_time = time.perf_counter()
+    for index in range(entry_count):
+        cached_translator.translate(sentence(index), dest='fr', src='en')
+    return (time.perf_counter() - start_time) / entry_count
+
+
+def hammer_shared_cache(cache_path, operation_count, seed, disk_budget_bytes):
+    """One worker process: random reads and writes against the shared cache file"""
+    random_generator = random.Random(seed)
+    translation_cache = TranslationCache(cache_path, memory_budget_bytes=64 * 1024,
+                                         disk_budget_bytes=disk_budget_bytes)
+    fake_translator = FakeTranslator()
+    for _ in range(operation_count):
+        text_content = sentence(random_generator.randrange(operation_count * 2))
+        if translation_cache.get(text_content, 'en', 'de') is None:
+            translation_cache.put(text_content, 'en', 'de', fake_translator.translate(text_content, dest='de', src='en'))
+    translation_cache.close()
+    return translation_cache.statistics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=2000)
+    parser.add_argument('--latency', type=float, default=0.002, help="fake backend seconds per call")
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--operations', type=int, default=3000, help="cache operations per process")
+    parser.add_argument('--disk-budget', type=int, default=256 * 1024, help="shared cache budget in bytes")
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_directory:
+        cache_path = os.path.join(work_directory, 'translation_cache.db')
+        translation_cache = TranslationCache(cache_path)
+        cached_translator = CachedTranslator(FakeTranslator(arguments.latency), translation_cache)
+        miss_seconds = timed_pass(cached_translator, arguments.entries)
+        memory_seconds = timed_pass(cached_translator, arguments.entries)
+        translation_cache.close()
+
+        restarted_cache = TranslationCache(cache_path)
+        restarted_translator = CachedTranslator(FakeTranslator(arguments.latency), restarted_cache)
+        disk_seconds = timed_pass(restarted_translator, arguments.entries)
+        print(f"{'pass':>16} {'us per translate':>17}")
+        print(f"{'backend (miss)':>16} {miss_seconds * 1e6:>17.1f}")
+        print(f"{'memory tier':>16} {memory_seconds * 1e6:>17.1f}")
+        print(f"{'disk tier':>16} {disk_seconds * 1e6:>17.1f}")
+        print(f"restarted cache: {restarted_cache.statistics()}")
+        restarted_cache.close()
+
+        shared_path = os.path.join(work_directory, 'shared_cache.db')
+        TranslationCache(shared_path).close()  # Create the schema before the workers race
+        start_time = time.perf_counter()
+        with multiprocessing.Pool(arguments.processes) as pool:
+            worker_statistics = pool.starmap(hammer_shared_cache, [
+                (shared_path, arguments.operations, seed, arguments.disk_budget)
+                for seed in range(arguments.processes)])
+        elapsed_seconds = time.perf_counter() - start_time
+        total_operations = arguments.processes * arguments.operations
+        print(f"\n{arguments.processes} processes, {total_operations} operations on one file in "
+              f"{elapsed_seconds:.2f}s ({total_operations / elapsed_seconds:.0f} ops/sec), no errors")
+        for counter_name in ('memory_hits', 'disk_hits', 'misses', 'disk_evictions'):
+            print(f"  {counter_name:<15} {sum(statistics[counter_name] for statistics in worker_statistics)}")
+        print(f"  shared file size {os.path.getsize(shared_path) / 1024:.0f} KiB "
+              f"(budget {arguments.disk_budget / 1024:.0f} KiB of row data)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark translation memory lookups against history size
+
+Compares the indexed TranslationMemory with the original linear
+SequenceMatcher scan on a synthetic history and checks both agree.
+
+    python benchmarks/bench_translation_memory.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation_memory import TranslationMemory
+
+COMMON_WORDS = ("the a of to and in is it you that he was for on are with as his they be at "
+                "one have this from or had by word but what some we can out other were all").split()
+LANGUAGE_PAIRS = [('en', 'hi'), ('en', 'fr'), ('en', 'de'), ('fr', 'en')]
+
+
+def build_vocabulary(rng, word_count=3000):
+    """Common function words plus a long tail of pseudo-words"""
+    return COMMON_WORDS + [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 10)))
+                           for _ in range(word_count)]
+
+
+def build_sentence(vocabulary, rng):
+    """Pick function words half the time, like natural text"""
+    return ' '.join(rng.choice(COMMON_WORDS) if rng.random() < 0.5 else rng.choice(vocabulary)
+                    for _ in range(rng.randint(4, 20)))
+
+
+def build_history(entry_count, vocabulary, rng):
+    """Generate synthetic history entries with realistic sentence lengths"""
+    return [{
+        'source': build_sentence(vocabulary, rng),
+        'translation': f"translation {index}",
+        'src_lang': pair[0],
+        'dest_lang': pair[1],
+        'confidence': 80.0,
+        'timestamp': '2024-01-01T00:00:00',
+    } for index, pair in enumerate(rng.choice(LANGUAGE_PAIRS) for _ in range(entry_count))]
+
+
+def build_queries(history, vocabulary, query_count, rng):
+    """Mix exact repeats, light edits of existing entries and unseen text"""
+    queries = []
+    for index in range(query_count):
+        entry = rng.choice(history)
+        if index % 3 == 0:
+            query_text = entry['source']
+        elif index % 3 == 1:
+            query_text = entry['source'] + rng.choice('.!?')
+        else:
+            query_text = build_sentence(vocabulary, rng)
+        queries.append((query_text, entry['src_lang'], entry['dest_lang']))
+    return queries
+
+
+def linear_lookup(history, source_text, source_lang, target_lang):
+    """The pre-index SmartTranslatorApp.check_translation_memory scan"""
+    for memory_entry in history:
+        text_similarity = SequenceMatcher(None, source_text.lower(), memory_entry['source'].lower()).ratio()
+        if (memory_entry['src_lang'] == source_lang and
+                memory_entry['dest_lang'] == target_lang and
+                text_similarity > 0.9):
+            return memory_entry
+    return None
+
+
+def time_lookups(lookup, queries):
+    """Return the results and mean seconds per lookup"""
+    start_time = time.perf_counter()
+    results = [lookup(*query) for query in queries]
+    return results, (time.perf_counter() - start_time) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--linear-queries', type=int, default=3,
+                        help="queries timed with the slow linear scan (0 to skip)")
+    parser.add_argument('--seed', type=int, default=1234)
+    arguments = parser.parse_args()
+
+    print(f"{'entries':>8} {'build s':>9} {'indexed us':>11} {'linear us':>11} {'speedup':>8}")
+    for history_size in arguments.sizes:
+        rng = random.Random(arguments.seed)
+        vocabulary = build_vocabulary(rng)
+        history = build_history(history_size, vocabulary, rng)
+        queries = build_queries(history, vocabulary, arguments.queries, rng)
+
+        build_start = time.perf_counter()
+        translation_memory = TranslationMemory(history)
+        build_seconds = time.perf_counter() - build_start
+        indexed_results, indexed_seconds = time_lookups(translation_memory.lookup, queries)
+
+        linear_column, speedup_column = '-', '-'
+        if arguments.linear_queries:
+            sample = queries[:arguments.linear_queries]
+            linear_results, linear_seconds = time_lookups(
+                lambda *query: linear_lookup(history, *query), sample)
+            if any(a is not b for a, b in zip(linear_results, indexed_results)):
+                sys.exit("indexed lookup disagrees with the linear scan")
+            linear_column = f"{linear_seconds * 1e6:.0f}"
+            speedup_column = f"{linear_seconds / indexed_seconds:.0f}x"
+
+        print(f"{history_size:>8} {build_seconds:>9.2f} {indexed_seconds * 1e6:>11.0f} "
+              f"{linear_column:>11} {speedup_column:>8}")
+
+
+if __name__ == '__main__':
+    main()
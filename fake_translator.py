@@ -0,0 +1,51 @@
+import random
+import time
+from types import SimpleNamespace
+
+
+class FakeTranslator:
+    """Offline stand-in for googletrans.Translator with injected latency
+
+    translate() prefixes every line of the input with the destination code,
+    e.g. "[hi] hello", and reports detected_language as the source when asked
+    to auto-detect, like the real backend. detect() always reports
+    detected_language. Both sleep for latency_seconds first so UI
+    responsiveness can be exercised without a network connection. With
+    latency_jitter_seconds, each call sleeps up to that much longer; the
+    extra delay is derived from seed and the text, so it is reproducible.
+    Each result also lists alternative_count variants such as "[hi:1] hello"
+    under extra_data['alternatives'].
+    """
+
+    def __init__(self, latency_seconds=0.0, detected_language='en', detection_confidence=0.9,
+                 latency_jitter_seconds=0.0, seed=None, alternative_count=2):
+        self.latency_seconds = latency_seconds
+        self.latency_jitter_seconds = latency_jitter_seconds
+        self.seed = seed
+        self.detected_language = detected_language
+        self.detection_confidence = detection_confidence
+        self.alternative_count = alternative_count
+        self.translate_calls = 0
+        self.detect_calls = 0
+
+    def call_latency(self, text):
+        if not self.latency_jitter_seconds:
+            return self.latency_seconds
+        return self.latency_seconds + random.Random(f"{self.seed}\0{text}").uniform(0, self.latency_jitter_seconds)
+
+    def translate(self, text, dest='en', src='auto'):
+        self.translate_calls += 1
+        time.sleep(self.call_latency(text))
+        extra_data = {'alternatives': ['\n'.join(f"[{dest}:{number}] {line}" for line in text.split('\n'))
+                                       for number in range(1, self.alternative_count + 1)]}
+        if src == 'auto':
+            src = self.detected_language
+            extra_data['confidence'] = self.detection_confidence
+        translated_text = '\n'.join(f"[{dest}] {line}" for line in text.split('\n'))
+        return SimpleNamespace(text=translated_text, src=src, dest=dest, origin=text,
+                               pronunciation=None, extra_data=extra_data)
+
+    def detect(self, text):
+        self.detect_calls += 1
+        time.sleep(self.call_latency(text))
+        return SimpleNamespace(lang=self.detected_language, confidence=self.detection_confidence)
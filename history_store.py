@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import threading
+
+HISTORY_COLUMNS = ('source', 'translation', 'src_lang', 'dest_lang', 'confidence', 'timestamp')
+SCHEMA_VERSION = 2
+INSERT_HISTORY_SQL = f"INSERT INTO history ({', '.join(HISTORY_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+class TranslationHistoryStore:
+    """Append-only translation history backed by SQLite in WAL mode
+
+    Each save is a single-row INSERT inside its own transaction, so the cost
+    no longer grows with the history size and a crash mid-write leaves the
+    previous entries intact. The legacy translation_history.json is imported
+    once, the first time the database is created.
+
+    Entries are indexed by language pair and timestamp, and source and
+    translation text by an FTS5 trigram index (when SQLite supports it), so
+    the history window can page through filtered results without a scan.
+    """
+
+    def __init__(self, database_path='translation_history.db', legacy_json_path='translation_history.json'):
+        self.database_path = database_path
+        self.database_lock = threading.Lock()
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.database_lock, self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    src_lang TEXT NOT NULL,
+                    dest_lang TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    timestamp TEXT NOT NULL
+                )""")
+            schema_version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+            if schema_version < 1:
+                self.import_legacy_json(legacy_json_path)
+            if schema_version < 2:
+                self.create_search_indexes()
+            self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            self.full_text_search = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'history_search'").fetchone() is not None
+
+    def import_legacy_json(self, legacy_json_path):
+        """Copy entries from the old whole-file JSON history, if present"""
+        if not legacy_json_path or not os.path.exists(legacy_json_path):
+            return
+        try:
+            with open(legacy_json_path, 'r') as file:
+                legacy_entries = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.connection.executemany(INSERT_HISTORY_SQL, (tuple(entry[column] for column in HISTORY_COLUMNS)
+                                                         for entry in legacy_entries))
+
+    def create_search_indexes(self):
+        """Add the indexes behind query_entries, backfilling existing rows"""
+        self.connection.execute('CREATE INDEX IF NOT EXISTS history_language_pair ON history (src_lang, dest_lang)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp)')
+        try:
+            self.connection.execute("""
+                CREATE VIRTUAL TABLE history_search USING fts5(
+                    source, translation, content='history', content_rowid='id', tokenize='trigram')""")
+        except sqlite3.OperationalError:
+            return  # No FTS5 trigram tokenizer; text filters fall back to LIKE
+        self.connection.execute("""
+            CREATE TRIGGER history_search_insert AFTER INSERT ON history BEGIN
+                INSERT INTO history_search (rowid, source, translation)
+                VALUES (new.id, new.source, new.translation);
+            END""")
+        self.connection.execute("INSERT INTO history_search (history_search) VALUES ('rebuild')")
+
+    def append(self, history_entry):
+        """Persist one history entry"""
+        with self.database_lock, self.connection:
+            self.connection.execute(INSERT_HISTORY_SQL, tuple(history_entry[column] for column in HISTORY_COLUMNS))
+
+    def iter_entries(self, batch_size=1000):
+        """Yield history entries oldest first without loading them all at once"""
+        last_id = 0
+        while True:
+            with self.database_lock:
+                rows = self.connection.execute(
+                    f"SELECT id, {', '.join(HISTORY_COLUMNS)} FROM history WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(HISTORY_COLUMNS, row[1:]))
+            last_id = rows[-1][0]
+
+    def query_entries(self, src_lang=None, dest_lang=None, date_from=None, date_to=None, text_filter=None,
+                      before_id=None, limit=200):
+        """Return up to limit (id, entry) pairs matching every given filter, newest first
+
+        Dates are ISO prefixes such as '2024-05-01'; date_to is inclusive.
+        Pass the smallest id of the previous page as before_id to get the
+        next one.
+        """
+        conditions, parameters = [], []
+        if src_lang:
+            conditions.append('src_lang = ?')
+            parameters.append(src_lang)
+        if dest_lang:
+            conditions.append('dest_lang = ?')
+            parameters.append(dest_lang)
+        if date_from:
+            conditions.append('timestamp >= ?')
+            parameters.append(date_from)
+        if date_to:
+            # Anything that starts with date_to sorts below this bound
+            conditions.append('timestamp < ?')
+            parameters.append(date_to + '\U0010ffff')
+        if text_filter and self.full_text_search and len(text_filter) >= 3:
+            conditions.append('id IN (SELECT rowid FROM history_search WHERE history_search MATCH ?)')
+            parameters.append('"' + text_filter.replace('"', '""') + '"')
+        elif text_filter:
+            escaped_filter = '%' + text_filter.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            conditions.append("(source LIKE ? ESCAPE '\\' OR translation LIKE ? ESCAPE '\\')")
+            parameters.extend([escaped_filter, escaped_filter])
+        if before_id is not None:
+            conditions.append('id < ?')
+            parameters.append(before_id)
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        with self.database_lock:
+            rows = self.connection.execute(
+                f"SELECT id, {', '.join(HISTORY_COLUMNS)} FROM history {where_clause} ORDER BY id DESC LIMIT ?",
+                parameters + [limit]).fetchall()
+        return [(row[0], dict(zip(HISTORY_COLUMNS, row[1:]))) for row in rows]
+
+    def __len__(self):
+        with self.database_lock:
+            return self.connection.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+
+    def close(self):
+        with self.database_lock:
+            self.connection.close()
@@ -0,0 +1,115 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+HISTORY_PAGE_SIZE = 200
+
+
+def format_history_row(entry):
+    """Treeview values for one history entry"""
+    language_pair = f"{entry['src_lang']}→{entry['dest_lang']}"
+    formatted_date = datetime.fromisoformat(entry['timestamp']).strftime('%Y-%m-%d %H:%M')
+    return (
+        entry['source'][:50] + '...' if len(entry['source']) > 50 else entry['source'],
+        entry['translation'][:50] + '...' if len(entry['translation']) > 50 else entry['translation'],
+        language_pair,
+        f"{entry['confidence']:.0f}%",
+        formatted_date
+    )
+
+
+class HistoryWindow:
+    """Translation history viewer that loads rows a page at a time
+
+    Only the newest page is queried when the window opens; further pages
+    are fetched from the history store as the list is scrolled near its end.
+    Filters are applied by the store's indexes, never by scanning rows here.
+    """
+
+    def __init__(self, root_window, history_store, page_size=HISTORY_PAGE_SIZE):
+        self.history_store = history_store
+        self.page_size = page_size
+        self.active_filters = {}
+        self.oldest_loaded_id = None
+        self.history_exhausted = False
+
+        self.history_window = tk.Toplevel(root_window)
+        self.history_window.title("Translation History")
+        self.history_window.geometry("800x600")
+
+        self.create_filter_panel()
+        self.create_history_tree()
+        self.load_next_page()
+
+    def create_filter_panel(self):
+        """Language pair, date range and text filters"""
+        filter_panel = ttk.Frame(self.history_window)
+        filter_panel.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        self.filter_variables = {}
+        filter_fields = [('src_lang', "From:", 6), ('dest_lang', "To:", 6), ('date_from', "Since:", 11),
+                         ('date_to', "Until:", 11), ('text_filter', "Search:", 20)]
+        for column, (filter_name, label_text, entry_width) in enumerate(filter_fields):
+            ttk.Label(filter_panel, text=label_text).grid(row=0, column=column * 2, padx=(5, 2), pady=5, sticky=tk.W)
+            filter_variable = tk.StringVar()
+            filter_entry = ttk.Entry(filter_panel, textvariable=filter_variable, width=entry_width)
+            filter_entry.grid(row=0, column=column * 2 + 1, pady=5, sticky=tk.W)
+            filter_entry.bind('<Return>', lambda event: self.apply_filters())
+            self.filter_variables[filter_name] = filter_variable
+
+        ttk.Button(filter_panel, text="Filter", command=self.apply_filters).grid(
+            row=0, column=len(filter_fields) * 2, padx=5, pady=5)
+
+    def create_history_tree(self):
+        history_scrollbar = ttk.Scrollbar(self.history_window, orient=tk.VERTICAL)
+        history_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
+
+        self.history_tree = ttk.Treeview(self.history_window,
+                                         columns=('source', 'translation', 'languages', 'confidence', 'date'),
+                                         show='headings')
+
+        # Configure treeview columns
+        self.history_tree.heading('source', text='Original Text')
+        self.history_tree.heading('translation', text='Translation')
+        self.history_tree.heading('languages', text='Language Pair')
+        self.history_tree.heading('confidence', text='Confidence')
+        self.history_tree.heading('date', text='Date/Time')
+
+        self.history_tree.column('source', width=200)
+        self.history_tree.column('translation', width=200)
+        self.history_tree.column('languages', width=100)
+        self.history_tree.column('confidence', width=80)
+        self.history_tree.column('date', width=120)
+
+        self.history_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        # Fetch more rows whenever the view nears the end of what is loaded
+        def on_tree_scrolled(first_visible, last_visible):
+            history_scrollbar.set(first_visible, last_visible)
+            if float(last_visible) > 0.9:
+                self.load_next_page()
+
+        history_scrollbar.configure(command=self.history_tree.yview)
+        self.history_tree.configure(yscrollcommand=on_tree_scrolled)
+
+    def load_next_page(self):
+        """Append the next page of matching entries (newest first)"""
+        if self.history_exhausted:
+            return
+        page_entries = self.history_store.query_entries(before_id=self.oldest_loaded_id, limit=self.page_size,
+                                                        **self.active_filters)
+        for entry_id, entry in page_entries:
+            self.history_tree.insert('', tk.END, values=format_history_row(entry))
+        if page_entries:
+            self.oldest_loaded_id = page_entries[-1][0]
+        self.history_exhausted = len(page_entries) < self.page_size
+
+    def apply_filters(self):
+        """Restart paging with the filters currently entered"""
+        self.active_filters = {filter_name: filter_variable.get().strip()
+                               for filter_name, filter_variable in self.filter_variables.items()
+                               if filter_variable.get().strip()}
+        self.history_tree.delete(*self.history_tree.get_children())
+        self.oldest_loaded_id = None
+        self.history_exhausted = False
+        self.load_next_page()
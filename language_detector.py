@@ -0,0 +1,260 @@
+import hashlib
+import math
+import threading
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+
+from language_names import LANGUAGES
+from language_samples import SAMPLE_TEXTS
+
+NGRAM_ORDERS = (1, 2, 3)
+SMOOTHING = 0.1
+MAX_PROFILE_CHARACTERS = 100_000  # Learning stops once a profile has seen this much text
+MAX_DETECTION_CHARACTERS = 1000  # Longer inputs are judged on their opening; accuracy has long saturated
+SCORE_SHARPNESS = 2.0  # Scales length-normalized log-likelihoods before the softmax
+SINGLE_LANGUAGE_SCRIPT_CONFIDENCE = 0.99
+# Platt scaling of the softmax posterior: confidence = sigmoid(posterior
+# logit weight * logit(posterior) + length weight * log(characters) + bias).
+# Fitted on word prefixes of the held-out sentences by
+# `python benchmarks/bench_language_detection.py --fit`; refit after
+# changing the scoring or the seed samples.
+CALIBRATION_WEIGHTS = (0.5928, 0.4279, -1.8906)
+POSTERIOR_CLIP = 1e-6  # Keeps the logit finite for posteriors of exactly 0 or 1
+HYBRID_CONFIDENCE_THRESHOLD = 0.95  # Picked with the same benchmark; see HybridLanguageDetector
+
+# Unicode script name prefixes (from unicodedata.name) and the languages
+# written in them. Scripts with a single language decide detection alone.
+SCRIPT_LANGUAGES = {
+    'CYRILLIC': ('ru', 'uk', 'bg', 'be', 'mk', 'sr', 'kk', 'ky', 'mn', 'tg'),
+    'ARABIC': ('ar', 'fa', 'ur', 'ps', 'sd', 'ug', 'ku'),
+    'DEVANAGARI': ('hi', 'mr', 'ne'),
+    'HEBREW': ('iw', 'yi'),
+    'CJK': ('zh-cn', 'zh-tw'),
+    'HIRAGANA': ('ja',),
+    'KATAKANA': ('ja',),
+    'HANGUL': ('ko',),
+    'THAI': ('th',),
+    'GREEK': ('el',),
+    'GEORGIAN': ('ka',),
+    'ARMENIAN': ('hy',),
+    'BENGALI': ('bn',),
+    'GUJARATI': ('gu',),
+    'GURMUKHI': ('pa',),
+    'ORIYA': ('or',),
+    'TAMIL': ('ta',),
+    'TELUGU': ('te',),
+    'KANNADA': ('kn',),
+    'MALAYALAM': ('ml',),
+    'SINHALA': ('si',),
+    'KHMER': ('km',),
+    'LAO': ('lo',),
+    'MYANMAR': ('my',),
+    'ETHIOPIC': ('am',),
+}
+
+
+def extract_ngrams(text_content):
+    """Count lowercased character 1-3 grams, padding words with spaces"""
+    words = text_content.lower().split()
+    if not words:
+        return Counter()
+    # Words are joined by single spaces, so the lone space is the only all-space gram
+    padded_text = f" {' '.join(words)} "
+    text_ngrams = Counter()
+    for order in NGRAM_ORDERS:
+        text_ngrams.update(map(''.join, zip(*(padded_text[offset:] for offset in range(order)))))
+    del text_ngrams[' ']
+    return text_ngrams
+
+
+def calibrated_confidence(posterior, character_count):
+    """Probability that the best-scoring language is right, from the fitted calibration"""
+    posterior = min(max(posterior, POSTERIOR_CLIP), 1 - POSTERIOR_CLIP)
+    posterior_weight, length_weight, bias = CALIBRATION_WEIGHTS
+    calibrated_logit = (posterior_weight * math.log(posterior / (1 - posterior))
+                        + length_weight * math.log(max(character_count, 1)) + bias)
+    return 1 / (1 + math.exp(-calibrated_logit))
+
+
+def character_script(character):
+    """Script name prefix of a letter, e.g. 'LATIN' or 'CYRILLIC'"""
+    try:
+        return unicodedata.name(character).split(' ', 1)[0]
+    except ValueError:
+        return None
+
+
+class LocalLanguageDetector:
+    """Offline language detector built on character n-gram profiles
+
+    The dominant Unicode script narrows the candidates; scripts used by a
+    single language answer immediately. Otherwise every candidate with a
+    profile is scored by smoothed log-likelihood. Most n-grams occur in only
+    a few profiles, so each candidate starts from the score of an unseen
+    n-gram and only the languages that know an input n-gram are updated
+    for it. The softmax
+    of the length-normalized scores is calibrated, together with the input
+    length, into the probability that the answer is right. Languages
+    without a profile cannot be told apart this way; the hybrid detector
+    asks the backend when unsure, and once such a language appears in the
+    translation history it gets a profile. Profiles start from
+    language_samples and keep learning from translation history.
+    """
+
+    def __init__(self, cache_size=4096, seed_texts=SAMPLE_TEXTS):
+        self.cache_size = cache_size
+        self.detector_lock = threading.Lock()
+        self.detection_cache = OrderedDict()
+        self.gram_counts = defaultdict(dict)
+        self.profile_totals = {}
+        self.profile_characters = Counter()
+        self.language_order = []
+        self.language_index = {}
+        self.gram_gains = {}
+        self.latin_languages = None
+        for language_code, sample_text in seed_texts.items():
+            self.learn(sample_text, language_code)
+
+    def learn(self, text_content, language_code):
+        """Add labelled text to a language profile"""
+        if self.profile_characters[language_code] >= MAX_PROFILE_CHARACTERS or not text_content.strip():
+            return
+        text_ngrams = extract_ngrams(text_content)
+        with self.detector_lock:
+            if language_code not in self.language_index:
+                self.language_index[language_code] = len(self.language_order)
+                self.language_order.append(language_code)
+                self.profile_totals[language_code] = 0
+            for gram, occurrences in text_ngrams.items():
+                language_counts = self.gram_counts[gram]
+                language_counts[language_code] = language_counts.get(language_code, 0) + occurrences
+                self.gram_gains.pop(gram, None)
+            self.profile_totals[language_code] += sum(text_ngrams.values())
+            self.profile_characters[language_code] += len(text_content)
+
+    def detect(self, text_content):
+        """Return (language code, confidence between 0 and 1)"""
+        cache_key = hashlib.blake2b(text_content.encode('utf-8'), digest_size=16).digest()
+        with self.detector_lock:
+            cached_detection = self.detection_cache.get(cache_key)
+            if cached_detection is not None:
+                self.detection_cache.move_to_end(cache_key)
+                return cached_detection
+
+        detection = self.detect_uncached(text_content)
+        with self.detector_lock:
+            self.detection_cache[cache_key] = detection
+            if len(self.detection_cache) > self.cache_size:
+                self.detection_cache.popitem(last=False)
+        return detection
+
+    def detect_uncached(self, text_content):
+        text_content = text_content[:MAX_DETECTION_CHARACTERS]
+        candidate_languages = self.candidate_languages(text_content)
+        if not candidate_languages:
+            return 'en', 0.0
+        if len(candidate_languages) == 1:
+            return candidate_languages[0], SINGLE_LANGUAGE_SCRIPT_CONFIDENCE
+        with self.detector_lock:
+            profiled_languages = [code for code in candidate_languages if code in self.language_index]
+            if not profiled_languages:
+                return candidate_languages[0], 0.0
+            best_language, posterior = self.score_languages(extract_ngrams(text_content), profiled_languages)
+        return best_language, calibrated_confidence(posterior, len(text_content))
+
+    def candidate_languages(self, text_content):
+        """Languages written in the dominant script of the text"""
+        script_counts = Counter(character_script(character) for character in text_content if character.isalpha())
+        if not script_counts:
+            return ()
+        if script_counts['HIRAGANA'] or script_counts['KATAKANA']:
+            return ('ja',)  # Kana only appears in Japanese, even among kanji
+        dominant_script = script_counts.most_common(1)[0][0]
+        if dominant_script == 'LATIN':
+            return self.latin_script_languages()
+        return SCRIPT_LANGUAGES.get(dominant_script, ())
+
+    def latin_script_languages(self):
+        if self.latin_languages is None:
+            other_scripts = {code for codes in SCRIPT_LANGUAGES.values() for code in codes} | {'he'}
+            self.latin_languages = tuple(code for code in LANGUAGES if code not in other_scripts)
+        return self.latin_languages
+
+    def score_languages(self, text_ngrams, profiled_languages):
+        """Return (best language, softmax posterior) over the profiled candidates (caller holds detector_lock)"""
+        vocabulary_size = len(self.gram_counts)
+        total_grams = sum(text_ngrams.values())
+        # Gains over an unseen n-gram's log(SMOOTHING), only where a profile has the n-gram
+        gains = dict.fromkeys(profiled_languages, 0.0)
+        for gram, occurrences in text_ngrams.items():
+            for language_code, log_gain in self.gram_gain(gram):
+                if language_code in gains:
+                    gains[language_code] += occurrences * log_gain
+
+        # Subtract each profile's smoothed denominator and normalize by length
+        unseen_log_count = math.log(SMOOTHING)
+        normalized_scores = {}
+        for language_code, gain in gains.items():
+            denominator = math.log(self.profile_totals[language_code] + SMOOTHING * vocabulary_size)
+            normalized_scores[language_code] = unseen_log_count + gain / total_grams - denominator
+
+        evidence_weight = SCORE_SHARPNESS * math.sqrt(min(total_grams, 400))
+        best_score = max(normalized_scores.values())
+        weights = {code: math.exp((score - best_score) * evidence_weight) for code, score in normalized_scores.items()}
+        best_language = max(weights, key=weights.get)
+        return best_language, weights[best_language] / sum(weights.values())
+
+    def gram_gain(self, gram):
+        """(language, log count gain over unseen) for the profiles that know an n-gram, cached until relearned"""
+        gram_gain = self.gram_gains.get(gram)
+        if gram_gain is None:
+            language_counts = self.gram_counts.get(gram)
+            if not language_counts:
+                return ()  # Not cached, so arbitrary input cannot grow the cache
+            gram_gain = self.gram_gains[gram] = tuple(
+                (language_code, math.log((gram_count + SMOOTHING) / SMOOTHING))
+                for language_code, gram_count in language_counts.items())
+        return gram_gain
+
+
+class HybridLanguageDetector:
+    """Local detection first, a remote detector only when it is unsure
+
+    The default threshold keeps hybrid accuracy on the held-out benchmark
+    at the remote detector's while answering most inputs locally.
+    """
+
+    def __init__(self, local_detector, remote_detect, confidence_threshold=HYBRID_CONFIDENCE_THRESHOLD):
+        self.local_detector = local_detector
+        self.remote_detect = remote_detect
+        self.confidence_threshold = confidence_threshold
+        self.counter_lock = threading.Lock()
+        self.local_answers = 0
+        self.remote_answers = 0
+
+    def detect(self, text_content):
+        """Return (language code, confidence between 0 and 1)"""
+        local_detection = self.detect_locally_or_none(text_content)
+        if local_detection is not None:
+            return local_detection
+        return self.remote_detect(text_content)
+
+    def detect_locally_or_none(self, text_content):
+        """The local detection if it clears the threshold, else None for a remote answer
+
+        For callers whose backend request detects the language anyway, so
+        None means leaving detection to that request. Either way the answer
+        is counted.
+        """
+        language_code, confidence = self.local_detector.detect(text_content)
+        local_answer = confidence >= self.confidence_threshold
+        with self.counter_lock:
+            if local_answer:
+                self.local_answers += 1
+            else:
+                self.remote_answers += 1
+        return (language_code, confidence) if local_answer else None
+
+    def statistics(self):
+        with self.counter_lock:
+            return {'local_answers': self.local_answers, 'remote_answers': self.remote_answers}
@@ -0,0 +1,53 @@
+# Same table as googletrans.constants.LANGUAGES, kept here so building the
+# language pickers does not import the googletrans client (and httpx)
+LANGUAGES = {
+    'af': 'afrikaans', 'sq': 'albanian', 'am': 'amharic', 'ar': 'arabic', 'hy': 'armenian', 'az': 'azerbaijani',
+    'eu': 'basque', 'be': 'belarusian', 'bn': 'bengali', 'bs': 'bosnian', 'bg': 'bulgarian', 'ca': 'catalan',
+    'ceb': 'cebuano', 'ny': 'chichewa', 'zh-cn': 'chinese (simplified)', 'zh-tw': 'chinese (traditional)',
+    'co': 'corsican', 'hr': 'croatian', 'cs': 'czech', 'da': 'danish', 'nl': 'dutch', 'en': 'english',
+    'eo': 'esperanto', 'et': 'estonian', 'tl': 'filipino', 'fi': 'finnish', 'fr': 'french', 'fy': 'frisian',
+    'gl': 'galician', 'ka': 'georgian', 'de': 'german', 'el': 'greek', 'gu': 'gujarati', 'ht': 'haitian creole',
+    'ha': 'hausa', 'haw': 'hawaiian', 'iw': 'hebrew', 'he': 'hebrew', 'hi': 'hindi', 'hmn': 'hmong',
+    'hu': 'hungarian', 'is': 'icelandic', 'ig': 'igbo', 'id': 'indonesian', 'ga': 'irish', 'it': 'italian',
+    'ja': 'japanese', 'jw': 'javanese', 'kn': 'kannada', 'kk': 'kazakh', 'km': 'khmer', 'ko': 'korean',
+    'ku': 'kurdish (kurmanji)', 'ky': 'kyrgyz', 'lo': 'lao', 'la': 'latin', 'lv': 'latvian', 'lt': 'lithuanian',
+    'lb': 'luxembourgish', 'mk': 'macedonian', 'mg': 'malagasy', 'ms': 'malay', 'ml': 'malayalam', 'mt': 'maltese',
+    'mi': 'maori', 'mr': 'marathi', 'mn': 'mongolian', 'my': 'myanmar (burmese)', 'ne': 'nepali', 'no': 'norwegian',
+    'or': 'odia', 'ps': 'pashto', 'fa': 'persian', 'pl': 'polish', 'pt': 'portuguese', 'pa': 'punjabi',
+    'ro': 'romanian', 'ru': 'russian', 'sm': 'samoan', 'gd': 'scots gaelic', 'sr': 'serbian', 'st': 'sesotho',
+    'sn': 'shona', 'sd': 'sindhi', 'si': 'sinhala', 'sk': 'slovak', 'sl': 'slovenian', 'so': 'somali',
+    'es': 'spanish', 'su': 'sundanese', 'sw': 'swahili', 'sv': 'swedish', 'tg': 'tajik', 'ta': 'tamil',
+    'te': 'telugu', 'th': 'thai', 'tr': 'turkish', 'uk': 'ukrainian', 'ur': 'urdu', 'ug': 'uyghur', 'uz': 'uzbek',
+    'vi': 'vietnamese', 'cy': 'welsh', 'xh': 'xhosa', 'yi': 'yiddish', 'yo': 'yoruba', 'zu': 'zulu'
+}
+
+# Other names people type for a language, mapped to its code
+LANGUAGE_ALIASES = {
+    'chinese': 'zh-cn', 'simplified chinese': 'zh-cn', 'mandarin': 'zh-cn', 'zh': 'zh-cn', 'zh-hans': 'zh-cn',
+    'traditional chinese': 'zh-tw', 'zh-hant': 'zh-tw', 'farsi': 'fa', 'tagalog': 'tl', 'burmese': 'my',
+    'myanmar': 'my', 'kurdish': 'ku', 'kurmanji': 'ku', 'haitian': 'ht', 'scottish gaelic': 'gd', 'gaelic': 'gd',
+    'oriya': 'or', 'nyanja': 'ny', 'chewa': 'ny', 'southern sotho': 'st', 'norwegian bokmal': 'no',
+    'slovene': 'sl', 'kirghiz': 'ky', 'uighur': 'ug', 'flemish': 'nl', 'castilian': 'es',
+}
+
+
+def build_name_lookup():
+    """Lowercased names, aliases and codes -> code; the first code wins a shared name"""
+    name_lookup = {}
+    for code, name in LANGUAGES.items():
+        name_lookup.setdefault(name, code)  # 'hebrew' stays 'iw', as the old linear scan returned
+        name_lookup.setdefault(code, code)
+    for alias, code in LANGUAGE_ALIASES.items():
+        name_lookup.setdefault(alias, code)
+    return name_lookup
+
+
+NAME_TO_CODE = build_name_lookup()
+
+
+def language_code(language_name, default='en'):
+    """Convert a language name, alias or code to its code in constant time"""
+    if language_name in ('Auto Detect', 'auto'):
+        return 'auto'
+    return NAME_TO_CODE.get(language_name.strip().lower(), default)
+
@@ -0,0 +1,76 @@
+# Short seed texts for the local language detector. Profiles keep learning
+# from the translation history, so these only need to get detection started.
+SAMPLE_TEXTS = {
+    'en': "The weather was warm and the children were playing in the park near the river. "
+          "We have been waiting for the train since this morning, but nobody knows when it will arrive. "
+          "Could you please tell me where the nearest station is? I would like to buy a ticket to the city. "
+          "Thank you very much for your help, it was really kind of you to show me the way.",
+    'fr': "Le temps était doux et les enfants jouaient dans le parc près de la rivière. "
+          "Nous attendons le train depuis ce matin, mais personne ne sait quand il arrivera. "
+          "Pourriez-vous me dire où se trouve la gare la plus proche ? Je voudrais acheter un billet pour la ville. "
+          "Merci beaucoup pour votre aide, c'était vraiment gentil de me montrer le chemin.",
+    'de': "Das Wetter war warm und die Kinder spielten im Park in der Nähe des Flusses. "
+          "Wir warten seit heute Morgen auf den Zug, aber niemand weiß, wann er ankommen wird. "
+          "Könnten Sie mir bitte sagen, wo der nächste Bahnhof ist? Ich möchte eine Fahrkarte in die Stadt kaufen. "
+          "Vielen Dank für Ihre Hilfe, es war wirklich nett von Ihnen, mir den Weg zu zeigen.",
+    'es': "El tiempo era cálido y los niños jugaban en el parque cerca del río. "
+          "Estamos esperando el tren desde esta mañana, pero nadie sabe cuándo llegará. "
+          "¿Podría decirme dónde está la estación más cercana? Me gustaría comprar un billete para la ciudad. "
+          "Muchas gracias por su ayuda, fue muy amable de su parte mostrarme el camino.",
+    'it': "Il tempo era caldo e i bambini giocavano nel parco vicino al fiume. "
+          "Aspettiamo il treno da questa mattina, ma nessuno sa quando arriverà. "
+          "Potrebbe dirmi dove si trova la stazione più vicina? Vorrei comprare un biglietto per la città. "
+          "Grazie mille per il suo aiuto, è stato davvero gentile a mostrarmi la strada.",
+    'pt': "O tempo estava quente e as crianças brincavam no parque perto do rio. "
+          "Estamos esperando o trem desde esta manhã, mas ninguém sabe quando ele vai chegar. "
+          "Você poderia me dizer onde fica a estação mais próxima? Eu gostaria de comprar uma passagem para a cidade. "
+          "Muito obrigado pela sua ajuda, foi muito gentil da sua parte me mostrar o caminho.",
+    'nl': "Het weer was warm en de kinderen speelden in het park bij de rivier. "
+          "We wachten sinds vanochtend op de trein, maar niemand weet wanneer hij zal aankomen. "
+          "Kunt u mij vertellen waar het dichtstbijzijnde station is? Ik wil graag een kaartje naar de stad kopen. "
+          "Hartelijk dank voor uw hulp, het was erg aardig van u om mij de weg te wijzen.",
+    'sv': "Vädret var varmt och barnen lekte i parken nära floden. "
+          "Vi har väntat på tåget sedan i morse, men ingen vet när det kommer fram. "
+          "Kan du säga mig var den närmaste stationen ligger? Jag skulle vilja köpa en biljett till staden. "
+          "Tack så mycket för din hjälp, det var verkligen snällt av dig att visa mig vägen.",
+    'pl': "Pogoda była ciepła, a dzieci bawiły się w parku nad rzeką. "
+          "Czekamy na pociąg od rana, ale nikt nie wie, kiedy przyjedzie. "
+          "Czy mógłby pan mi powiedzieć, gdzie jest najbliższa stacja? Chciałbym kupić bilet do miasta. "
+          "Bardzo dziękuję za pomoc, to było naprawdę miłe, że pokazał mi pan drogę.",
+    'tr': "Hava sıcaktı ve çocuklar nehrin yanındaki parkta oynuyordu. "
+          "Bu sabahtan beri treni bekliyoruz ama kimse ne zaman geleceğini bilmiyor. "
+          "En yakın istasyonun nerede olduğunu söyleyebilir misiniz? Şehre bir bilet almak istiyorum. "
+          "Yardımınız için çok teşekkür ederim, bana yolu göstermeniz gerçekten çok naziksiniz.",
+    'id': "Cuacanya hangat dan anak-anak sedang bermain di taman dekat sungai. "
+          "Kami sudah menunggu kereta sejak pagi ini, tetapi tidak ada yang tahu kapan kereta itu akan tiba. "
+          "Bisakah Anda memberi tahu saya di mana stasiun terdekat? Saya ingin membeli tiket ke kota. "
+          "Terima kasih banyak atas bantuan Anda, Anda sungguh baik telah menunjukkan jalannya kepada saya.",
+    'ru': "Погода была тёплой, и дети играли в парке у реки. "
+          "Мы ждём поезд с самого утра, но никто не знает, когда он придёт. "
+          "Не могли бы вы сказать мне, где находится ближайшая станция? Я хотел бы купить билет в город. "
+          "Большое спасибо за вашу помощь, было очень любезно с вашей стороны показать мне дорогу.",
+    'uk': "Погода була теплою, і діти гралися в парку біля річки. "
+          "Ми чекаємо на потяг із самого ранку, але ніхто не знає, коли він прибуде. "
+          "Чи не могли б ви сказати мені, де знаходиться найближча станція? Я хотів би купити квиток до міста. "
+          "Щиро дякую за вашу допомогу, було дуже люб'язно з вашого боку показати мені дорогу.",
+    'ar': "كان الطقس دافئا وكان الأطفال يلعبون في الحديقة بالقرب من النهر. "
+          "نحن ننتظر القطار منذ هذا الصباح، لكن لا أحد يعرف متى سيصل. "
+          "هل يمكنك أن تخبرني أين توجد أقرب محطة؟ أود أن أشتري تذكرة إلى المدينة. "
+          "شكرا جزيلا على مساعدتك، لقد كان لطفا كبيرا منك أن تدلني على الطريق.",
+    'fa': "هوا گرم بود و بچه‌ها در پارک نزدیک رودخانه بازی می‌کردند. "
+          "ما از امروز صبح منتظر قطار هستیم، اما هیچ‌کس نمی‌داند کی می‌رسد. "
+          "می‌توانید به من بگویید نزدیک‌ترین ایستگاه کجاست؟ می‌خواهم یک بلیت به شهر بخرم. "
+          "از کمک شما خیلی ممنونم، واقعا لطف کردید که راه را به من نشان دادید.",
+    'ur': "موسم گرم تھا اور بچے دریا کے قریب پارک میں کھیل رہے تھے۔ "
+          "ہم صبح سے ٹرین کا انتظار کر رہے ہیں، لیکن کوئی نہیں جانتا کہ وہ کب پہنچے گی۔ "
+          "کیا آپ مجھے بتا سکتے ہیں کہ قریب ترین اسٹیشن کہاں ہے؟ میں شہر کے لیے ایک ٹکٹ خریدنا چاہتا ہوں۔ "
+          "آپ کی مدد کا بہت شکریہ، آپ نے مجھے راستہ دکھا کر واقعی مہربانی کی۔",
+    'hi': "मौसम गर्म था और बच्चे नदी के पास पार्क में खेल रहे थे। "
+          "हम आज सुबह से ट्रेन का इंतज़ार कर रहे हैं, लेकिन कोई नहीं जानता कि वह कब आएगी। "
+          "क्या आप मुझे बता सकते हैं कि सबसे नज़दीकी स्टेशन कहाँ है? मैं शहर के लिए एक टिकट खरीदना चाहता हूँ। "
+          "आपकी मदद के लिए बहुत धन्यवाद, मुझे रास्ता दिखाना आपकी सचमुच बड़ी मेहरबानी थी।",
+    'zh-cn': "天气很暖和，孩子们在河边的公园里玩耍。我们从今天早上就开始等火车，但是没有人知道它什么时候到。"
+             "您能告诉我最近的车站在哪里吗？我想买一张去城里的票。非常感谢您的帮助，您给我指路真是太好了。",
+    'zh-tw': "天氣很暖和，孩子們在河邊的公園裡玩耍。我們從今天早上就開始等火車，但是沒有人知道它什麼時候到。"
+             "您能告訴我最近的車站在哪裡嗎？我想買一張去城裡的票。非常感謝您的幫助，您給我指路真是太好了。",
+}
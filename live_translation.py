@@ -0,0 +1,134 @@
+import re
+import time
+import tkinter as tk
+from collections import OrderedDict, deque
+
+PARAGRAPH_BREAK = re.compile(r'(\n\s*)')
+MAIN_THREAD_BUDGET_SECONDS = 0.016  # One frame at 60 Hz
+
+
+class LiveTranslationController:
+    """Debounced translate-as-you-type for SmartTranslatorApp
+
+    Every <<Modified>> event only restarts a debounce timer. When typing
+    pauses, the input is split into paragraphs and only paragraphs missing
+    from the paragraph cache are sent to the background worker as one job,
+    which translates all of their sentences in parallel; the rest are
+    reused as-is. Live results are not written to history, and a result is
+    dropped if a newer edit was submitted after it.
+
+    Main-thread work per event is timed and passed to timing_hook(stage,
+    seconds). By default timings are kept in main_thread_timings and
+    observed as live_<stage> in the app's metrics, and events over
+    MAIN_THREAD_BUDGET_SECONDS are counted in budget_overruns and as the
+    live_budget_overruns metrics event.
+    """
+
+    def __init__(self, app, debounce_ms=400, cache_size=512, timing_hook=None):
+        self.app = app
+        self.debounce_ms = debounce_ms
+        self.cache_size = cache_size
+        self.timing_hook = timing_hook or self.record_timing
+        self.paragraph_translations = OrderedDict()
+        self.main_thread_timings = deque(maxlen=1000)
+        self.budget_overruns = 0
+        self.pending_timer = None
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+        self.app.input_text_area.edit_modified(False)
+        self.schedule_translation()
+
+    def disable(self):
+        self.enabled = False
+        if self.pending_timer is not None:
+            self.app.root_window.after_cancel(self.pending_timer)
+            self.pending_timer = None
+        self.app.translation_worker.cancel('live')
+
+    def on_text_modified(self, event=None):
+        """<<Modified>> handler: restart the debounce timer and nothing else"""
+        start_time = time.perf_counter()
+        input_text_area = self.app.input_text_area
+        if not input_text_area.edit_modified():
+            return  # Fired by our own reset of the modified flag
+        input_text_area.edit_modified(False)
+        if self.enabled:
+            self.schedule_translation()
+        self.timing_hook('keystroke', time.perf_counter() - start_time)
+
+    def schedule_translation(self):
+        if self.pending_timer is not None:
+            self.app.root_window.after_cancel(self.pending_timer)
+        self.pending_timer = self.app.root_window.after(self.debounce_ms, self.translate_changes)
+
+    def translate_changes(self):
+        """Translate paragraphs that changed since they were last seen"""
+        start_time = time.perf_counter()
+        self.pending_timer = None
+        input_text = self.app.input_text_area.get("1.0", "end-1c")
+        source_language_code = self.app.translation_core.get_language_code(self.app.source_language_combobox.get())
+        target_language_code = self.app.translation_core.get_language_code(self.app.target_language_combobox.get())
+
+        # Odd positions hold the paragraph breaks themselves
+        paragraph_parts = PARAGRAPH_BREAK.split(input_text)
+        missing_paragraphs = list(dict.fromkeys(
+            paragraph for paragraph in paragraph_parts[::2]
+            if paragraph.strip() and (paragraph, source_language_code, target_language_code)
+            not in self.paragraph_translations))
+
+        if missing_paragraphs:
+            translation_core = self.app.translation_core
+            self.app.translation_worker.submit(
+                'live',
+                lambda: translation_core.translate_documents(missing_paragraphs, source_language_code,
+                                                             target_language_code, remember=False),
+                lambda paragraph_outcomes: self.complete_translation(
+                    paragraph_parts, source_language_code, target_language_code,
+                    zip(missing_paragraphs, paragraph_outcomes)))
+        else:
+            # Everything is cached; supersede any older request still running
+            self.app.translation_worker.cancel('live')
+            self.render(paragraph_parts, source_language_code, target_language_code)
+        self.timing_hook('debounced_update', time.perf_counter() - start_time)
+
+    def complete_translation(self, paragraph_parts, source_language_code, target_language_code, paragraph_outcomes):
+        start_time = time.perf_counter()
+        for paragraph, translation_outcome in paragraph_outcomes:
+            self.paragraph_translations[(paragraph, source_language_code, target_language_code)] = translation_outcome
+        while len(self.paragraph_translations) > self.cache_size:
+            self.paragraph_translations.popitem(last=False)
+        if self.enabled:
+            self.render(paragraph_parts, source_language_code, target_language_code)
+        self.timing_hook('result', time.perf_counter() - start_time)
+
+    def render(self, paragraph_parts, source_language_code, target_language_code):
+        """Show the assembled translation with a length-weighted confidence"""
+        translated_parts = []
+        weighted_confidence = total_weight = 0
+        for index, part in enumerate(paragraph_parts):
+            cache_key = (part, source_language_code, target_language_code)
+            if index % 2 or cache_key not in self.paragraph_translations:
+                translated_parts.append(part)
+                continue
+            translation_outcome = self.paragraph_translations[cache_key]
+            self.paragraph_translations.move_to_end(cache_key)
+            translated_parts.append(translation_outcome['translation'])
+            weighted_confidence += len(part) * translation_outcome['confidence']
+            total_weight += len(part)
+
+        if total_weight:
+            self.app.display_translation_result(''.join(translated_parts), weighted_confidence / total_weight)
+        else:
+            self.app.translated_text_display.config(state=tk.NORMAL)
+            self.app.translated_text_display.delete("1.0", tk.END)
+            self.app.translated_text_display.config(state=tk.DISABLED)
+
+    def record_timing(self, stage, elapsed_seconds):
+        """Default timing hook: keep recent timings, report them and count budget overruns"""
+        self.main_thread_timings.append((stage, elapsed_seconds))
+        self.app.metrics.observe(f"live_{stage}", elapsed_seconds)
+        if elapsed_seconds > MAIN_THREAD_BUDGET_SECONDS:
+            self.budget_overruns += 1
+            self.app.metrics.increment('live_budget_overruns')
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from text_segmenter import split_segments
+
+
+class GTTSSpeechBackend:
+    """Synthesize MP3 audio with gTTS, imported on first use"""
+
+    def synthesize(self, text_content, language_code, output_path):
+        from gtts import gTTS
+        gTTS(text=text_content, lang=language_code).save(output_path)
+
+
+class FakeSpeechBackend:
+    """Offline speech backend that writes placeholder audio after a delay"""
+
+    def __init__(self, latency_seconds=0.0):
+        self.latency_seconds = latency_seconds
+        self.synthesize_calls = 0
+
+    def synthesize(self, text_content, language_code, output_path):
+        self.synthesize_calls += 1
+        time.sleep(self.latency_seconds)
+        with open(output_path, 'wb') as file:
+            file.write(f"{language_code}:{text_content}".encode('utf-8'))
+
+
+def play_audio_file(audio_path):
+    """Play an audio file with playsound, imported on first use"""
+    from playsound import playsound
+    playsound(audio_path)
+
+
+def split_speech_chunks(text_content, max_chunk_characters=200):
+    """Group sentences into chunks short enough to synthesize quickly"""
+    speech_chunks = []
+    current_chunk = ''
+    for segment, separator in split_segments(text_content):
+        if current_chunk and len(current_chunk) + len(segment) > max_chunk_characters:
+            speech_chunks.append(current_chunk.strip())
+            current_chunk = ''
+        current_chunk += segment + separator
+    if current_chunk.strip():
+        speech_chunks.append(current_chunk.strip())
+    return speech_chunks
+
+
+class SpeechAudioCache:
+    """Content-addressed, size-bounded LRU cache of synthesized speech
+
+    Audio is stored under the SHA-256 of (language, text). A file's
+    modification time doubles as its last-use time, and the least recently
+    used files are deleted once the directory exceeds max_cache_bytes. New
+    audio is written to a unique temporary file and renamed into place, so
+    concurrent requests never clobber each other.
+    """
+
+    def __init__(self, cache_directory='speech_cache', max_cache_bytes=50 * 1024 * 1024, speech_backend=None):
+        self.cache_directory = cache_directory
+        self.max_cache_bytes = max_cache_bytes
+        self.speech_backend = speech_backend if speech_backend is not None else GTTSSpeechBackend()
+        self.eviction_lock = threading.Lock()
+        os.makedirs(cache_directory, exist_ok=True)
+
+    def cache_path(self, text_content, language_code):
+        content_hash = hashlib.sha256(f"{language_code}\0{text_content}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_directory, f"{content_hash}.mp3")
+
+    def get_audio(self, text_content, language_code):
+        """Return the path of cached audio for the text, synthesizing it on a miss"""
+        audio_path = self.cache_path(text_content, language_code)
+        try:
+            os.utime(audio_path)  # Mark as recently used
+            return audio_path
+        except FileNotFoundError:
+            pass
+
+        file_descriptor, temporary_path = tempfile.mkstemp(suffix='.part', dir=self.cache_directory)
+        os.close(file_descriptor)
+        try:
+            self.speech_backend.synthesize(text_content, language_code, temporary_path)
+            os.replace(temporary_path, audio_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        self.evict_least_recently_used(keep_path=audio_path)
+        return audio_path
+
+    def evict_least_recently_used(self, keep_path=None):
+        """Delete the oldest audio files until the cache fits its byte budget"""
+        with self.eviction_lock:
+            cached_files = []
+            for directory_entry in os.scandir(self.cache_directory):
+                if directory_entry.name.endswith('.mp3'):
+                    try:
+                        file_status = directory_entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    cached_files.append((file_status.st_mtime, file_status.st_size, directory_entry.path))
+            total_bytes = sum(file_size for _, file_size, _ in cached_files)
+            for _, file_size, file_path in sorted(cached_files):
+                if total_bytes <= self.max_cache_bytes:
+                    break
+                if file_path == keep_path:
+                    continue
+                try:
+                    os.remove(file_path)
+                except FileNotFoundError:
+                    pass
+                total_bytes -= file_size
+
+    def speak(self, text_content, language_code, audio_player=play_audio_file):
+        """Play text sentence chunk by sentence chunk while later chunks synthesize"""
+        synthesized_chunks = queue.Queue()
+
+        def synthesize_chunks():
+            try:
+                for speech_chunk in split_speech_chunks(text_content):
+                    synthesized_chunks.put(self.get_audio(speech_chunk, language_code))
+            except Exception as error:
+                synthesized_chunks.put(error)
+            synthesized_chunks.put(None)
+
+        threading.Thread(target=synthesize_chunks, daemon=True).start()
+        while True:
+            audio_chunk = synthesized_chunks.get()
+            if audio_chunk is None:
+                return
+            if isinstance(audio_chunk, Exception):
+                raise audio_chunk
+            audio_player(audio_chunk)
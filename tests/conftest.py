@@ -0,0 +1,62 @@
+import itertools
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_translator import FakeTranslator
+
+
+class FailingTranslator(FakeTranslator):
+    """A backend that is down: every translate() raises"""
+
+    def translate(self, text, dest='en', src='auto'):
+        self.translate_calls += 1
+        raise ConnectionError("backend down")
+
+
+class FakeRootWindow:
+    """Stands in for a Tk root's after() scheduling, on a virtual clock"""
+
+    def __init__(self):
+        self.now_ms = 0
+        self.timers = {}
+        self.timer_ids = itertools.count(1)
+
+    def after(self, delay_ms, callback):
+        timer_number = next(self.timer_ids)
+        timer_id = f"after#{timer_number}"
+        self.timers[timer_id] = (self.now_ms + delay_ms, timer_number, timer_id, callback)
+        return timer_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def advance(self, elapsed_ms):
+        """Move the clock forward, running timers as they fall due"""
+        target_ms = self.now_ms + elapsed_ms
+        while True:
+            due_timers = [timer for timer in self.timers.values() if timer[0] <= target_ms]
+            if not due_timers:
+                break
+            due_ms, _, timer_id, callback = min(due_timers, key=lambda timer: timer[:2])
+            del self.timers[timer_id]
+            self.now_ms = due_ms
+            callback()
+        self.now_ms = target_ms
+
+    def run_until(self, condition, timeout_seconds=5.0):
+        """Keep the event loop turning until condition() holds, for results from worker threads"""
+        deadline = time.monotonic() + timeout_seconds
+        while not condition():
+            assert time.monotonic() < deadline, "timed out waiting on the fake event loop"
+            time.sleep(0.001)
+            self.advance(20)
+
+
+@pytest.fixture
+def fake_root():
+    return FakeRootWindow()
@@ -0,0 +1,144 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from batching_translator import BatchingTranslator
+from conftest import FailingTranslator
+from fake_translator import FakeTranslator
+
+
+class LineMergingTranslator(FakeTranslator):
+    """Joins the lines of its input, as real backends sometimes do"""
+
+    def translate(self, text, dest='en', src='auto'):
+        translation_result = super().translate(text.replace('\n', ' '), dest=dest, src=src)
+        translation_result.origin = text
+        return translation_result
+
+
+class RecordingTranslator(FakeTranslator):
+    """Records each request's length and the most requests it served at once"""
+
+    def __init__(self, latency_seconds=0.0, merge_lines=False, fail_joined=False):
+        super().__init__(latency_seconds)
+        self.merge_lines = merge_lines
+        self.fail_joined = fail_joined
+        self.recording_lock = threading.Lock()
+        self.request_lengths = []
+        self.calls_in_flight = self.most_calls_in_flight = 0
+
+    def translate(self, text, dest='en', src='auto'):
+        with self.recording_lock:
+            self.request_lengths.append(len(text))
+            self.calls_in_flight += 1
+            self.most_calls_in_flight = max(self.most_calls_in_flight, self.calls_in_flight)
+        try:
+            if self.fail_joined and '\n' in text:
+                raise ValueError("request rejected")
+            translation_result = super().translate(text.replace('\n', ' ') if self.merge_lines else text,
+                                                   dest=dest, src=src)
+        finally:
+            with self.recording_lock:
+                self.calls_in_flight -= 1
+        return translation_result
+
+
+def translate_concurrently(batching_translator, texts, src='en', dest='fr'):
+    """Call translate() for every text at once, from as many threads"""
+    start_barrier = threading.Barrier(len(texts))
+
+    def translate(text_content):
+        start_barrier.wait()
+        return batching_translator.translate(text_content, dest=dest, src=src)
+
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        return list(executor.map(translate, texts))
+
+
+def test_identical_requests_share_one_backend_call():
+    fake_translator = FakeTranslator(latency_seconds=0.05)
+    batching_translator = BatchingTranslator(fake_translator)
+
+    translation_results = translate_concurrently(batching_translator, ['Good morning'] * 8, src='auto')
+
+    assert fake_translator.translate_calls == 1
+    assert {translation_result.text for translation_result in translation_results} == {'[fr] Good morning'}
+    assert batching_translator.statistics()['deduplicated'] == 7
+
+
+def test_concurrent_requests_are_sent_as_one_joined_call():
+    fake_translator = FakeTranslator()
+    batching_translator = BatchingTranslator(fake_translator, batch_window_seconds=0.05)
+    texts = [f"sentence {number}" for number in range(6)]
+
+    translation_results = translate_concurrently(batching_translator, texts)
+
+    assert fake_translator.translate_calls == 1
+    assert [translation_result.text for translation_result in translation_results] == [f"[fr] {text}" for text in texts]
+    # Alternatives of the joined text say nothing about any one line
+    assert all('alternatives' not in translation_result.extra_data for translation_result in translation_results)
+
+
+def test_line_count_mismatch_falls_back_to_one_call_per_text():
+    line_merging_translator = LineMergingTranslator()
+    batching_translator = BatchingTranslator(line_merging_translator, batch_window_seconds=0.05)
+    texts = [f"sentence {number}" for number in range(4)]
+
+    translation_results = translate_concurrently(batching_translator, texts)
+
+    assert [translation_result.text for translation_result in translation_results] == [f"[fr] {text}" for text in texts]
+    assert line_merging_translator.translate_calls == 1 + len(texts)
+
+
+def test_texts_that_cannot_be_joined_are_sent_alone():
+    fake_translator = FakeTranslator()
+    batching_translator = BatchingTranslator(fake_translator, batch_window_seconds=0.05)
+    texts = ['two\nlines', 'plain']
+
+    translation_results = translate_concurrently(batching_translator, texts)
+
+    assert [translation_result.text for translation_result in translation_results] == ['[fr] two\n[fr] lines',
+                                                                                       '[fr] plain']
+    assert fake_translator.translate_calls == 2
+
+
+def test_backend_errors_reach_every_caller():
+    failing_translator = FailingTranslator()
+    batching_translator = BatchingTranslator(failing_translator, batch_window_seconds=0.05)
+
+    with pytest.raises(ConnectionError):
+        translate_concurrently(batching_translator, ['one', 'two', 'two'])
+    assert not batching_translator.in_flight_requests
+
+
+def test_batches_never_exceed_the_character_cap():
+    recording_translator = RecordingTranslator()
+    batching_translator = BatchingTranslator(recording_translator, batch_window_seconds=0.05)
+    texts = ['a' * 4000, 'b' * 4000] + [f"{number}" * 1000 for number in range(1, 8)]
+
+    translation_results = translate_concurrently(batching_translator, texts)
+
+    assert [translation_result.text for translation_result in translation_results] == [f"[fr] {text}" for text in texts]
+    assert max(recording_translator.request_lengths) <= batching_translator.max_batch_characters
+    assert sum(recording_translator.request_lengths) >= sum(map(len, texts))
+
+
+def test_failed_joined_call_falls_back_to_each_text():
+    recording_translator = RecordingTranslator(fail_joined=True)
+    batching_translator = BatchingTranslator(recording_translator, batch_window_seconds=0.05)
+    texts = [f"sentence {number}" for number in range(4)]
+
+    translation_results = translate_concurrently(batching_translator, texts)
+
+    assert [translation_result.text for translation_result in translation_results] == [f"[fr] {text}" for text in texts]
+    assert len(recording_translator.request_lengths) == 1 + len(texts)
+
+
+def test_fallback_calls_run_in_parallel():
+    recording_translator = RecordingTranslator(latency_seconds=0.05, merge_lines=True)
+    batching_translator = BatchingTranslator(recording_translator, batch_window_seconds=0.05)
+
+    translate_concurrently(batching_translator, [f"sentence {number}" for number in range(6)])
+
+    assert recording_translator.most_calls_in_flight > 1
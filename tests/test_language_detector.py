@@ -0,0 +1,30 @@
+from language_detector import HybridLanguageDetector
+
+
+class FixedLocalDetector:
+    def __init__(self, detection):
+        self.detection = detection
+
+    def detect(self, text_content):
+        return self.detection
+
+
+def test_confident_local_detection_answers_without_the_remote():
+    remote_calls = []
+    hybrid_detector = HybridLanguageDetector(FixedLocalDetector(('fr', 0.97)),
+                                             lambda text_content: remote_calls.append(text_content) or ('de', 1.0),
+                                             confidence_threshold=0.95)
+
+    assert hybrid_detector.detect('Bonjour') == ('fr', 0.97)
+    assert hybrid_detector.detect_locally_or_none('Bonjour') == ('fr', 0.97)
+    assert remote_calls == []
+    assert hybrid_detector.statistics() == {'local_answers': 2, 'remote_answers': 0}
+
+
+def test_unsure_local_detection_is_left_to_the_remote():
+    hybrid_detector = HybridLanguageDetector(FixedLocalDetector(('fr', 0.6)), lambda text_content: ('de', 1.0),
+                                             confidence_threshold=0.95)
+
+    assert hybrid_detector.detect_locally_or_none('Hallo') is None
+    assert hybrid_detector.detect('Hallo') == ('de', 1.0)
+    assert hybrid_detector.statistics() == {'local_answers': 0, 'remote_answers': 2}
@@ -0,0 +1,163 @@
+import threading
+from types import SimpleNamespace
+
+from fake_translator import FakeTranslator
+from history_store import TranslationHistoryStore
+from live_translation import MAIN_THREAD_BUDGET_SECONDS, LiveTranslationController
+from translation_cache import TranslationCache
+from translation_core import TranslationCore
+from translation_metrics import TranslationMetrics
+from translation_worker import TranslationWorker
+
+TYPED_DOCUMENT = ("The weather was cold this morning, so we stayed inside and read.\n\n"
+                  "After lunch the rain stopped and the children went out to play.\n\n"
+                  "By evening everyone was tired, and dinner was quiet.")
+# Deliberately loose: only catches a keystroke that blocks on real work. Measured
+# main-thread timings are reported by benchmarks/bench_live_typing.py instead.
+BLOCKING_KEYSTROKE_SECONDS = 0.25
+
+
+class ThreadRecordingTranslator(FakeTranslator):
+    """Remembers which thread made each backend call"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calling_threads = []
+
+    def translate(self, text, dest='en', src='auto'):
+        self.calling_threads.append(threading.current_thread())
+        return super().translate(text, dest, src)
+
+    def detect(self, text):
+        self.calling_threads.append(threading.current_thread())
+        return super().detect(text)
+
+
+class FakeTextArea:
+    """The parts of a Tk Text widget the controller uses; edits set the modified flag as Tk does"""
+
+    def __init__(self):
+        self.text_content = ''
+        self.modified = False
+
+    def insert_text(self, typed_text):
+        self.text_content += typed_text
+        self.modified = True
+
+    def edit_modified(self, modified=None):
+        if modified is None:
+            return self.modified
+        self.modified = modified
+
+    def get(self, start_index, end_index):
+        return self.text_content
+
+
+def build_live_app(fake_root, translation_engine=None):
+    translation_core = TranslationCore(translation_engine or FakeTranslator(),
+                                       TranslationHistoryStore(':memory:', legacy_json_path=None),
+                                       translation_cache=TranslationCache(disk_path=None))
+    live_app = SimpleNamespace(
+        root_window=fake_root, input_text_area=FakeTextArea(), translation_core=translation_core,
+        source_language_combobox=SimpleNamespace(get=lambda: 'English'),
+        target_language_combobox=SimpleNamespace(get=lambda: 'French'),
+        translation_worker=TranslationWorker(fake_root), metrics=TranslationMetrics(enabled=True),
+        displayed_results=[])
+    live_app.display_translation_result = lambda translated_text, confidence: live_app.displayed_results.append(
+        translated_text)
+    return live_app
+
+
+def type_document(live_app, live_translation, typed_document, keystroke_ms=60):
+    """Type one character per keystroke, pausing at each paragraph end until its translation shows"""
+    for position, character in enumerate(typed_document, 1):
+        live_app.input_text_area.insert_text(character)
+        live_translation.on_text_modified()
+        live_app.root_window.advance(keystroke_ms)
+        if character == '\n' or position == len(typed_document):
+            live_app.root_window.advance(live_translation.debounce_ms)
+            live_app.root_window.run_until(lambda: not live_app.translation_worker.latest_requests)
+
+
+def test_simulated_typing_keeps_backend_calls_off_the_main_thread(fake_root):
+    translation_engine = ThreadRecordingTranslator()
+    live_app = build_live_app(fake_root, translation_engine)
+    reported_timings = []
+    live_translation = LiveTranslationController(
+        live_app, timing_hook=lambda stage, elapsed_seconds: reported_timings.append((stage, elapsed_seconds)))
+    live_translation.enable()
+
+    timers_per_keystroke = []
+    schedule_timer, handle_keystroke = fake_root.after, live_translation.on_text_modified
+
+    def count_keystroke_timers(event=None):
+        scheduled_timers = []
+        fake_root.after = lambda delay_ms, callback: scheduled_timers.append(delay_ms) or schedule_timer(
+            delay_ms, callback)
+        try:
+            handle_keystroke(event)
+        finally:
+            fake_root.after = schedule_timer
+        timers_per_keystroke.append(len(scheduled_timers))
+
+    live_translation.on_text_modified = count_keystroke_timers
+    type_document(live_app, live_translation, TYPED_DOCUMENT)
+    live_app.translation_worker.shutdown()
+
+    assert translation_engine.calling_threads
+    assert threading.main_thread() not in translation_engine.calling_threads
+    assert timers_per_keystroke == [1] * len(TYPED_DOCUMENT)
+    keystroke_timings = [elapsed_seconds for stage, elapsed_seconds in reported_timings if stage == 'keystroke']
+    assert len(keystroke_timings) == len(TYPED_DOCUMENT)
+    assert max(keystroke_timings) < BLOCKING_KEYSTROKE_SECONDS
+    assert {stage for stage, _ in reported_timings} == {'keystroke', 'debounced_update', 'result'}
+    assert live_app.displayed_results[-1] == '\n\n'.join(
+        f"[fr] {paragraph}" for paragraph in TYPED_DOCUMENT.split('\n\n'))
+
+
+def test_changed_paragraphs_are_translated_in_parallel(fake_root):
+    live_app = build_live_app(fake_root)
+    live_translation = LiveTranslationController(live_app)
+    live_translation.enable()
+    # Each paragraph is one sentence, so both must be in flight at once to pass the barrier
+    both_paragraphs_in_flight = threading.Barrier(2, timeout=5)
+    translate_text = live_app.translation_core.translate_text
+
+    def translate_text_together(*args, **kwargs):
+        both_paragraphs_in_flight.wait()
+        return translate_text(*args, **kwargs)
+
+    live_app.translation_core.translate_text = translate_text_together
+
+    live_app.input_text_area.insert_text("The first pasted paragraph.\n\nThe second pasted paragraph.")
+    live_translation.on_text_modified()
+    fake_root.advance(live_translation.debounce_ms)
+    fake_root.run_until(lambda: not live_app.translation_worker.latest_requests)
+    live_app.translation_worker.shutdown()
+
+    assert not both_paragraphs_in_flight.broken
+    assert live_app.displayed_results[-1] == "[fr] The first pasted paragraph.\n\n[fr] The second pasted paragraph."
+
+
+def test_timings_reach_the_app_metrics(fake_root):
+    live_app = build_live_app(fake_root)
+    live_translation = LiveTranslationController(live_app)
+    live_translation.enable()
+
+    type_document(live_app, live_translation, "Short note.")
+    live_app.translation_worker.shutdown()
+
+    metrics_snapshot = live_app.metrics.snapshot()
+    assert metrics_snapshot['stages']['live_keystroke']['count'] == len("Short note.")
+    assert metrics_snapshot['stages']['live_debounced_update']['count'] >= 1
+    assert metrics_snapshot['stages']['live_result']['count'] == 1
+
+
+def test_overruns_are_counted_in_metrics(fake_root):
+    live_app = build_live_app(fake_root)
+    live_translation = LiveTranslationController(live_app)
+
+    live_translation.record_timing('keystroke', MAIN_THREAD_BUDGET_SECONDS * 2)
+
+    assert live_translation.budget_overruns == 1
+    assert live_app.metrics.snapshot()['events']['live_budget_overruns'] == 1
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from text_segmenter import join_segments, split_segments
+
+ROUND_TRIP_TEXTS = (
+    '',
+    'Hello',
+    'Hello world. How are you? Fine!',
+    'First paragraph.\n\nSecond paragraph,\nwith a line break.',
+    'Windows lines.\r\nMore text.\r\n\r\n',
+    '  Leading and trailing spaces.   ',
+    '"Quoted sentence." Next one.',
+    'Ellipsis… then more (in brackets.) End',
+    '今日は晴れです。明日は雨です！本当？',
+    '他说：「你好。」然后走了。',
+    '\n\n\n',
+    'No break.Here',
+)
+SEGMENT_ALPHABET = 'ab .!?…。！？"\')」\n\r\t'
+
+
+@pytest.mark.parametrize('text_content', ROUND_TRIP_TEXTS)
+def test_join_reproduces_the_input(text_content):
+    assert join_segments(split_segments(text_content)) == text_content
+
+
+def test_random_texts_round_trip():
+    random_generator = random.Random(7)
+    for _ in range(2000):
+        text_content = ''.join(random_generator.choice(SEGMENT_ALPHABET)
+                               for _ in range(random_generator.randint(0, 40)))
+        assert join_segments(split_segments(text_content)) == text_content, repr(text_content)
+
+
+def test_splits_at_sentence_and_paragraph_breaks():
+    assert split_segments('One. Two?\n\nThree') == [('One.', ' '), ('Two?', '\n\n'), ('Three', '')]
+    assert split_segments('今日は晴れです。明日は雨です。') == [('今日は晴れです。', ''), ('明日は雨です。', '')]
+
+
+def test_keeps_unbroken_text_whole():
+    assert split_segments('version 1.2 is out') == [('version 1.2 is out', '')]
+    assert split_segments('') == [('', '')]
+
+
+def test_translated_segments_keep_the_layout():
+    segments = split_segments('One.  Two.\n\nThree.')
+    translated = [(segment.upper(), separator) for segment, separator in segments]
+    assert join_segments(translated) == 'ONE.  TWO.\n\nTHREE.'
@@ -0,0 +1,66 @@
+from fake_translator import FakeTranslator
+from history_store import TranslationHistoryStore
+from translation_cache import TranslationCache
+from translation_core import TranslationCore
+
+DOCUMENT = "The cat sat on the mat today. The dog ran home quickly. Birds sang in the tall tree."
+
+
+def build_core(fake_translator):
+    return TranslationCore(fake_translator, TranslationHistoryStore(':memory:', legacy_json_path=None),
+                           translation_cache=TranslationCache(disk_path=None))
+
+
+def test_single_sentence_alternatives_come_from_its_own_result():
+    fake_translator = FakeTranslator()
+    translation_core = build_core(fake_translator)
+    translation_outcome = translation_core.translate_document("The cat sat on the mat.", 'en', 'fr')
+
+    found_alternatives = translation_core.find_alternative_translations(translation_outcome)
+
+    assert [alternative for alternative, _ in found_alternatives] == ["[fr:1] The cat sat on the mat.",
+                                                                      "[fr:2] The cat sat on the mat."]
+    assert translation_core.alternative_translator.statistics()['variant_fetches'] == 0
+
+
+def test_batched_document_segments_get_real_alternatives():
+    fake_translator = FakeTranslator()
+    translation_core = build_core(fake_translator)
+    translation_outcome = translation_core.translate_document(DOCUMENT, 'en', 'fr')
+    assert fake_translator.translate_calls == 1  # The segments went out as one batched request
+
+    found_alternatives = translation_core.find_alternative_translations(translation_outcome)
+
+    assert len(found_alternatives) == 3
+    for alternative, _ in found_alternatives:
+        assert alternative.count('[fr:') == 1 and alternative.count('[fr]') == 2  # One segment swapped
+    alternative_statistics = translation_core.alternative_translator.statistics()
+    assert alternative_statistics['variant_fetches'] == 3
+    assert alternative_statistics['back_translations'] == 6
+
+
+def test_fetched_variants_and_scores_are_reused():
+    fake_translator = FakeTranslator()
+    translation_core = build_core(fake_translator)
+    first_alternatives = translation_core.find_alternative_translations(
+        translation_core.translate_document(DOCUMENT, 'en', 'fr'))
+    calls_before = fake_translator.translate_calls
+
+    # From memory this time; variants and scores come from the cache
+    translation_outcome = translation_core.translate_document(DOCUMENT, 'en', 'fr')
+    assert translation_outcome['from_memory']
+    assert translation_core.find_alternative_translations(translation_outcome) == first_alternatives
+    assert fake_translator.translate_calls == calls_before
+
+
+def test_variant_fetches_count_against_the_call_budget():
+    fake_translator = FakeTranslator()
+    translation_core = build_core(fake_translator)
+    translation_core.alternative_translator.max_backend_calls = 2
+    translation_outcome = translation_core.translate_document(DOCUMENT, 'en', 'fr')
+
+    translation_core.find_alternative_translations(translation_outcome)
+
+    alternative_statistics = translation_core.alternative_translator.statistics()
+    assert alternative_statistics['variant_fetches'] + alternative_statistics['back_translations'] <= 2
+    assert alternative_statistics['over_budget'] >= 1
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+from conftest import FailingTranslator
+from fake_translator import FakeTranslator
+from translation_backends import BackendUnavailableError, CircuitBreaker, EngineRouter, GuardedEngine
+
+
+def build_router(primary_engine, secondary_engine, primary_options=None, **router_options):
+    return EngineRouter([GuardedEngine('primary', primary_engine, **(primary_options or {})),
+                         GuardedEngine('secondary', secondary_engine)], **router_options)
+
+
+def test_slow_primary_is_hedged_by_the_next_engine():
+    slow_translator = FakeTranslator(latency_seconds=0.5)
+    fast_translator = FakeTranslator(detected_language='fr')
+    engine_router = build_router(slow_translator, fast_translator, hedge_delay_seconds=0.05,
+                                 min_hedge_delay_seconds=0.01)
+
+    start_time = time.monotonic()
+    translation_result = engine_router.translate('Hello', dest='de')
+    elapsed_seconds = time.monotonic() - start_time
+
+    assert translation_result.src == 'fr'  # The secondary's answer
+    assert elapsed_seconds < 0.4
+    assert (engine_router.hedged_calls, engine_router.hedge_wins) == (1, 1)
+
+
+def test_fast_primary_is_not_hedged():
+    fast_translator = FakeTranslator()
+    spare_translator = FakeTranslator()
+    engine_router = build_router(fast_translator, spare_translator, hedge_delay_seconds=0.5)
+
+    assert engine_router.translate('Hello', dest='de').text == '[de] Hello'
+    assert spare_translator.translate_calls == 0
+    assert engine_router.hedged_calls == 0
+
+
+def test_failure_moves_to_the_next_engine_at_once():
+    failing_translator = FailingTranslator()
+    fallback_translator = FakeTranslator()
+    engine_router = build_router(failing_translator, fallback_translator, hedge_delay_seconds=5.0)
+
+    start_time = time.monotonic()
+    assert engine_router.translate('Hello', dest='de').text == '[de] Hello'
+    assert time.monotonic() - start_time < 1.0
+    assert engine_router.hedged_calls == 0
+
+
+def test_timeout_moves_to_the_next_engine():
+    stuck_translator = FakeTranslator(latency_seconds=1.0)
+    fallback_translator = FakeTranslator(detected_language='fr')
+    engine_router = build_router(stuck_translator, fallback_translator, primary_options={'timeout_seconds': 0.05},
+                                 hedge_delay_seconds=5.0)
+
+    assert engine_router.translate('Hello', dest='de').src == 'fr'
+
+
+def test_open_circuit_skips_the_engine():
+    failing_translator = FailingTranslator()
+    fallback_translator = FakeTranslator()
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_seconds=60)
+    engine_router = build_router(failing_translator, fallback_translator,
+                                 primary_options={'circuit_breaker': circuit_breaker})
+
+    for _ in range(5):
+        engine_router.translate('Hello', dest='de')
+
+    assert failing_translator.translate_calls == 2
+    assert fallback_translator.translate_calls == 5
+    assert engine_router.statistics()['engines']['primary']['circuit'] == 'open'
+
+
+def test_all_engines_failing_raises_backend_unavailable():
+    engine_router = build_router(FailingTranslator(), FailingTranslator())
+    with pytest.raises(BackendUnavailableError) as raised:
+        engine_router.translate('Hello', dest='de')
+    assert isinstance(raised.value.__cause__, ConnectionError)
+
+
+def test_circuit_half_opens_for_a_single_probe():
+    circuit_breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == 'open'
+    assert not circuit_breaker.allow_call()
+
+    time.sleep(0.06)
+    assert circuit_breaker.state == 'half-open'
+    assert circuit_breaker.allow_call()
+    assert not circuit_breaker.allow_call()  # Only one probe at a time
+
+    circuit_breaker.record_failure()
+    assert circuit_breaker.state == 'open'
+    time.sleep(0.06)
+    assert circuit_breaker.allow_call()
+    circuit_breaker.record_success()
+    assert circuit_breaker.state == 'closed'
+    assert circuit_breaker.allow_call()
@@ -0,0 +1,135 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from fake_translator import FakeTranslator
+from translation_cache import CachedTranslator, TranslationCache, cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(time, 'time', fake_clock)
+    return fake_clock
+
+
+def translation_result(translated_text, extra_data=None):
+    return SimpleNamespace(text=translated_text, src='en', dest='fr', origin='', pronunciation=None,
+                           extra_data=extra_data or {})
+
+
+def test_round_trip_through_both_tiers(tmp_path):
+    disk_path = str(tmp_path / 'cache.db')
+    first_cache = TranslationCache(disk_path)
+    first_cache.put('Hello', 'en', 'fr', translation_result('Bonjour', {'confidence': 0.9}))
+    assert first_cache.get('Hello', 'en', 'fr').text == 'Bonjour'
+    first_cache.close()
+
+    second_cache = TranslationCache(disk_path)
+    cached_result = second_cache.get('Hello', 'en', 'fr')
+    assert (cached_result.text, cached_result.extra_data) == ('Bonjour', {'confidence': 0.9})
+    assert second_cache.statistics()['disk_hits'] == 1
+    second_cache.close()
+
+
+def test_normalized_whitespace_shares_an_entry():
+    translation_cache = TranslationCache(disk_path=None)
+    translation_cache.put('Hello   world ', 'en', 'fr', translation_result('Bonjour le monde'))
+    assert translation_cache.get(' Hello world', 'en', 'fr').text == 'Bonjour le monde'
+    assert cache_key('a\nb', 'en', 'fr') != cache_key('a b', 'en', 'fr')
+
+
+def test_expired_entries_are_not_returned(tmp_path, fake_clock):
+    disk_path = str(tmp_path / 'cache.db')
+    translation_cache = TranslationCache(disk_path, ttl_seconds=60)
+    translation_cache.put('Hello', 'en', 'fr', translation_result('Bonjour'))
+
+    fake_clock.now += 59
+    assert translation_cache.get('Hello', 'en', 'fr') is not None
+    fake_clock.now += 2
+    assert translation_cache.get('Hello', 'en', 'fr') is None
+
+    # A fresh process sees the same expiry on disk, and eviction purges the row
+    reopened_cache = TranslationCache(disk_path, ttl_seconds=60)
+    assert reopened_cache.get('Hello', 'en', 'fr') is None
+    with reopened_cache.cache_lock:
+        reopened_cache.evict_from_disk()
+    assert reopened_cache.statistics()['expired'] == 1
+    translation_cache.close()
+    reopened_cache.close()
+
+
+def test_memory_tier_evicts_least_recently_used():
+    translation_cache = TranslationCache(disk_path=None, memory_budget_bytes=3 * 210)
+    for source_text in ('a', 'b', 'c'):
+        translation_cache.put(source_text, 'en', 'fr', translation_result(source_text.upper()))
+    translation_cache.get('a', 'en', 'fr')  # Now more recent than 'b'
+    translation_cache.put('d', 'en', 'fr', translation_result('D'))
+
+    assert translation_cache.get('b', 'en', 'fr') is None
+    assert [translation_cache.get(source_text, 'en', 'fr').text for source_text in 'acd'] == ['A', 'C', 'D']
+    assert translation_cache.statistics()['memory_evictions'] == 1
+
+
+def test_disk_tier_evicts_least_recently_used_rows(tmp_path, fake_clock):
+    translation_cache = TranslationCache(str(tmp_path / 'cache.db'), disk_budget_bytes=3 * 210)
+    for source_text in ('a', 'b', 'c', 'd', 'e'):
+        fake_clock.now += 1
+        translation_cache.put(source_text, 'en', 'fr', translation_result(source_text.upper()))
+    with translation_cache.cache_lock:
+        translation_cache.evict_from_disk()
+
+    remaining_rows = translation_cache.connection.execute('SELECT translation FROM translations').fetchall()
+    assert sorted(row[0] for row in remaining_rows) == ['C', 'D', 'E']
+    assert translation_cache.statistics()['disk_evictions'] == 2
+    translation_cache.close()
+
+
+def test_update_extra_data_keeps_the_entry_age(tmp_path, fake_clock):
+    disk_path = str(tmp_path / 'cache.db')
+    translation_cache = TranslationCache(disk_path, ttl_seconds=60)
+    translation_cache.put('Hello', 'en', 'fr', translation_result('Bonjour', {'confidence': 0.9}))
+    fake_clock.now += 30
+    translation_cache.update_extra_data('Hello', 'en', 'fr', {'scored_alternatives': [['Salut', 80.0]]})
+
+    reopened_cache = TranslationCache(disk_path, ttl_seconds=60)
+    assert reopened_cache.get('Hello', 'en', 'fr').extra_data == {'confidence': 0.9,
+                                                                  'scored_alternatives': [['Salut', 80.0]]}
+    fake_clock.now += 31
+    assert reopened_cache.get('Hello', 'en', 'fr') is None
+    translation_cache.close()
+    reopened_cache.close()
+
+
+def test_only_known_extra_data_is_stored(tmp_path):
+    disk_path = str(tmp_path / 'cache.db')
+    translation_cache = TranslationCache(disk_path)
+    backend_extra_data = {'confidence': 0.9, 'alternatives': ['Salut'], 'parsed': [[['Bonjour'] * 40]],
+                          'parts': [{'text': 'Bonjour', 'candidates': ['Salut']}]}
+    translation_cache.put('Hello', 'en', 'fr', translation_result('Bonjour', backend_extra_data))
+    translation_cache.update_extra_data('Hello', 'en', 'fr', {'scored_alternatives': [['Salut', 80.0]],
+                                                             'translation_debug': 'x'})
+
+    expected_extra_data = {'confidence': 0.9, 'alternatives': ['Salut'], 'scored_alternatives': [['Salut', 80.0]]}
+    assert translation_cache.get('Hello', 'en', 'fr').extra_data == expected_extra_data
+    reopened_cache = TranslationCache(disk_path)
+    assert reopened_cache.get('Hello', 'en', 'fr').extra_data == expected_extra_data
+    translation_cache.close()
+    reopened_cache.close()
+
+
+def test_cached_translator_calls_the_engine_once():
+    fake_translator = FakeTranslator()
+    cached_translator = CachedTranslator(fake_translator, TranslationCache(disk_path=None))
+    assert cached_translator.translate('Hello', dest='fr', src='en').text == '[fr] Hello'
+    assert cached_translator.translate('Hello', dest='fr', src='en').text == '[fr] Hello'
+    assert fake_translator.translate_calls == 1
@@ -0,0 +1,140 @@
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+import translation_memory
+from translation_memory import TranslationMemory
+
+LANGUAGE_PAIRS = (('en', 'fr'), ('en', 'de'), ('fr', 'de'), ('de', 'fr'))
+WORDS = ('the', 'cat', 'sat', 'on', 'a', 'mat', 'hello', 'world', 'good', 'morning', 'see', 'you', 'soon', 'x')
+
+
+def linear_lookup(history_entries, source_text, source_lang, target_lang):
+    """The memory scan TranslationMemory replaced (language checks first, only for speed)"""
+    for memory_entry in history_entries:
+        if (memory_entry['src_lang'] == source_lang and
+                memory_entry['dest_lang'] == target_lang and
+                SequenceMatcher(None, source_text.lower(), memory_entry['source'].lower()).ratio() > 0.9):
+            return memory_entry
+    return None
+
+
+def linear_lookup_any_source(history_entries, source_text, target_lang):
+    for memory_entry in history_entries:
+        if (memory_entry['dest_lang'] == target_lang and
+                SequenceMatcher(None, source_text.lower(), memory_entry['source'].lower()).ratio() > 0.9):
+            return memory_entry
+    return None
+
+
+def mutate(random_generator, text_content, max_edits=4):
+    """Apply a few random character edits and case changes"""
+    characters = list(text_content)
+    for _ in range(random_generator.randint(0, max_edits)):
+        edit_position = random_generator.randint(0, len(characters))
+        edit_kind = random_generator.choice(('insert', 'delete', 'replace', 'case'))
+        if edit_kind == 'insert' or not characters:
+            characters.insert(edit_position, random_generator.choice('abcdefgh '))
+        elif edit_position < len(characters):
+            if edit_kind == 'delete':
+                del characters[edit_position]
+            elif edit_kind == 'replace':
+                characters[edit_position] = random_generator.choice('abcdefgh ')
+            else:
+                characters[edit_position] = characters[edit_position].swapcase()
+    return ''.join(characters)
+
+
+def random_history(random_generator, entry_count):
+    """History full of near-duplicates, so fuzzy matches and ties are common"""
+    history_entries = []
+    for entry_number in range(entry_count):
+        if history_entries and random_generator.random() < 0.5:
+            source_text = mutate(random_generator, random_generator.choice(history_entries)['source'])
+        else:
+            source_text = ' '.join(random_generator.choice(WORDS) for _ in range(random_generator.randint(1, 8)))
+        source_lang, dest_lang = random_generator.choice(LANGUAGE_PAIRS)
+        history_entries.append({'source': source_text or 'x', 'translation': f"t{entry_number}",
+                                'src_lang': source_lang, 'dest_lang': dest_lang, 'confidence': 90})
+    return history_entries
+
+
+def random_queries(random_generator, history_entries, query_count):
+    queries = []
+    for _ in range(query_count):
+        if random_generator.random() < 0.7:
+            query_text = mutate(random_generator, random_generator.choice(history_entries)['source'])
+        else:
+            query_text = ' '.join(random_generator.choice(WORDS) for _ in range(random_generator.randint(1, 8)))
+        queries.append((query_text, *random_generator.choice(LANGUAGE_PAIRS)))
+    return queries
+
+
+def assert_matches_linear_scan(translation_memory_index, history_entries, queries):
+    for query_text, source_lang, target_lang in queries:
+        assert (translation_memory_index.lookup(query_text, source_lang, target_lang)
+                is linear_lookup(history_entries, query_text, source_lang, target_lang)), query_text
+        assert (translation_memory_index.lookup_any_source(query_text, target_lang)
+                is linear_lookup_any_source(history_entries, query_text, target_lang)), query_text
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_lookup_matches_linear_scan(seed):
+    random_generator = random.Random(seed)
+    history_entries = random_history(random_generator, 200)
+    assert_matches_linear_scan(TranslationMemory(history_entries), history_entries,
+                               random_queries(random_generator, history_entries, 100))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_entries_added_later_match_linear_scan(seed):
+    random_generator = random.Random(seed)
+    history_entries = random_history(random_generator, 150)
+    translation_memory_index = TranslationMemory(history_entries[:50])
+    for history_entry in history_entries[50:]:
+        translation_memory_index.add(history_entry)
+    assert_matches_linear_scan(translation_memory_index, history_entries,
+                               random_queries(random_generator, history_entries, 80))
+
+
+@pytest.mark.parametrize('indexed_count', (0, 1, 80, 149))
+def test_partially_built_index_matches_linear_scan(indexed_count):
+    random_generator = random.Random(indexed_count)
+    history_entries = random_history(random_generator, 150)
+    queries = random_queries(random_generator, history_entries, 60)
+    # The state a background build is in after indexing its first entries
+    translation_memory_index = TranslationMemory(history_entries[:indexed_count])
+    translation_memory_index.index_ready.clear()
+    translation_memory_index.memory_entries.extend(history_entries[indexed_count:])
+    assert_matches_linear_scan(translation_memory_index, history_entries, queries)
+
+    # Entries added mid-build wait for the builder, then everything is indexed
+    late_entries = random_history(random_generator, 20)
+    for history_entry in late_entries:
+        translation_memory_index.add(history_entry)
+    assert_matches_linear_scan(translation_memory_index, history_entries + late_entries, queries)
+    translation_memory_index.index_pending_entries()
+    assert translation_memory_index.indexed_count == len(history_entries + late_entries)
+    assert_matches_linear_scan(translation_memory_index, history_entries + late_entries, queries)
+
+
+def test_lookups_during_background_build_match_linear_scan(monkeypatch):
+    monkeypatch.setattr(translation_memory, 'INDEX_CHUNK_SIZE', 10)
+    random_generator = random.Random(99)
+    history_entries = random_history(random_generator, 800)
+    queries = random_queries(random_generator, history_entries, 60)
+    expected_results = [(linear_lookup(history_entries, query_text, source_lang, target_lang),
+                         linear_lookup_any_source(history_entries, query_text, target_lang))
+                        for query_text, source_lang, target_lang in queries]
+
+    translation_memory_index = TranslationMemory(history_entries, build_in_background=True)
+    lookup_results = []
+    for query_text, source_lang, target_lang in queries:
+        lookup_results.append((translation_memory_index.lookup(query_text, source_lang, target_lang),
+                               translation_memory_index.lookup_any_source(query_text, target_lang)))
+    assert translation_memory_index.wait_until_indexed(timeout=30)
+
+    assert all(found is expected
+               for found_pair, expected_pair in zip(lookup_results, expected_results)
+               for found, expected in zip(found_pair, expected_pair))
@@ -0,0 +1,83 @@
+import threading
+
+from translation_worker import TranslationWorker
+
+
+def test_result_is_delivered_on_the_event_loop(fake_root):
+    translation_worker = TranslationWorker(fake_root)
+    delivered_results = []
+    translation_worker.submit('output', lambda: 'translated', delivered_results.append)
+
+    assert delivered_results == []  # Never called from the pool thread
+    fake_root.run_until(lambda: delivered_results)
+    assert delivered_results == ['translated']
+    translation_worker.shutdown()
+
+
+def test_newer_job_supersedes_a_running_one(fake_root):
+    translation_worker = TranslationWorker(fake_root)
+    release_first_job = threading.Event()
+    first_job_started = threading.Event()
+    delivered_results = []
+
+    def first_job():
+        first_job_started.set()
+        release_first_job.wait(5)
+        return 'stale'
+
+    translation_worker.submit('output', first_job, delivered_results.append)
+    assert first_job_started.wait(5)
+    translation_worker.submit('output', lambda: 'fresh', delivered_results.append)
+    release_first_job.set()
+    fake_root.run_until(lambda: not translation_worker.latest_requests)
+    fake_root.advance(100)
+
+    assert delivered_results == ['fresh']
+    translation_worker.shutdown()
+
+
+def test_newer_job_cancels_a_pending_one(fake_root):
+    translation_worker = TranslationWorker(fake_root, max_workers=1)
+    release_blocker = threading.Event()
+    superseded_job_ran = threading.Event()
+    delivered_results = []
+
+    translation_worker.submit('speech', lambda: release_blocker.wait(5), lambda _: None)
+    translation_worker.submit('output', lambda: superseded_job_ran.set(), delivered_results.append)
+    translation_worker.submit('output', lambda: 'fresh', delivered_results.append)
+    release_blocker.set()
+    fake_root.run_until(lambda: not translation_worker.latest_requests)
+
+    assert not superseded_job_ran.is_set()
+    assert delivered_results == ['fresh']
+    translation_worker.shutdown()
+
+
+def test_cancel_drops_the_result_and_channels_are_independent(fake_root):
+    translation_worker = TranslationWorker(fake_root)
+    release_jobs = threading.Event()
+    delivered_results = []
+
+    translation_worker.submit('output', lambda: release_jobs.wait(5) and 'output', delivered_results.append)
+    translation_worker.submit('speech', lambda: release_jobs.wait(5) and 'speech', delivered_results.append)
+    translation_worker.cancel('output')
+    release_jobs.set()
+    fake_root.run_until(lambda: not translation_worker.latest_requests)
+    fake_root.advance(100)
+
+    assert delivered_results == ['speech']
+    translation_worker.shutdown()
+
+
+def test_errors_go_to_on_error(fake_root):
+    translation_worker = TranslationWorker(fake_root)
+    delivered_errors = []
+
+    def failing_job():
+        raise ConnectionError("offline")
+
+    translation_worker.submit('output', failing_job, lambda _: None, delivered_errors.append)
+    fake_root.run_until(lambda: delivered_errors)
+
+    assert isinstance(delivered_errors[0], ConnectionError)
+    translation_worker.shutdown()
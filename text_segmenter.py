@@ -0,0 +1,36 @@
+import re
+
+# Whitespace after sentence-final punctuation (optionally followed by a
+# closing quote or bracket), any line break, or the unspaced full-width
+# punctuation used by CJK scripts ends a segment
+SEGMENT_BOUNDARY = re.compile(
+    r"(?:(?<=[.!?…。！？])|(?<=[.!?…。！？][\"'”’)\]]))[ \t]+"
+    r"|[ \t]*(?:\r?\n)\s*"
+    r"|(?<=[。！？])(?=[^\s」』）\"”’])")
+
+
+def split_segments(text_content):
+    """Split text into (segment, separator) pairs at sentence and paragraph breaks
+
+    Joining every segment and separator in order reproduces the input
+    exactly, so translated segments can be reassembled with the original
+    spacing and paragraph layout.
+    """
+    segments = []
+    position = 0
+    for boundary in SEGMENT_BOUNDARY.finditer(text_content):
+        if boundary.start() == position and segments:
+            # Consecutive breaks collapse into the previous separator
+            previous_segment, previous_separator = segments[-1]
+            segments[-1] = (previous_segment, previous_separator + boundary.group())
+        else:
+            segments.append((text_content[position:boundary.start()], boundary.group()))
+        position = boundary.end()
+    if position < len(text_content) or not segments:
+        segments.append((text_content[position:], ''))
+    return segments
+
+
+def join_segments(translated_segments):
+    """Reassemble (segment, separator) pairs into a single text"""
+    return ''.join(segment + separator for segment, separator in translated_segments)
@@ -0,0 +1,203 @@
+"""Headless batch translation
+
+Reads text line by line from files (or stdin), translates the lines
+concurrently and writes one JSON object per input line, in input order.
+
+    python translate_cli.py --dest hindi notes.txt > notes.hi.jsonl
+    cat corpus.txt | python translate_cli.py --src en --dest fr --concurrency 8
+
+Only the translation core is imported, never tkinter or the speech libraries.
+"""
+import argparse
+import fileinput
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from history_store import TranslationHistoryStore
+from language_names import language_code
+from translation_backends import TRANSLATION_ENGINES, build_engine_router
+from translation_cache import TranslationCache
+from translation_metrics import TranslationMetrics
+from translation_core import TranslationCore
+
+
+class RateLimiter:
+    """Token bucket shared by all worker threads"""
+
+    def __init__(self, requests_per_second, burst_size=1):
+        self.requests_per_second = requests_per_second
+        self.burst_size = burst_size
+        self.available_tokens = burst_size
+        self.last_refill = time.monotonic()
+        self.limiter_lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            with self.limiter_lock:
+                now = time.monotonic()
+                self.available_tokens = min(self.burst_size,
+                                            self.available_tokens + (now - self.last_refill) * self.requests_per_second)
+                self.last_refill = now
+                if self.available_tokens >= 1:
+                    self.available_tokens -= 1
+                    return
+                wait_seconds = (1 - self.available_tokens) / self.requests_per_second
+            time.sleep(wait_seconds)
+
+
+class BatchTranslator:
+    """Translate a stream of lines with bounded concurrency, preserving order"""
+
+    def __init__(self, translation_core, source_language, target_language, concurrency=4,
+                 rate_limiter=None, max_retries=3, backoff_seconds=0.5):
+        self.translation_core = translation_core
+        self.source_language = source_language
+        self.target_language = target_language
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+    def translate_line(self, line_text):
+        """Translate one line, retrying failures with exponential backoff"""
+        if not line_text.strip():
+            return {'translation': line_text, 'src_lang': self.source_language, 'confidence': 0}
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                translation_outcome = self.translation_core.translate_text(line_text, self.source_language,
+                                                                           self.target_language)
+                return {
+                    'translation': translation_outcome['translation'],
+                    'src_lang': translation_outcome['source_lang'],
+                    'confidence': translation_outcome['confidence'],
+                    'from_memory': translation_outcome['from_memory']
+                }
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.backoff_seconds * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    def translate_lines(self, lines):
+        """Yield one result record per input line, in input order"""
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            # Bound the read-ahead so huge inputs are never held in memory
+            in_flight = deque()
+            for line_number, line in enumerate(lines, 1):
+                line_text = line.rstrip('\r\n')
+                in_flight.append((line_number, line_text, executor.submit(self.translate_line, line_text)))
+                if len(in_flight) >= self.concurrency * 2:
+                    yield self.build_record(*in_flight.popleft())
+            while in_flight:
+                yield self.build_record(*in_flight.popleft())
+
+    def build_record(self, line_number, line_text, translation_future):
+        record = {'line': line_number, 'source': line_text, 'dest_lang': self.target_language}
+        try:
+            record.update(translation_future.result())
+        except Exception as error:
+            record['error'] = str(error)
+        return record
+
+
+def resolve_language(parser, option_name, language, allow_auto=False):
+    """Accept a language code, a full language name or an alias; exit with a usage error otherwise"""
+    resolved_code = language_code(language, default=None)
+    if resolved_code is None or (resolved_code == 'auto' and not allow_auto):
+        parser.error(f"{option_name}: unknown language {language!r}")
+    return resolved_code
+
+
+def main(argument_list=None):
+    parser = argparse.ArgumentParser(description="Translate text files line by line to JSON Lines.")
+    parser.add_argument('files', nargs='*', help="input files (default: stdin)")
+    parser.add_argument('--src', default='auto', help="source language code or name (default: auto)")
+    parser.add_argument('--dest', required=True, help="target language code or name")
+    parser.add_argument('--output', help="write JSON Lines here instead of stdout")
+    parser.add_argument('--concurrency', type=int, default=4, help="parallel translation requests")
+    parser.add_argument('--rate', type=float, help="maximum lines per second sent to the backend")
+    parser.add_argument('--retries', type=int, default=3, help="retries per line after a failure")
+    parser.add_argument('--backoff', type=float, default=0.5, help="initial retry delay in seconds")
+    parser.add_argument('--history', default='translation_history.db', help="history database to read and extend")
+    parser.add_argument('--no-history', action='store_true', help="use a throwaway in-memory history")
+    parser.add_argument('--engine', action='append', choices=sorted(TRANSLATION_ENGINES),
+                        help="translation engine to route through; repeat for fallbacks in preference order "
+                             "(default: google, then phrase_table)")
+    parser.add_argument('--timeout', type=float, default=10.0, help="per-call engine timeout in seconds")
+    parser.add_argument('--phrase-table', default='phrase_table.json', help="phrase table for the phrase_table engine")
+    parser.add_argument('--cache', default='translation_cache.db',
+                        help="translation cache database shared with other runs (':memory:' for a private one)")
+    parser.add_argument('--fake-latency', type=float,
+                        help="use the offline FakeTranslator with this many seconds of latency")
+    parser.add_argument('--stats', action='store_true', help="print throughput to stderr when done")
+    parser.add_argument('--metrics', help="collect stage timings and write them here when done "
+                                          "(JSON for .json, Prometheus text otherwise)")
+    arguments = parser.parse_args(argument_list)
+    # Checked before anything is opened, so a typo never translates into the wrong language
+    source_language = resolve_language(parser, '--src', arguments.src, allow_auto=True)
+    target_language = resolve_language(parser, '--dest', arguments.dest)
+
+    translation_engine = None
+    if arguments.engine:
+        translation_engine = build_engine_router(
+            arguments.engine,
+            engine_options={'phrase_table': {'phrase_table_path': arguments.phrase_table},
+                            'fake': {'latency_seconds': arguments.fake_latency or 0.0}},
+            guard_options={engine_name: {'timeout_seconds': arguments.timeout} for engine_name in arguments.engine})
+    elif arguments.fake_latency is not None:
+        from fake_translator import FakeTranslator
+        translation_engine = FakeTranslator(arguments.fake_latency)
+    if arguments.no_history:
+        history_store = TranslationHistoryStore(':memory:', legacy_json_path=None)
+    else:
+        history_store = TranslationHistoryStore(arguments.history)
+    translation_cache = TranslationCache(arguments.cache)
+    metrics = TranslationMetrics(enabled=bool(arguments.metrics))
+    translation_core = TranslationCore(translation_engine, history_store, translation_cache=translation_cache,
+                                       metrics=metrics)
+
+    batch_translator = BatchTranslator(
+        translation_core,
+        source_language,
+        target_language,
+        concurrency=arguments.concurrency,
+        rate_limiter=RateLimiter(arguments.rate) if arguments.rate else None,
+        max_retries=arguments.retries,
+        backoff_seconds=arguments.backoff)
+
+    output_file = open(arguments.output, 'w', encoding='utf-8') if arguments.output else sys.stdout
+    start_time = time.perf_counter()
+    line_count = failure_count = 0
+    try:
+        with fileinput.input(arguments.files, encoding='utf-8') as input_lines:
+            for record in batch_translator.translate_lines(input_lines):
+                output_file.write(json.dumps(record, ensure_ascii=False) + '\n')
+                line_count += 1
+                failure_count += 'error' in record
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+        if arguments.metrics:
+            metrics.write(arguments.metrics)
+        history_store.close()
+        translation_cache.close()
+
+    if arguments.stats:
+        elapsed_seconds = time.perf_counter() - start_time
+        print(f"{line_count} lines ({failure_count} failed) in {elapsed_seconds:.2f}s, "
+              f"{line_count / elapsed_seconds if elapsed_seconds else 0:.1f} lines/sec", file=sys.stderr)
+        if hasattr(translation_engine, 'statistics'):
+            print(f"engines: {translation_engine.statistics()}", file=sys.stderr)
+        print(f"cache: {translation_cache.statistics()}", file=sys.stderr)
+    return 1 if failure_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
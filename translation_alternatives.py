@@ -0,0 +1,225 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from difflib import SequenceMatcher
+
+from language_names import LANGUAGES
+from text_segmenter import join_segments
+from translation_cache import normalize_cache_text
+
+ALTERNATIVES_KEY = 'alternatives'  # Engines list whole-text variants under this extra_data key
+SCORED_ALTERNATIVES_KEY = 'scored_alternatives'  # Added to the cached entry once every variant is scored
+CANCEL_POLL_SECONDS = 0.05  # How often a waiting request checks whether it was superseded
+
+
+def back_translation_score(original_text, back_translated_text):
+    """Similarity of the original and its round trip, 0-100"""
+    original_text = normalize_cache_text(original_text).lower()
+    back_translated_text = normalize_cache_text(back_translated_text).lower()
+    return round(SequenceMatcher(None, original_text, back_translated_text).ratio() * 100, 1)
+
+
+def alternative_segment(source_text, cache_source_lang, source_lang, target_lang, translated_text, extra_data):
+    """Describe one translated segment for AlternativeTranslator.find_alternatives
+
+    cache_source_lang is the source the engine was called with ('auto' when
+    it detected the language), so the segment's cache entry can be found
+    again. extra_data is None for translations that came from memory.
+    Alternatives are None when the result carried none of its own, as
+    for memory hits and lines of a batched request; they are then looked
+    up in the cache or fetched.
+    """
+    variants_known = extra_data is not None and ALTERNATIVES_KEY in extra_data
+    return {
+        'source': source_text,
+        'cache_source_lang': cache_source_lang,
+        'source_lang': source_lang,
+        'target_lang': target_lang,
+        'translation': translated_text,
+        'alternatives': list(extra_data[ALTERNATIVES_KEY]) if variants_known else None,
+        'scored_alternatives': extra_data.get(SCORED_ALTERNATIVES_KEY) if variants_known else None
+    }
+
+
+class AlternativeTranslator:
+    """Score the alternatives a backend offered for a finished translation
+
+    Candidates come from the primary translation itself: the variants each
+    engine result listed in extra_data['alternatives'], per segment for a
+    document. A segment whose result carried no variants (a line of a
+    batched request, or a memory hit) is looked up in the cache, and
+    otherwise translated once on its own through variant_engine, which
+    must bypass batching. Each candidate is translated back to the source
+    language and scored by how closely the round trip matches the
+    original; a document alternative swaps one segment for one of its
+    variants. Backend calls run in parallel, at most max_backend_calls of
+    them per request, and no new one starts after time_budget_seconds or
+    once the request is cancelled. Calls a request abandons while they run
+    still count against the next request's allowance until they finish.
+    Fetched variants and complete scores are stored with the segment's
+    entry in the translation cache and reused from then on.
+    """
+
+    def __init__(self, translation_engine, translation_cache, max_alternatives=3, time_budget_seconds=3.0,
+                 max_backend_calls=12, max_workers=4, variant_engine=None):
+        self.translation_engine = translation_engine
+        self.translation_cache = translation_cache
+        self.variant_engine = variant_engine if variant_engine is not None else translation_engine
+        self.max_alternatives = max_alternatives
+        self.time_budget_seconds = time_budget_seconds
+        self.max_backend_calls = max_backend_calls
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='alternative')
+        self.counter_lock = threading.Lock()
+        self.calls_in_flight = 0
+        self.counters = dict.fromkeys(('requests', 'reused', 'scored', 'variant_fetches', 'back_translations',
+                                       'over_budget', 'abandoned', 'cancelled', 'failures'), 0)
+
+    def find_alternatives(self, translation_outcome, cancel_event=None):
+        """Return [(alternative, score)] best first for a translate_text or translate_document outcome"""
+        self.count('requests')
+        deadline = time.monotonic() + self.time_budget_seconds
+        alternative_segments = [self.resolve_segment(segment)
+                                for segment in translation_outcome.get('alternative_segments', ())]
+        alternative_segments = [segment for segment in alternative_segments if segment is not None]
+
+        calls_left = self.max_backend_calls
+        unfetched_segments = [segment for segment in alternative_segments if segment['alternatives'] is None]
+        if unfetched_segments:
+            calls_left -= self.run_backend_calls(
+                [(self.variant_engine.translate, segment['source'],
+                  {'dest': segment['target_lang'], 'src': segment['cache_source_lang']},
+                  lambda variant_result, segment=segment: self.store_variants(segment, variant_result))
+                 for segment in unfetched_segments], 'variant_fetches', deadline, cancel_event, calls_left)
+        alternative_segments = [segment for segment in alternative_segments if segment['alternatives'] is not None]
+
+        segment_scores = []
+        unscored_candidates = []
+        for segment in alternative_segments:
+            known_scores = {alternative: quality_score
+                            for alternative, quality_score in segment['scored_alternatives'] or ()}
+            candidates = list(dict.fromkeys(
+                alternative for alternative in segment['alternatives']
+                if isinstance(alternative, str) and alternative.strip() and alternative != segment['translation']))
+            if candidates and all(candidate in known_scores for candidate in candidates):
+                self.count('reused')
+            scores = {candidate: known_scores[candidate] for candidate in candidates if candidate in known_scores}
+            segment_scores.append((segment, candidates, scores))
+            unscored_candidates += [(segment, scores, candidate) for candidate in candidates
+                                    if candidate not in known_scores]
+
+        if unscored_candidates:
+            self.run_backend_calls(
+                [(self.translation_engine.translate, candidate,
+                  {'dest': segment['source_lang'], 'src': segment['target_lang']},
+                  lambda back_translation, segment=segment, scores=scores, candidate=candidate: scores.__setitem__(
+                      candidate, back_translation_score(segment['source'], back_translation.text)))
+                 for segment, scores, candidate in unscored_candidates],
+                'back_translations', deadline, cancel_event, calls_left)
+            for segment, candidates, scores in segment_scores:
+                if scores and len(scores) == len(candidates) and segment['scored_alternatives'] is None:
+                    self.count('scored')
+                    self.translation_cache.update_extra_data(
+                        segment['source'], segment['cache_source_lang'], segment['target_lang'],
+                        {SCORED_ALTERNATIVES_KEY: sorted(([candidate, scores[candidate]] for candidate in candidates),
+                                                         key=lambda scored_alternative: -scored_alternative[1])})
+
+        # Equal scores keep the backend's variant order, however the calls finished
+        scored_alternatives = sorted(((segment, candidate, scores[candidate])
+                                      for segment, candidates, scores in segment_scores
+                                      for candidate in candidates if candidate in scores),
+                                     key=lambda scored_alternative: -scored_alternative[2])
+        main_translation = translation_outcome['translation']
+        segment_layout = translation_outcome.get('segment_layout')
+        segment_translations = {segment['source']: segment['translation'] for segment in alternative_segments}
+        found_alternatives = []
+        for segment, candidate, quality_score in scored_alternatives:
+            if segment_layout is not None:
+                candidate = join_segments(
+                    (candidate if source_segment == segment['source']
+                     else segment_translations.get(source_segment, source_segment), separator)
+                    for source_segment, separator in segment_layout)
+            if candidate != main_translation:
+                found_alternatives.append((candidate, quality_score))
+        return found_alternatives[:self.max_alternatives]
+
+    def resolve_segment(self, segment):
+        """A copy of the segment with any cached alternatives filled in; None if it has nothing to score"""
+        if segment['source_lang'] == segment['target_lang'] or segment['source_lang'] not in LANGUAGES:
+            return None
+        if segment['alternatives'] is not None:
+            return dict(segment)
+        # Memory hits and batched lines skip per-text variants, but an earlier call may have cached them
+        for cache_source_lang in dict.fromkeys((segment['cache_source_lang'], segment['source_lang'], 'auto')):
+            cached_result = self.translation_cache.get(segment['source'], cache_source_lang, segment['target_lang'])
+            extra_data = cached_result.extra_data or {} if cached_result is not None else {}
+            if ALTERNATIVES_KEY in extra_data:
+                return dict(segment, cache_source_lang=cache_source_lang,
+                            alternatives=[cached_result.text, *extra_data[ALTERNATIVES_KEY]],
+                            scored_alternatives=extra_data.get(SCORED_ALTERNATIVES_KEY))
+        return dict(segment)  # Still None: fetched by find_alternatives, within the call budget
+
+    def store_variants(self, segment, variant_result):
+        """Take a per-segment translation's variants and cache them for the next request"""
+        variants = list((getattr(variant_result, 'extra_data', None) or {}).get(ALTERNATIVES_KEY, ()))
+        segment['alternatives'] = [variant_result.text, *variants]
+        if not self.translation_cache.update_extra_data(segment['source'], segment['cache_source_lang'],
+                                                        segment['target_lang'], {ALTERNATIVES_KEY: variants}):
+            self.translation_cache.put(segment['source'], segment['cache_source_lang'], segment['target_lang'],
+                                       variant_result)
+
+    def run_backend_calls(self, backend_calls, counter_name, deadline, cancel_event, call_limit):
+        """Run (function, text, keyword arguments, on_result) calls in parallel within the budget
+
+        on_result runs on the calling thread for each call that succeeds in
+        time. Returns how many calls were started.
+        """
+        with self.counter_lock:
+            call_allowance = max(0, min(call_limit, self.max_backend_calls - self.calls_in_flight))
+        if len(backend_calls) > call_allowance:
+            self.count('over_budget')
+            backend_calls = backend_calls[:call_allowance]
+
+        call_futures = {}
+        for backend_function, text_content, keyword_arguments, on_result in backend_calls:
+            if time.monotonic() >= deadline or (cancel_event is not None and cancel_event.is_set()):
+                break
+            with self.counter_lock:
+                self.calls_in_flight += 1
+                self.counters[counter_name] += 1
+            call_future = self.executor.submit(backend_function, text_content, **keyword_arguments)
+            call_future.add_done_callback(self.release_call)
+            call_futures[call_future] = on_result
+
+        pending_futures = set(call_futures)
+        while pending_futures:
+            if cancel_event is not None and cancel_event.is_set():
+                self.count('cancelled')
+                break
+            remaining_seconds = deadline - time.monotonic()
+            if remaining_seconds <= 0:
+                self.count('over_budget')
+                break
+            done_futures, pending_futures = wait(pending_futures, timeout=min(remaining_seconds, CANCEL_POLL_SECONDS),
+                                                 return_when=FIRST_COMPLETED)
+            for call_future in done_futures:
+                if call_future.exception() is not None:
+                    self.count('failures')
+                    continue
+                call_futures[call_future](call_future.result())
+
+        for pending_future in pending_futures:
+            if not pending_future.cancel():
+                self.count('abandoned')  # Already running; it holds its share of calls_in_flight until done
+        return len(call_futures)
+
+    def release_call(self, call_future):
+        with self.counter_lock:
+            self.calls_in_flight -= 1
+
+    def count(self, counter_name, amount=1):
+        with self.counter_lock:
+            self.counters[counter_name] += amount
+
+    def statistics(self):
+        with self.counter_lock:
+            return dict(self.counters, calls_in_flight=self.calls_in_flight)
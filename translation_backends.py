@@ -0,0 +1,369 @@
+"""Translation engines, the engine registry and a resilient engine router
+
+Every engine offers translate(text, dest, src) returning an object with
+.text, .src, .dest and .extra_data, and optionally detect(text) returning
+.lang and .confidence, the same shape as googletrans. extra_data may list
+other whole-text renderings under 'alternatives'. Engines are created by
+name from TRANSLATION_ENGINES, and build_engine_router() chains several of
+them behind per-engine worker pools, timeouts, circuit breakers and hedged
+requests.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from types import SimpleNamespace
+
+from fake_translator import FakeTranslator
+
+DEFAULT_ENGINE_NAMES = ('google', 'phrase_table')
+MAX_PART_VARIANTS = 5  # Alternative renderings kept per googletrans result
+MIN_HEDGE_SAMPLES = 20  # Successful calls needed before an engine's own p95 sets its hedge delay
+
+
+class BackendUnavailableError(Exception):
+    """No engine could answer: all failed, timed out or had an open circuit"""
+
+
+class PhraseNotFoundError(LookupError):
+    """The phrase table has no entry for some line of the text"""
+
+
+class GoogleTranslateEngine:
+    """googletrans engine backed by a pool of Translator clients
+
+    Each Translator owns its own HTTP connection pool, so pool_size calls can
+    be in flight without sharing a client. Clients are created on first use,
+    which also keeps the googletrans import off the startup path.
+    """
+
+    def __init__(self, pool_size=4, timeout_seconds=10.0, service_urls=('translate.google.com',)):
+        self.pool_size = pool_size
+        self.timeout_seconds = timeout_seconds
+        self.service_urls = service_urls
+        self.idle_translators = queue.LifoQueue()
+        self.created_translators = 0
+        self.pool_lock = threading.Lock()
+
+    def borrow_translator(self):
+        try:
+            return self.idle_translators.get_nowait()
+        except queue.Empty:
+            pass
+        with self.pool_lock:
+            create_translator = self.created_translators < self.pool_size
+            if create_translator:
+                self.created_translators += 1
+        if create_translator:
+            import httpx
+            from googletrans import Translator
+            return Translator(service_urls=self.service_urls, timeout=httpx.Timeout(self.timeout_seconds))
+        return self.idle_translators.get()
+
+    def translate(self, text, dest='en', src='auto'):
+        translator = self.borrow_translator()
+        try:
+            translation_result = translator.translate(text, src=src, dest=dest)
+        finally:
+            self.idle_translators.put(translator)
+        translation_result.extra_data['alternatives'] = part_variants(translation_result)
+        return translation_result
+
+    def detect(self, text):
+        translator = self.borrow_translator()
+        try:
+            return translator.detect(text)
+        finally:
+            self.idle_translators.put(translator)
+
+
+def part_variants(translation_result, max_variants=MAX_PART_VARIANTS):
+    """Whole-text variants that swap one translated part for one of its candidates
+
+    googletrans splits a translation into parts, each listing the other
+    renderings the service considered; the parts objects themselves do not
+    survive the JSON translation cache, so the variants are kept as strings.
+    """
+    translated_parts = translation_result.extra_data.get('parts') or []
+    part_texts = [translated_part.text for translated_part in translated_parts]
+    separator = ' ' if ' '.join(part_texts) == translation_result.text else ''
+    variants = []
+    for index, translated_part in enumerate(translated_parts):
+        for candidate in translated_part.candidates or ():
+            if isinstance(candidate, str) and candidate != translated_part.text:
+                variants.append(separator.join(part_texts[:index] + [candidate] + part_texts[index + 1:]))
+    return list(dict.fromkeys(variants))[:max_variants]
+
+
+def normalize_phrase(text):
+    return ' '.join(text.lower().split())
+
+
+class PhraseTableEngine:
+    """Offline engine answering from a table of known phrase translations
+
+    The JSON file maps "src:dest" pairs to {phrase: translation} objects.
+    Every non-blank line of the text must match a phrase (ignoring case and
+    spacing); otherwise PhraseNotFoundError is raised straight away, so a
+    router moves on to the next engine without waiting.
+    """
+
+    def __init__(self, phrase_table_path='phrase_table.json'):
+        self.phrase_tables = defaultdict(dict)
+        if phrase_table_path and os.path.exists(phrase_table_path):
+            with open(phrase_table_path, 'r', encoding='utf-8') as file:
+                for language_pair, phrases in json.load(file).items():
+                    source_language, target_language = language_pair.split(':')
+                    for source_phrase, translated_phrase in phrases.items():
+                        self.add_phrase(source_phrase, translated_phrase, source_language, target_language)
+
+    def add_phrase(self, source_phrase, translated_phrase, source_language, target_language):
+        self.phrase_tables[(source_language, target_language)][normalize_phrase(source_phrase)] = translated_phrase
+
+    def translate(self, text, dest='en', src='auto'):
+        if src == 'auto':
+            source_languages = [language_pair[0] for language_pair in list(self.phrase_tables)
+                                if language_pair[1] == dest]
+        else:
+            source_languages = [src]
+        for source_language in source_languages:
+            phrases = self.phrase_tables.get((source_language, dest), {})
+            translated_lines = [phrases.get(normalize_phrase(line)) if line.strip() else line
+                                for line in text.split('\n')]
+            if phrases and None not in translated_lines:
+                extra_data = {'confidence': 1.0} if src == 'auto' else {}
+                return SimpleNamespace(text='\n'.join(translated_lines), src=source_language, dest=dest,
+                                       origin=text, pronunciation=None, extra_data=extra_data)
+        raise PhraseNotFoundError(f"No phrase table entry for {text[:40]!r} ({src}->{dest})")
+
+    def detect(self, text):
+        phrase_key = normalize_phrase(text)
+        for (source_language, _), phrases in list(self.phrase_tables.items()):
+            if phrase_key in phrases:
+                return SimpleNamespace(lang=source_language, confidence=1.0)
+        raise PhraseNotFoundError(f"No phrase table entry for {text[:40]!r}")
+
+
+TRANSLATION_ENGINES = {
+    'google': GoogleTranslateEngine,
+    'phrase_table': PhraseTableEngine,
+    'fake': FakeTranslator,
+}
+
+
+def register_engine(engine_name, engine_factory):
+    """Make an engine available to create_engine() and build_engine_router()"""
+    TRANSLATION_ENGINES[engine_name] = engine_factory
+
+
+def create_engine(engine_name, **engine_options):
+    try:
+        engine_factory = TRANSLATION_ENGINES[engine_name]
+    except KeyError:
+        raise ValueError(f"Unknown translation engine {engine_name!r}; "
+                         f"choose from {', '.join(sorted(TRANSLATION_ENGINES))}") from None
+    return engine_factory(**engine_options)
+
+
+class CircuitBreaker:
+    """Stop calling an engine after consecutive failures
+
+    After failure_threshold failures in a row the circuit opens and calls are
+    refused for reset_seconds. Then a single probe call is let through: its
+    success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.breaker_lock = threading.Lock()
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= self.reset_seconds else 'open'
+
+    def allow_call(self):
+        with self.breaker_lock:
+            if self.opened_at is None:
+                return True
+            if self.probe_in_flight or time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self.breaker_lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.breaker_lock:
+            self.consecutive_failures += 1
+            if self.probe_in_flight or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probe_in_flight = False
+
+
+class GuardedEngine:
+    """One engine with its own worker pool, call timeout, breaker and latency window
+
+    Calls slower than timeout_seconds count as failures even if they finish.
+    A phrase table miss is a healthy answer and leaves the breaker closed.
+    """
+
+    def __init__(self, engine_name, engine, pool_size=4, timeout_seconds=10.0, circuit_breaker=None,
+                 latency_window=200):
+        self.engine_name = engine_name
+        self.engine = engine
+        self.timeout_seconds = timeout_seconds
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        self.call_executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f'engine-{engine_name}')
+        self.recent_latencies = deque(maxlen=latency_window)
+        self.call_count = 0
+        self.failure_count = 0
+
+    def submit(self, method_name, arguments, keyword_arguments):
+        self.call_count += 1
+        return self.call_executor.submit(self.timed_call, method_name, arguments, keyword_arguments)
+
+    def timed_call(self, method_name, arguments, keyword_arguments):
+        start_time = time.monotonic()
+        try:
+            call_result = getattr(self.engine, method_name)(*arguments, **keyword_arguments)
+        except PhraseNotFoundError:
+            self.circuit_breaker.record_success()
+            raise
+        except Exception:
+            self.failure_count += 1
+            self.circuit_breaker.record_failure()
+            raise
+        elapsed_seconds = time.monotonic() - start_time
+        if elapsed_seconds > self.timeout_seconds:
+            self.failure_count += 1
+            self.circuit_breaker.record_failure()
+        else:
+            self.recent_latencies.append(elapsed_seconds)
+            self.circuit_breaker.record_success()
+        return call_result
+
+    def latency_percentile(self, fraction):
+        """Latency below which this fraction of recent successful calls finished, or None"""
+        if len(self.recent_latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        sorted_latencies = sorted(self.recent_latencies)
+        return sorted_latencies[min(len(sorted_latencies) - 1, int(fraction * len(sorted_latencies)))]
+
+    def statistics(self):
+        p95_seconds = self.latency_percentile(0.95)
+        return {'calls': self.call_count, 'failures': self.failure_count, 'circuit': self.circuit_breaker.state,
+                'p95_ms': None if p95_seconds is None else round(p95_seconds * 1000, 1)}
+
+
+class EngineRouter:
+    """Send each call through a preference-ordered chain of guarded engines
+
+    The first engine whose circuit allows it gets the call. If it has not
+    answered by its own p95 latency (hedge_delay_seconds until it has enough
+    history), the call is also sent to the next engine and the first
+    successful answer wins. A failure or timeout moves on to the next engine
+    at once. Drop-in replacement for a single engine's translate()/detect().
+    """
+
+    def __init__(self, guarded_engines, hedge_delay_seconds=1.0, hedge_percentile=0.95,
+                 min_hedge_delay_seconds=0.05):
+        self.guarded_engines = list(guarded_engines)
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay_seconds = min_hedge_delay_seconds
+        self.hedged_calls = 0
+        self.hedge_wins = 0
+
+    def translate(self, text, dest='en', src='auto'):
+        return self.call('translate', (text,), {'dest': dest, 'src': src})
+
+    def detect(self, text):
+        return self.call('detect', (text,), {})
+
+    def hedge_delay(self, guarded_engine):
+        percentile_latency = guarded_engine.latency_percentile(self.hedge_percentile)
+        if percentile_latency is None:
+            percentile_latency = self.hedge_delay_seconds
+        return max(self.min_hedge_delay_seconds, percentile_latency)
+
+    def call(self, method_name, arguments, keyword_arguments):
+        untried_engines = deque(guarded_engine for guarded_engine in self.guarded_engines
+                                if hasattr(guarded_engine.engine, method_name))
+        pending_calls = {}  # future -> (guarded engine, deadline)
+        hedge_engines = set()
+        hedge_at = None
+        last_error = None
+
+        def launch_next_engine():
+            while untried_engines:
+                guarded_engine = untried_engines.popleft()
+                if guarded_engine.circuit_breaker.allow_call():
+                    launch_time = time.monotonic()
+                    call_future = guarded_engine.submit(method_name, arguments, keyword_arguments)
+                    pending_calls[call_future] = (guarded_engine, launch_time + guarded_engine.timeout_seconds)
+                    return guarded_engine, launch_time + self.hedge_delay(guarded_engine)
+            return None, None
+
+        while True:
+            if not pending_calls:
+                launched_engine, hedge_at = launch_next_engine()
+                if launched_engine is None:
+                    raise BackendUnavailableError(f"No translation engine could {method_name} the text") from last_error
+
+            wait_until = min(deadline for _, deadline in pending_calls.values())
+            if untried_engines:
+                wait_until = min(wait_until, hedge_at)
+            finished_calls, _ = wait(pending_calls, timeout=max(0.0, wait_until - time.monotonic()),
+                                     return_when=FIRST_COMPLETED)
+            for call_future in finished_calls:
+                guarded_engine, _ = pending_calls.pop(call_future)
+                if call_future.exception() is None:
+                    if guarded_engine in hedge_engines:
+                        self.hedge_wins += 1
+                    return call_future.result()
+                last_error = call_future.exception()
+
+            current_time = time.monotonic()
+            for call_future, (guarded_engine, deadline) in list(pending_calls.items()):
+                if current_time >= deadline:
+                    del pending_calls[call_future]  # Left to finish in the background
+                    last_error = TimeoutError(f"{guarded_engine.engine_name} did not answer within "
+                                              f"{guarded_engine.timeout_seconds}s")
+            if pending_calls and untried_engines and current_time >= hedge_at:
+                launched_engine, next_hedge_at = launch_next_engine()
+                if launched_engine is not None:
+                    self.hedged_calls += 1
+                    hedge_engines.add(launched_engine)
+                    hedge_at = next_hedge_at
+
+    def statistics(self):
+        engine_statistics = {guarded_engine.engine_name: guarded_engine.statistics()
+                             for guarded_engine in self.guarded_engines}
+        return {'engines': engine_statistics, 'hedged_calls': self.hedged_calls, 'hedge_wins': self.hedge_wins}
+
+
+def build_engine_router(engine_names=DEFAULT_ENGINE_NAMES, engine_options=None, guard_options=None,
+                        **router_options):
+    """Create the named engines in preference order and route calls across them
+
+    engine_options and guard_options map engine names to keyword arguments
+    for create_engine() and GuardedEngine respectively.
+    """
+    engine_options = engine_options or {}
+    guard_options = guard_options or {}
+    return EngineRouter([GuardedEngine(engine_name, create_engine(engine_name, **engine_options.get(engine_name, {})),
+                                       **guard_options.get(engine_name, {}))
+                         for engine_name in engine_names], **router_options)
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from types import SimpleNamespace
+
+ENTRY_OVERHEAD_BYTES = 200  # Rough per-entry cost of keys, tuples and dict slots in the memory tier
+EVICTION_CHECK_INTERVAL = 256  # Disk writes between size checks
+LAST_USED_RESOLUTION_SECONDS = 60  # Disk hits refresh last_used at most this often
+INLINE_WHITESPACE = re.compile(r'[^\S\n]+')
+# Extra data anything reads back; raw backend payloads such as googletrans'
+# 'parsed' and 'parts' would multiply every row's size for nothing
+CACHED_EXTRA_DATA_KEYS = ('confidence', 'alternatives', 'scored_alternatives')
+
+
+def normalize_cache_text(text_content):
+    """NFC, trimmed lines and single spaces; line breaks are kept because batches split on them"""
+    normalized_text = unicodedata.normalize('NFC', text_content)
+    return '\n'.join(INLINE_WHITESPACE.sub(' ', line).strip() for line in normalized_text.split('\n')).strip()
+
+
+def extra_data_to_json(extra_data):
+    """Serialize the extra data keys worth caching"""
+    return json.dumps({key: value for key, value in (extra_data or {}).items() if key in CACHED_EXTRA_DATA_KEYS},
+                      default=str)
+
+
+def stored_size(translated_text, extra_data_json):
+    return len(translated_text.encode('utf-8')) + len(extra_data_json.encode('utf-8')) + ENTRY_OVERHEAD_BYTES
+
+
+def cache_key(text_content, source_language, target_language):
+    normalized_text = normalize_cache_text(text_content)
+    return hashlib.blake2b(f"{source_language}\0{target_language}\0{normalized_text}".encode('utf-8'),
+                           digest_size=16).digest()
+
+
+class TranslationCache:
+    """Two-tier translation cache: an in-memory LRU over a shared SQLite file
+
+    Entries are keyed by a hash of the normalized text and language pair.
+    The memory tier holds at most memory_budget_bytes and evicts least
+    recently used entries. The disk tier is a WAL-mode SQLite database that
+    several app and CLI processes can open at once; entries older than
+    ttl_seconds are never returned and are purged, and once the file holds
+    more than disk_budget_bytes the least recently used rows are deleted.
+    Only the extra data keys in CACHED_EXTRA_DATA_KEYS are stored. Pass
+    disk_path=None for a memory-only cache.
+    """
+
+    def __init__(self, disk_path='translation_cache.db', memory_budget_bytes=16 * 1024 * 1024,
+                 disk_budget_bytes=200 * 1024 * 1024, ttl_seconds=30 * 24 * 3600):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.disk_budget_bytes = disk_budget_bytes
+        self.ttl_seconds = ttl_seconds
+        self.cache_lock = threading.Lock()
+        self.memory_entries = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_writes_since_check = 0
+        self.counters = dict.fromkeys(('memory_hits', 'disk_hits', 'misses', 'memory_evictions',
+                                       'disk_evictions', 'expired'), 0)
+
+        self.connection = None
+        if disk_path is not None:
+            # The busy timeout lets concurrent processes wait for each other's writes
+            self.connection = sqlite3.connect(disk_path, timeout=30, check_same_thread=False)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            with self.cache_lock, self.connection:
+                self.connection.execute("""
+                    CREATE TABLE IF NOT EXISTS translations (
+                        key BLOB PRIMARY KEY,
+                        translation TEXT NOT NULL,
+                        src_lang TEXT NOT NULL,
+                        extra_data TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    ) WITHOUT ROWID""")
+                self.connection.execute('CREATE INDEX IF NOT EXISTS translations_last_used '
+                                        'ON translations (last_used)')
+                self.connection.execute('CREATE INDEX IF NOT EXISTS translations_created_at '
+                                        'ON translations (created_at)')
+
+    def get(self, text_content, source_language, target_language):
+        """Return a cached translation result, or None on a miss"""
+        entry_key = cache_key(text_content, source_language, target_language)
+        with self.cache_lock:
+            memory_entry = self.memory_entries.get(entry_key)
+            if memory_entry is not None and time.time() - memory_entry[3] < self.ttl_seconds:
+                self.memory_entries.move_to_end(entry_key)
+                self.counters['memory_hits'] += 1
+                return self.build_result(text_content, target_language, memory_entry)
+
+            disk_row = None
+            if self.connection is not None:
+                disk_row = self.connection.execute(
+                    'SELECT translation, src_lang, extra_data, created_at, last_used FROM translations '
+                    'WHERE key = ? AND created_at >= ?', (entry_key, time.time() - self.ttl_seconds)).fetchone()
+            if disk_row is None:
+                self.counters['misses'] += 1
+                return None
+            self.counters['disk_hits'] += 1
+            translated_text, detected_source, extra_data_json, created_at, last_used = disk_row
+            if time.time() - last_used > LAST_USED_RESOLUTION_SECONDS:
+                with self.connection:
+                    self.connection.execute('UPDATE translations SET last_used = ? WHERE key = ?',
+                                            (time.time(), entry_key))
+            memory_entry = (translated_text, detected_source, json.loads(extra_data_json), created_at)
+            self.remember_in_memory(entry_key, memory_entry, stored_size(translated_text, extra_data_json))
+            return self.build_result(text_content, target_language, memory_entry)
+
+    def put(self, text_content, source_language, target_language, translation_result):
+        """Store a translation result in both tiers"""
+        entry_key = cache_key(text_content, source_language, target_language)
+        extra_data_json = extra_data_to_json(getattr(translation_result, 'extra_data', None))
+        detected_source = getattr(translation_result, 'src', source_language)
+        created_at = time.time()
+        memory_entry = (translation_result.text, detected_source, json.loads(extra_data_json), created_at)
+        entry_size = stored_size(translation_result.text, extra_data_json)
+        with self.cache_lock:
+            self.remember_in_memory(entry_key, memory_entry, entry_size)
+            if self.connection is None:
+                return
+            with self.connection:
+                self.connection.execute('INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                        (entry_key, translation_result.text, detected_source, extra_data_json,
+                                         entry_size, created_at, created_at))
+            self.disk_writes_since_check += 1
+            if self.disk_writes_since_check >= EVICTION_CHECK_INTERVAL:
+                self.disk_writes_since_check = 0
+                self.evict_from_disk()
+
+    def update_extra_data(self, text_content, source_language, target_language, extra_fields):
+        """Merge extra_fields into a stored entry's extra data, keeping its age; False if it is gone"""
+        entry_key = cache_key(text_content, source_language, target_language)
+        with self.cache_lock:
+            memory_entry = self.memory_entries.get(entry_key)
+            if memory_entry is None and self.connection is not None:
+                memory_entry = self.connection.execute(
+                    'SELECT translation, src_lang, extra_data, created_at FROM translations WHERE key = ?',
+                    (entry_key,)).fetchone()
+                if memory_entry is not None:
+                    memory_entry = (*memory_entry[:2], json.loads(memory_entry[2]), memory_entry[3])
+            if memory_entry is None:
+                return False
+            translated_text, detected_source, extra_data, created_at = memory_entry[:4]
+            extra_data_json = extra_data_to_json(dict(extra_data, **extra_fields))
+            entry_size = stored_size(translated_text, extra_data_json)
+            self.remember_in_memory(entry_key, (translated_text, detected_source, json.loads(extra_data_json),
+                                                created_at), entry_size)
+            if self.connection is None:
+                return True
+            with self.connection:
+                self.connection.execute('UPDATE translations SET extra_data = ?, size = ? WHERE key = ?',
+                                        (extra_data_json, entry_size, entry_key))
+            return True
+
+    def build_result(self, text_content, target_language, memory_entry):
+        translated_text, detected_source, extra_data = memory_entry[:3]
+        return SimpleNamespace(text=translated_text, src=detected_source, dest=target_language, origin=text_content,
+                               pronunciation=None, extra_data=extra_data)
+
+    def remember_in_memory(self, entry_key, memory_entry, entry_size):
+        """Insert into the memory tier and evict down to its budget (caller holds cache_lock)"""
+        previous_entry = self.memory_entries.pop(entry_key, None)
+        if previous_entry is not None:
+            self.memory_bytes -= previous_entry[4]
+        self.memory_entries[entry_key] = (*memory_entry, entry_size)
+        self.memory_bytes += entry_size
+        while self.memory_bytes > self.memory_budget_bytes and len(self.memory_entries) > 1:
+            _, evicted_entry = self.memory_entries.popitem(last=False)
+            self.memory_bytes -= evicted_entry[4]
+            self.counters['memory_evictions'] += 1
+
+    def evict_from_disk(self):
+        """Purge expired rows, then least recently used rows beyond the byte budget (caller holds cache_lock)"""
+        with self.connection:
+            expired_rows = self.connection.execute('DELETE FROM translations WHERE created_at < ?',
+                                                   (time.time() - self.ttl_seconds,)).rowcount
+            self.counters['expired'] += expired_rows
+            total_bytes = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM translations').fetchone()[0]
+            excess_bytes = total_bytes - self.disk_budget_bytes
+            if excess_bytes <= 0:
+                return
+            evicted_keys = []
+            for entry_key, entry_size in self.connection.execute(
+                    'SELECT key, size FROM translations ORDER BY last_used'):
+                if excess_bytes <= 0:
+                    break
+                evicted_keys.append((entry_key,))
+                excess_bytes -= entry_size
+            self.connection.executemany('DELETE FROM translations WHERE key = ?', evicted_keys)
+            self.counters['disk_evictions'] += len(evicted_keys)
+
+    def statistics(self):
+        with self.cache_lock:
+            cache_statistics = dict(self.counters, memory_entries=len(self.memory_entries),
+                                    memory_bytes=self.memory_bytes)
+        lookups = cache_statistics['memory_hits'] + cache_statistics['disk_hits'] + cache_statistics['misses']
+        cache_statistics['hit_rate'] = round((lookups - cache_statistics['misses']) / lookups, 3) if lookups else 0.0
+        return cache_statistics
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+
+class CachedTranslator:
+    """Drop-in engine wrapper that answers translate() from a TranslationCache when it can"""
+
+    def __init__(self, translation_engine, translation_cache):
+        self.translation_engine = translation_engine
+        self.translation_cache = translation_cache
+
+    def translate(self, text, dest='en', src='auto'):
+        cached_result = self.translation_cache.get(text, src, dest)
+        if cached_result is not None:
+            return cached_result
+        translation_result = self.translation_engine.translate(text, dest=dest, src=src)
+        self.translation_cache.put(text, src, dest, translation_result)
+        return translation_result
+
+    def detect(self, text):
+        return self.translation_engine.detect(text)
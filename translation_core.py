@@ -0,0 +1,275 @@
+import itertools
+import random
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from batching_translator import BatchingTranslator
+from history_store import TranslationHistoryStore
+from language_detector import HybridLanguageDetector, LocalLanguageDetector
+from language_names import LANGUAGES, language_code
+from text_segmenter import join_segments, split_segments
+from translation_alternatives import AlternativeTranslator, alternative_segment
+from translation_backends import build_engine_router
+from translation_cache import CachedTranslator, TranslationCache
+from translation_metrics import TranslationMetrics
+from translation_memory import TranslationMemory
+
+STARTUP_LEARNING_ENTRIES = 1000  # History entries the language detector learns from at startup
+
+
+class TranslationCore:
+    """UI-independent translation workflow shared by the GUI and the CLI
+
+    Wraps language lookup, detection, translation memory, the backend call,
+    confidence scoring and history persistence. Nothing here touches tkinter
+    or the speech libraries, so it can be driven headlessly and from worker
+    threads.
+    """
+
+    def __init__(self, translation_engine=None, history_store=None, segment_workers=8, translation_cache=None,
+                 metrics=None, random_seed=None):
+        if translation_engine is None:
+            translation_engine = build_engine_router()
+        self.translation_cache = translation_cache if translation_cache is not None else TranslationCache()
+        batching_translator = BatchingTranslator(translation_engine)
+        # Cache hits skip the batching window as well as the backend
+        self.translation_engine = CachedTranslator(batching_translator, self.translation_cache)
+        self.metrics = metrics if metrics is not None else TranslationMetrics()
+        # Variants are fetched per segment, so they must bypass the batching that strips them
+        self.alternative_translator = AlternativeTranslator(self.translation_engine, self.translation_cache,
+                                                            variant_engine=translation_engine)
+        self.random_seed = random_seed
+        self.random_generator = random.Random()
+        self.metrics.register_source('cache', self.translation_cache)
+        self.metrics.register_source('batching', batching_translator)
+        self.metrics.register_source('alternatives', self.alternative_translator)
+        if hasattr(translation_engine, 'statistics'):
+            self.metrics.register_source('engines', translation_engine)
+        self.history_store = history_store if history_store is not None else TranslationHistoryStore()
+        # Indexing tens of thousands of entries takes seconds; lookups scan linearly until it is done
+        self.translation_memory = TranslationMemory(self.load_translation_history(), build_in_background=True)
+        self.translation_history = self.translation_memory.memory_entries
+        self.language_detector = LocalLanguageDetector()
+        self.hybrid_detector = HybridLanguageDetector(self.language_detector, self.detect_remote_language)
+        self.metrics.register_source('detection', self.hybrid_detector)
+        # Only the newest entries, to keep startup short; later translations keep teaching it
+        for history_entry in itertools.islice(reversed(self.translation_history), STARTUP_LEARNING_ENTRIES):
+            self.learn_languages(history_entry)
+        self.segment_executor = ThreadPoolExecutor(max_workers=segment_workers, thread_name_prefix='segment')
+
+    def get_language_code(self, language_name):
+        """Convert full language name to language code"""
+        return language_code(language_name)  # English if not found
+
+    def detect_input_language(self, text_content):
+        """Identify the language of the input text with confidence score"""
+        try:
+            detected_language, detection_confidence = self.hybrid_detector.detect(text_content)
+            return detected_language, detection_confidence * 100
+        except Exception:
+            return 'en', 0  # Fallback to English with 0% confidence
+
+    def detect_remote_language(self, text_content):
+        """Ask the translation backend, used when local detection is unsure"""
+        detection_result = self.translation_engine.detect(text_content)
+        return detection_result.lang, detection_result.confidence
+
+    def learn_languages(self, history_entry):
+        """Feed both sides of a translation to the local language detector"""
+        self.language_detector.learn(history_entry['source'], history_entry['src_lang'])
+        self.language_detector.learn(history_entry['translation'], history_entry['dest_lang'])
+
+    def read_detected_language(self, text_content, translation_result):
+        """Take the detected source from an auto translation, detecting separately only if it is missing"""
+        detected_language = getattr(translation_result, 'src', 'auto')
+        if detected_language not in LANGUAGES:
+            return self.detect_input_language(text_content)
+        detection_confidence = (getattr(translation_result, 'extra_data', None) or {}).get('confidence')
+        return detected_language, None if detection_confidence is None else detection_confidence * 100
+
+    def check_translation_memory(self, source_text, source_lang, target_lang):
+        """Search for similar translations in memory"""
+        memory_entry = self.translation_memory.lookup(source_text, source_lang, target_lang)
+        if memory_entry is not None:
+            return memory_entry['translation'], memory_entry['confidence']
+        return None, 0
+
+    def translate_text(self, input_text, source_language_code, target_language_code, remember=True):
+        """Detect, consult memory, translate and (unless remember is False) record a single text"""
+        auto_detected = source_language_code == 'auto'
+        detection_confidence = None
+
+        # Check if we have this translation in memory
+        if auto_detected:
+            # Memory already knows the source language of anything it matches
+            with self.metrics.stage('memory_lookup'):
+                memory_entry = self.translation_memory.lookup_any_source(input_text, target_language_code)
+            if memory_entry is not None:
+                source_language_code = memory_entry['src_lang']
+                cached_result, confidence_score = memory_entry['translation'], memory_entry['confidence']
+            else:
+                cached_result, confidence_score = None, 0
+                # A confident local detection saves the backend from detecting
+                with self.metrics.stage('detect'):
+                    local_detection = self.hybrid_detector.detect_locally_or_none(input_text)
+                if local_detection is not None:
+                    source_language_code, detection_confidence = local_detection[0], local_detection[1] * 100
+        else:
+            with self.metrics.stage('memory_lookup'):
+                cached_result, confidence_score = self.check_translation_memory(input_text, source_language_code,
+                                                                                target_language_code)
+        self.metrics.increment('memory_hits' if cached_result else 'memory_misses')
+        engine_source_code = source_language_code  # The cache key, even once 'auto' is resolved below
+        if cached_result:
+            translated_text = cached_result
+            extra_data = None
+        else:
+            # Execute translation; the backend reports the source it detected
+            with self.metrics.stage('translate'):
+                translation_result = self.translation_engine.translate(input_text, src=source_language_code,
+                                                                       dest=target_language_code)
+            translated_text = translation_result.text
+            extra_data = getattr(translation_result, 'extra_data', None) or {}
+            if source_language_code == 'auto':
+                with self.metrics.stage('detect'):
+                    source_language_code, detection_confidence = self.read_detected_language(input_text,
+                                                                                             translation_result)
+
+            # Calculate confidence score
+            confidence_score = self.calculate_translation_confidence(input_text, translated_text,
+                                                                     source_language_code, target_language_code)
+
+            # Store in memory
+            if remember:
+                self.save_to_translation_history(input_text, translated_text,
+                                                 source_language_code, target_language_code, confidence_score)
+
+        return {
+            'source_lang': source_language_code,
+            'auto_detected': auto_detected,
+            'detection_confidence': detection_confidence,
+            'translation': translated_text,
+            'confidence': confidence_score,
+            'from_memory': bool(cached_result),
+            # Everything find_alternative_translations needs, so it never translates the text again
+            'alternative_segments': [alternative_segment(input_text, engine_source_code, source_language_code,
+                                                         target_language_code, translated_text, extra_data)]
+        }
+
+    def translate_document(self, input_text, source_language_code, target_language_code, remember=True):
+        """Translate sentence by sentence so unchanged segments come from memory
+
+        Each segment is looked up and recorded on its own, misses are
+        translated in parallel, and the results are stitched back together
+        with the original spacing. The outcome has the same keys as
+        translate_text, with length-weighted confidences.
+        """
+        return self.translate_documents([input_text], source_language_code, target_language_code, remember)[0]
+
+    def translate_documents(self, input_texts, source_language_code, target_language_code, remember=True):
+        """translate_document for several texts, with all their segments translated in one parallel pass"""
+        segment_layouts = [split_segments(input_text) for input_text in input_texts]
+        # A single-segment text is translated whole, as translate_text would
+        unique_segments = list(dict.fromkeys(segment for segments in segment_layouts for segment, _ in segments
+                                             if segment.strip() or len(segments) == 1))
+        if len(unique_segments) == 1:
+            segment_outcomes = {unique_segments[0]: self.translate_text(unique_segments[0], source_language_code,
+                                                                        target_language_code, remember)}
+        else:
+            segment_outcomes = dict(zip(unique_segments, self.segment_executor.map(
+                lambda segment: self.translate_text(segment, source_language_code, target_language_code, remember),
+                unique_segments)))
+        return [segment_outcomes[segments[0][0]] if len(segments) == 1
+                else self.assemble_document(segments, segment_outcomes, source_language_code)
+                for segments in segment_layouts]
+
+    def assemble_document(self, segments, segment_outcomes, source_language_code):
+        """Stitch per-segment outcomes back into one translate_document outcome"""
+        segment_outcomes = {segment: segment_outcomes[segment] for segment, _ in segments
+                            if segment.strip() and segment in segment_outcomes}
+        unique_segments = list(segment_outcomes)
+        translated_text = join_segments(
+            (segment_outcomes[segment]['translation'] if segment in segment_outcomes else segment, separator)
+            for segment, separator in segments)
+
+        # Weight per-segment results by how much of the text each one covers
+        weighted_outcomes = [(len(segment), segment_outcomes[segment])
+                             for segment, _ in segments if segment in segment_outcomes]
+        total_weight = sum(weight for weight, _ in weighted_outcomes) or 1
+        confidence_score = sum(weight * outcome['confidence'] for weight, outcome in weighted_outcomes) / total_weight
+        source_weights = Counter()
+        for weight, outcome in weighted_outcomes:
+            source_weights[outcome['source_lang']] += weight
+        detections = [(weight, outcome['detection_confidence']) for weight, outcome in weighted_outcomes
+                      if outcome['detection_confidence'] is not None]
+        detection_confidence = (sum(weight * confidence for weight, confidence in detections)
+                                / sum(weight for weight, _ in detections)) if detections else None
+
+        return {
+            'source_lang': source_weights.most_common(1)[0][0] if source_weights else source_language_code,
+            'auto_detected': source_language_code == 'auto',
+            'detection_confidence': detection_confidence,
+            'translation': translated_text,
+            'confidence': confidence_score,
+            'from_memory': all(outcome['from_memory'] for outcome in segment_outcomes.values()),
+            'segment_count': len(unique_segments),
+            'memory_hits': sum(outcome['from_memory'] for outcome in segment_outcomes.values()),
+            'alternative_segments': [alternative for outcome in segment_outcomes.values()
+                                     for alternative in outcome['alternative_segments']],
+            'segment_layout': segments
+        }
+
+    def find_alternative_translations(self, translation_outcome, cancel_event=None):
+        """Scored alternatives to a translate_document outcome; back-translates, so run it off the Tk thread"""
+        with self.metrics.stage('alternatives'):
+            return self.alternative_translator.find_alternatives(translation_outcome, cancel_event)
+
+    def calculate_translation_confidence(self, original_text, translated_text, source_lang, target_lang):
+        """Estimate confidence score for the translation"""
+        # Base confidence simulation
+        confidence_score = self.seeded_random(original_text, target_lang).uniform(70, 95)
+
+        # Adjust for text length (longer texts typically have lower confidence)
+        length_adjustment = min(1, 100 / len(original_text.split()))
+        confidence_score *= length_adjustment
+
+        # Adjust for difficult language pairs
+        challenging_pairs = [('ja', 'en'), ('zh', 'en'), ('ar', 'en'), ('en', 'hi'), ('hi', 'en')]
+        if (source_lang, target_lang) in challenging_pairs or (target_lang, source_lang) in challenging_pairs:
+            confidence_score *= 0.9
+
+        return min(95, max(50, confidence_score))  # Keep within 50-95% range
+
+    def seeded_random(self, *seed_parts):
+        """Random source for simulated scores; reproducible per input when random_seed is set
+
+        Seeding from the input rather than sharing one seeded generator keeps
+        scores stable however concurrent translations are scheduled.
+        """
+        if self.random_seed is None:
+            return self.random_generator
+        return random.Random('\0'.join(map(str, (self.random_seed, *seed_parts))))
+
+    def save_to_translation_history(self, source_text, translated_text, source_lang, target_lang, confidence_score):
+        """Store translation in memory"""
+        history_entry = {
+            'source': source_text,
+            'translation': translated_text,
+            'src_lang': source_lang,
+            'dest_lang': target_lang,
+            'confidence': confidence_score,
+            'timestamp': datetime.now().isoformat()
+        }
+        with self.metrics.stage('history_save'):
+            self.translation_memory.add(history_entry)
+            self.learn_languages(history_entry)
+            self.save_translation_history(history_entry)
+
+    def load_translation_history(self):
+        """Stream translation history entries from the history store"""
+        return self.history_store.iter_entries()
+
+    def save_translation_history(self, history_entry):
+        """Append a single entry to the history store"""
+        self.history_store.append(history_entry)
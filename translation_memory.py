@@ -0,0 +1,201 @@
+import threading
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+
+SIMILARITY_THRESHOLD = 0.9  # Same 90% cut-off the linear memory scan used
+NGRAM_SIZE = 3
+FLOAT_TOLERANCE = 1e-9  # Keeps the trigram bounds conservative under rounding
+INDEX_CHUNK_SIZE = 500  # Entries indexed per lock hold while building in the background
+
+
+def extract_trigrams(text_content):
+    """Count the overlapping character trigrams of a string"""
+    return Counter(text_content[index:index + NGRAM_SIZE]
+                   for index in range(len(text_content) - NGRAM_SIZE + 1))
+
+
+class TranslationMemory:
+    """Indexed fuzzy lookup over the translation history
+
+    Entries are bucketed by (src_lang, dest_lang). Each bucket keeps an exact
+    hash of lowercased sources plus a trigram inverted index, so only a
+    handful of candidates reach the SequenceMatcher check. Candidate
+    filtering is lossless: the q-gram lemma and difflib's own upper bounds
+    never reject an entry whose ratio could exceed the threshold, and the
+    oldest matching entry wins exactly as with the old linear scan.
+
+    With build_in_background, large histories are indexed by a daemon
+    thread a chunk at a time. Until it catches up, lookups use the index
+    for the entries it covers and the old linear scan for the rest, so
+    results are the same at every point, only slower. Lookups and additions
+    serialize on index_lock, so callers need no locking of their own.
+    """
+
+    def __init__(self, history_entries=(), build_in_background=False):
+        self.memory_entries = list(history_entries)
+        self.entry_buckets = defaultdict(_MemoryBucket)
+        self.indexed_count = 0  # memory_entries[:indexed_count] are in the buckets
+        self.index_lock = threading.Lock()
+        self.index_ready = threading.Event()
+        if build_in_background:
+            threading.Thread(target=self.index_pending_entries, name='translation-memory-index',
+                             daemon=True).start()
+        else:
+            self.index_pending_entries()
+
+    def __len__(self):
+        return len(self.memory_entries)
+
+    def index_pending_entries(self):
+        """Index every entry the buckets do not cover yet, releasing the lock between chunks"""
+        while True:
+            with self.index_lock:
+                chunk_end = min(len(self.memory_entries), self.indexed_count + INDEX_CHUNK_SIZE)
+                for entry_id in range(self.indexed_count, chunk_end):
+                    self.index_entry(entry_id)
+                self.indexed_count = chunk_end
+                if chunk_end == len(self.memory_entries):
+                    self.index_ready.set()
+                    return
+
+    def wait_until_indexed(self, timeout=None):
+        """Block until the background build has caught up; False on timeout"""
+        return self.index_ready.wait(timeout)
+
+    def index_entry(self, entry_id):
+        history_entry = self.memory_entries[entry_id]
+        bucket = self.entry_buckets[(history_entry['src_lang'], history_entry['dest_lang'])]
+        bucket.add(entry_id, history_entry['source'].lower())
+
+    def add(self, history_entry):
+        """Index a history entry for later lookups"""
+        with self.index_lock:
+            self.memory_entries.append(history_entry)
+            if self.index_ready.is_set():
+                self.index_entry(len(self.memory_entries) - 1)
+                self.indexed_count += 1
+
+    def lookup(self, source_text, source_lang, target_lang):
+        """Return the first history entry similar to source_text, or None"""
+        lowered_query = source_text.lower()
+        with self.index_lock:
+            bucket = self.entry_buckets.get((source_lang, target_lang))
+            entry_id = None if bucket is None else bucket.find_similar(lowered_query)
+            if entry_id is None:
+                # Unindexed entries are all newer than indexed ones, so they only matter on an index miss
+                entry_id = self.scan_unindexed(lowered_query, lambda history_entry: (
+                    history_entry['src_lang'] == source_lang and history_entry['dest_lang'] == target_lang))
+        return None if entry_id is None else self.memory_entries[entry_id]
+
+    def lookup_any_source(self, source_text, target_lang):
+        """Return the first similar entry translated into target_lang from any source language"""
+        lowered_query = source_text.lower()
+        with self.index_lock:
+            matching_ids = [bucket.find_similar(lowered_query)
+                            for (_, dest_lang), bucket in self.entry_buckets.items() if dest_lang == target_lang]
+            matching_ids = [entry_id for entry_id in matching_ids if entry_id is not None]
+            if not matching_ids:
+                matching_ids = [self.scan_unindexed(
+                    lowered_query, lambda history_entry: history_entry['dest_lang'] == target_lang)]
+        matching_ids = [entry_id for entry_id in matching_ids if entry_id is not None]
+        return self.memory_entries[min(matching_ids)] if matching_ids else None
+
+    def scan_unindexed(self, lowered_query, entry_filter):
+        """The original linear scan over entries the index does not cover yet (caller holds index_lock)"""
+        for entry_id in range(self.indexed_count, len(self.memory_entries)):
+            history_entry = self.memory_entries[entry_id]
+            if not entry_filter(history_entry):
+                continue
+            lowered_source = history_entry['source'].lower()
+            if lowered_source == lowered_query:
+                return entry_id
+            if not lengths_compatible(len(lowered_query), len(lowered_source)):
+                continue
+            matcher = SequenceMatcher(None, lowered_query, lowered_source)
+            if matcher.quick_ratio() > SIMILARITY_THRESHOLD and matcher.ratio() > SIMILARITY_THRESHOLD:
+                return entry_id
+        return None
+
+
+class _MemoryBucket:
+    """Index for all history entries of a single language pair"""
+
+    def __init__(self):
+        self.lowered_sources = {}
+        self.exact_sources = {}
+        self.trigram_postings = defaultdict(list)
+        self.ids_by_length = defaultdict(list)
+        self.last_entry_id = -1
+
+    def add(self, entry_id, lowered_source):
+        self.last_entry_id = entry_id
+        self.lowered_sources[entry_id] = lowered_source
+        self.exact_sources.setdefault(lowered_source, entry_id)
+        self.ids_by_length[len(lowered_source)].append(entry_id)
+        for trigram, occurrences in extract_trigrams(lowered_source).items():
+            self.trigram_postings[trigram].append((entry_id, occurrences))
+
+    def find_similar(self, lowered_query):
+        # An exact hit has ratio 1.0, but an older fuzzy match still takes
+        # precedence, so only entries added before it need checking
+        exact_id = self.exact_sources.get(lowered_query)
+        id_limit = self.last_entry_id + 1 if exact_id is None else exact_id
+
+        for entry_id in sorted(self.select_candidates(lowered_query, id_limit)):
+            matcher = SequenceMatcher(None, lowered_query, self.lowered_sources[entry_id])
+            if matcher.quick_ratio() > SIMILARITY_THRESHOLD and matcher.ratio() > SIMILARITY_THRESHOLD:
+                return entry_id
+        return exact_id
+
+    def select_candidates(self, lowered_query, id_limit):
+        """Return entry ids older than id_limit that may pass the similarity threshold"""
+        query_length = len(lowered_query)
+        # Smallest trigram overlap any qualifying entry must have (see required_overlap)
+        minimum_overlap = required_overlap(query_length, query_length)
+        if minimum_overlap <= 0:
+            # Too short for trigrams to prove anything; fall back to the length buckets
+            return [entry_id
+                    for entry_length, entry_ids in self.ids_by_length.items()
+                    if lengths_compatible(query_length, entry_length)
+                    for entry_id in entry_ids if entry_id < id_limit]
+
+        # Prefix filter: skip the most common query trigrams as long as they
+        # account for fewer occurrences than minimum_overlap. A qualifying
+        # entry must still share the remainder with the kept trigrams.
+        query_trigrams = extract_trigrams(lowered_query)
+        skipped_occurrences = 0
+        kept_trigrams = sorted(query_trigrams, key=lambda trigram: len(self.trigram_postings.get(trigram, ())))
+        while kept_trigrams and skipped_occurrences + query_trigrams[kept_trigrams[-1]] < minimum_overlap:
+            skipped_occurrences += query_trigrams[kept_trigrams.pop()]
+
+        kept_overlaps = defaultdict(int)
+        for trigram in kept_trigrams:
+            query_occurrences = query_trigrams[trigram]
+            for entry_id, entry_occurrences in self.trigram_postings.get(trigram, ()):
+                if entry_id >= id_limit:
+                    break
+                kept_overlaps[entry_id] += min(query_occurrences, entry_occurrences)
+
+        lowered_sources = self.lowered_sources
+        return [entry_id for entry_id, kept_overlap in kept_overlaps.items()
+                if lengths_compatible(query_length, len(lowered_sources[entry_id]))
+                and kept_overlap + skipped_occurrences >= required_overlap(query_length, len(lowered_sources[entry_id]))]
+
+
+def lengths_compatible(query_length, entry_length):
+    """difflib's real_quick_ratio bound: the shorter string caps the ratio"""
+    total_length = query_length + entry_length
+    return total_length > 0 and 2 * min(query_length, entry_length) / total_length > SIMILARITY_THRESHOLD
+
+
+def required_overlap(query_length, entry_length):
+    """Fewest shared trigrams two strings above the similarity threshold can have
+
+    A ratio above the threshold leaves at most (1 - threshold) * total
+    unmatched characters, and each edit destroys at most NGRAM_SIZE trigrams
+    (the q-gram lemma). The result is lowered slightly so rounding can never
+    reject a genuine match.
+    """
+    allowed_edits = (1 - SIMILARITY_THRESHOLD) * (query_length + entry_length)
+    return (max(query_length, entry_length) - (NGRAM_SIZE - 1)
+            - NGRAM_SIZE * allowed_edits - FLOAT_TOLERANCE)
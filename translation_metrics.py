@@ -0,0 +1,158 @@
+import json
+import re
+import threading
+import time
+from contextlib import nullcontext
+
+# Histogram bucket upper bounds in seconds, Prometheus style
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                   5.0, 10.0, float('inf'))
+NULL_STAGE = nullcontext()
+METRIC_NAME_UNSAFE = re.compile(r'[^a-zA-Z0-9_]')
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram with count and sum"""
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total_seconds = 0.0
+
+    def observe(self, elapsed_seconds):
+        for index, upper_bound in enumerate(LATENCY_BUCKETS):
+            if elapsed_seconds <= upper_bound:
+                self.bucket_counts[index] += 1
+                break
+        self.count += 1
+        self.total_seconds += elapsed_seconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations"""
+        rank = fraction * self.count
+        seen = 0
+        for upper_bound, bucket_count in zip(LATENCY_BUCKETS, self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank and seen:
+                return upper_bound
+        return 0.0
+
+    def summary(self):
+        return {'count': self.count, 'sum_seconds': self.total_seconds,
+                'mean_ms': round(self.total_seconds / self.count * 1000, 3) if self.count else 0,
+                'p50_ms': self.percentile(0.5) * 1000, 'p95_ms': self.percentile(0.95) * 1000,
+                'buckets': dict(zip((str(bound) for bound in LATENCY_BUCKETS), self.bucket_counts))}
+
+
+class StageTimer:
+    def __init__(self, translation_metrics, stage_name):
+        self.translation_metrics = translation_metrics
+        self.stage_name = stage_name
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.translation_metrics.observe(self.stage_name, time.perf_counter() - self.start_time)
+        if exception_type is not None:
+            self.translation_metrics.increment(f"{self.stage_name}_errors")
+        return False
+
+
+class TranslationMetrics:
+    """Per-stage latency histograms, event counters and pulled statistics
+
+    Code wraps a stage as `with metrics.stage('translate'):`. While disabled,
+    stage() hands back one shared no-op context manager and observe() and
+    increment() return at once, so instrumentation costs a method call.
+    Objects with a statistics() method (caches, engine routers) are
+    registered as sources and read only when a snapshot is taken.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.metrics_lock = threading.Lock()
+        self.stage_histograms = {}
+        self.event_counts = {}
+        self.statistics_sources = {}
+
+    def stage(self, stage_name):
+        if not self.enabled:
+            return NULL_STAGE
+        return StageTimer(self, stage_name)
+
+    def observe(self, stage_name, elapsed_seconds):
+        if not self.enabled:
+            return
+        with self.metrics_lock:
+            stage_histogram = self.stage_histograms.get(stage_name)
+            if stage_histogram is None:
+                stage_histogram = self.stage_histograms[stage_name] = LatencyHistogram()
+            stage_histogram.observe(elapsed_seconds)
+
+    def increment(self, event_name, amount=1):
+        if not self.enabled:
+            return
+        with self.metrics_lock:
+            self.event_counts[event_name] = self.event_counts.get(event_name, 0) + amount
+
+    def register_source(self, source_name, statistics_source):
+        """Include statistics_source.statistics() in every snapshot"""
+        self.statistics_sources[source_name] = statistics_source
+
+    def snapshot(self):
+        with self.metrics_lock:
+            stage_summaries = {stage_name: stage_histogram.summary()
+                               for stage_name, stage_histogram in self.stage_histograms.items()}
+            event_counts = dict(self.event_counts)
+        source_statistics = {source_name: statistics_source.statistics()
+                             for source_name, statistics_source in self.statistics_sources.items()}
+        return {'stages': stage_summaries, 'events': event_counts, 'sources': source_statistics}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, default=str)
+
+    def to_prometheus(self):
+        """Render the snapshot in the Prometheus text exposition format"""
+        metrics_snapshot = self.snapshot()
+        exposition_lines = ['# HELP translator_stage_seconds Time spent in each translation stage',
+                            '# TYPE translator_stage_seconds histogram']
+        for stage_name, stage_summary in sorted(metrics_snapshot['stages'].items()):
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(LATENCY_BUCKETS, stage_summary['buckets'].values()):
+                cumulative_count += bucket_count
+                bound_label = '+Inf' if upper_bound == float('inf') else repr(upper_bound)
+                exposition_lines.append(
+                    f'translator_stage_seconds_bucket{{stage="{stage_name}",le="{bound_label}"}} {cumulative_count}')
+            exposition_lines.append(f'translator_stage_seconds_count{{stage="{stage_name}"}} {stage_summary["count"]}')
+            exposition_lines.append(f'translator_stage_seconds_sum{{stage="{stage_name}"}} '
+                                    f'{stage_summary["sum_seconds"]:.6f}')
+
+        exposition_lines += ['# HELP translator_events_total Counted events such as stage errors',
+                             '# TYPE translator_events_total counter']
+        for event_name, event_count in sorted(metrics_snapshot['events'].items()):
+            exposition_lines.append(f'translator_events_total{{event="{event_name}"}} {event_count}')
+
+        for source_name, source_statistics in sorted(metrics_snapshot['sources'].items()):
+            for value_path, value in flatten_numeric(source_statistics):
+                metric_name = METRIC_NAME_UNSAFE.sub('_', f"translator_{source_name}_{value_path}")
+                exposition_lines.append(f'# TYPE {metric_name} gauge')
+                exposition_lines.append(f'{metric_name} {value}')
+        return '\n'.join(exposition_lines) + '\n'
+
+    def write(self, output_path):
+        """Export to output_path: JSON for .json files, Prometheus text otherwise"""
+        exported_text = self.to_json() if output_path.endswith('.json') else self.to_prometheus()
+        with open(output_path, 'w', encoding='utf-8') as file:
+            file.write(exported_text)
+
+
+def flatten_numeric(nested_statistics, path_prefix=''):
+    """Yield (underscore_joined_path, number) for numeric leaves of nested dicts"""
+    for key, value in nested_statistics.items():
+        value_path = f"{path_prefix}_{key}" if path_prefix else str(key)
+        if isinstance(value, dict):
+            yield from flatten_numeric(value, value_path)
+        elif isinstance(value, (bool, int, float)):
+            yield value_path, int(value) if isinstance(value, bool) else value
@@ -0,0 +1,78 @@
+import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TranslationWorker:
+    """Run slow translation jobs off the Tk event loop
+
+    Jobs are submitted on a named channel (usually the widget they update).
+    A newer job on the same channel supersedes the older one: a pending job
+    is cancelled outright and a running one has its result discarded. Results
+    are queued by the pool threads and delivered on the Tk thread by an
+    after() poll, so callbacks may touch widgets freely.
+    """
+
+    def __init__(self, root_window, max_workers=4, poll_interval_ms=20):
+        self.root_window = root_window
+        self.poll_interval_ms = poll_interval_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='translation-worker')
+        self.completed_jobs = queue.SimpleQueue()
+        self.request_counter = itertools.count(1)
+        self.latest_requests = {}
+        self.pending_futures = {}
+        self.poll_scheduled = False
+
+    def submit(self, channel, job_function, on_success, on_error=None):
+        """Run job_function in the pool and pass its result to on_success on the Tk thread"""
+        request_id = next(self.request_counter)
+        self.cancel(channel)
+        self.latest_requests[channel] = request_id
+
+        def run_job():
+            try:
+                self.completed_jobs.put((channel, request_id, True, job_function(), on_success, on_error))
+            except Exception as error:
+                self.completed_jobs.put((channel, request_id, False, error, on_success, on_error))
+
+        self.pending_futures[channel] = self.executor.submit(run_job)
+        self.schedule_poll()
+        return request_id
+
+    def cancel(self, channel):
+        """Supersede any outstanding job on channel"""
+        self.latest_requests.pop(channel, None)
+        pending_future = self.pending_futures.pop(channel, None)
+        if pending_future is not None:
+            pending_future.cancel()
+
+    def is_current(self, channel, request_id):
+        return self.latest_requests.get(channel) == request_id
+
+    def schedule_poll(self):
+        if not self.poll_scheduled:
+            self.poll_scheduled = True
+            self.root_window.after(self.poll_interval_ms, self.deliver_completed_jobs)
+
+    def deliver_completed_jobs(self):
+        """Hand finished results to their callbacks, dropping superseded ones"""
+        self.poll_scheduled = False
+        while True:
+            try:
+                channel, request_id, succeeded, outcome, on_success, on_error = self.completed_jobs.get_nowait()
+            except queue.Empty:
+                break
+            if not self.is_current(channel, request_id):
+                continue
+            del self.latest_requests[channel]
+            self.pending_futures.pop(channel, None)
+            if succeeded:
+                on_success(outcome)
+            elif on_error is not None:
+                on_error(outcome)
+        if self.latest_requests:
+            self.schedule_poll()
+
+    def shutdown(self):
+        self.latest_requests.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)